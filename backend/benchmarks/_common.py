@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def time_async(fn: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 3) -> list[float]:
+    """Run ``fn`` repeatedly and return per-call latencies in milliseconds."""
+    for _ in range(warmup):
+        await fn()
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def time_sync(fn: Callable[[], Any], iterations: int, warmup: int = 3) -> list[float]:
+    """Synchronous counterpart of ``time_async``."""
+    for _ in range(warmup):
+        fn()
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> str:
+    return (
+        f"{label:<28} n={len(samples):<5} "
+        f"p50={percentile(samples, 50):8.2f}ms  p99={percentile(samples, 99):8.2f}ms  "
+        f"mean={statistics.fmean(samples):8.2f}ms"
+    )
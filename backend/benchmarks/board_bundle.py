@@ -0,0 +1,101 @@
+"""
+Board bundle latency: legacy sequential queries vs. $lookup pipeline vs. concurrent fetch,
+and the paged reads (first N cards per column, one column page).
+
+Seeds a throwaway board (default 2,000 cards) into the configured MongoDB, measures
+``GET /api/boards/{id}``'s service call for each strategy (bundle cache off), then removes
+the board.
+
+    uv run python -m backend.benchmarks.board_bundle --cards 2000 --iterations 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Any
+
+from bson import ObjectId
+
+from backend.benchmarks._common import report, time_async
+from backend.database import database_lifespan
+from backend.config import settings
+from backend.models.kanban import BoardPublic, CardPublic, ColumnPublic
+from backend.services import kanban_service
+
+
+async def _legacy_get_board_with_children(board_id: str) -> dict[str, Any] | None:
+    # The pre-bundle implementation: three dependent round trips
+    board = await kanban_service._boards().find_one({"_id": ObjectId(board_id)}, {"changeLog": 0})
+    if not board:
+        return None
+    columns = [ColumnPublic(id=str(c["_id"]), **{k: v for k, v in c.items() if k != "_id"}) async for c in kanban_service._columns().find({"boardId": board_id}).sort([("position", 1)])]
+    cards = [CardPublic(id=str(c["_id"]), **{k: v for k, v in c.items() if k != "_id"}) async for c in kanban_service._cards().find({"boardId": board_id})]
+    return {
+        "board": BoardPublic(id=str(board["_id"]), **{k: v for k, v in board.items() if k != "_id"}),
+        "columns": columns,
+        "cards": cards,
+    }
+
+
+async def _seed(card_count: int, column_count: int) -> str:
+    board = await kanban_service._boards().insert_one({"name": "bench-board-bundle"})
+    board_id = str(board.inserted_id)
+    columns = await kanban_service._columns().insert_many(
+        [{"boardId": board_id, "title": f"Column {i}", "position": i} for i in range(column_count)]
+    )
+    column_ids = [str(c) for c in columns.inserted_ids]
+    await kanban_service._cards().insert_many([
+        {
+            "boardId": board_id,
+            "columnId": column_ids[i % column_count],
+            "title": f"Card {i}",
+            "position": i // column_count,
+            "description": "Benchmark card " * 8,
+            "assignees": ["Rick", "Morty"],
+            "labels": [{"name": "backend", "color": "#3b82f6"}],
+            "checklist": [{"text": f"step {n}", "completed": n % 2 == 0} for n in range(4)],
+        }
+        for i in range(card_count)
+    ])
+    return board_id
+
+
+async def _cleanup(board_id: str) -> None:
+    await kanban_service._cards().delete_many({"boardId": board_id})
+    await kanban_service._columns().delete_many({"boardId": board_id})
+    await kanban_service._boards().delete_one({"_id": ObjectId(board_id)})
+
+
+async def main(card_count: int, column_count: int, iterations: int, per_column: int) -> None:
+    async with database_lifespan():
+        board_id = await _seed(card_count, column_count)
+        try:
+            print(f"board bundle: {card_count} cards / {column_count} columns, {iterations} iterations")
+            samples = await time_async(lambda: _legacy_get_board_with_children(board_id), iterations)
+            print(report("legacy (sequential)", samples))
+            settings.BOARD_CACHE_ENABLED = False
+            for strategy in ("aggregate", "concurrent"):
+                settings.BOARD_BUNDLE_STRATEGY = strategy
+                samples = await time_async(lambda: kanban_service.get_board_with_children(board_id), iterations)
+                print(report(strategy, samples))
+            # Paged alternatives; these should stay flat as --cards grows
+            samples = await time_async(lambda: kanban_service.get_board_first_cards(board_id, per_column), iterations)
+            print(report(f"first {per_column}/column", samples))
+            bundle = await kanban_service.get_board_first_cards(board_id, per_column)
+            column_id, after = next(iter(bundle["nextAfter"].items()), (bundle["columns"][0].id, None))
+            samples = await time_async(
+                lambda: kanban_service.list_column_cards(board_id, column_id, after=after, limit=per_column), iterations
+            )
+            print(report("column page", samples))
+        finally:
+            await _cleanup(board_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--per-column", type=int, default=20, help="page size of the paged reads")
+    args = parser.parse_args()
+    asyncio.run(main(args.cards, args.columns, args.iterations, args.per_column))
@@ -0,0 +1,104 @@
+"""
+Document-to-model mapping cost per model type.
+
+Maps in-memory documents shaped like the stored ones (no database needed) with:
+
+* ``legacy``: what the services did before ``backend.utils.documents``: an ``*InDB`` model
+  re-dumped into a ``*Public`` one for items and users, a ``{k: v ... if k != "_id"}``
+  copy for boards, columns and cards
+* ``validated``: ``to_models(..., trusted=False)``, one validation per document
+* ``trusted``: ``to_models(..., trusted=True)``, ``model_construct`` where the model allows it
+
+    uv run python -m backend.benchmarks.document_mapping --documents 10000 --iterations 20
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from bson import ObjectId
+
+from backend.benchmarks._common import percentile, time_sync
+from backend.models import ItemInDB, ItemPublic, UserInDB, UserPublic
+from backend.models.kanban import BoardPublic, CardPublic, ColumnPublic
+from backend.utils.documents import constructible, to_models
+
+
+def _item(i: int, now: datetime) -> dict[str, Any]:
+    return {"_id": ObjectId(), "title": f"Item {i}", "description": "Benchmark item", "owner_id": ObjectId(),
+            "created_at": now, "updated_at": now}
+
+
+def _user(i: int, now: datetime) -> dict[str, Any]:
+    return {"_id": ObjectId(), "email": f"user{i}@example.com", "full_name": f"User {i}", "is_active": True,
+            "password_hash": "x" * 60, "created_at": now, "updated_at": now}
+
+
+def _board(i: int, now: datetime) -> dict[str, Any]:
+    return {"_id": ObjectId(), "name": f"Board {i}", "projectId": str(ObjectId()), "description": "Benchmark board",
+            "version": i}
+
+
+def _column(i: int, now: datetime) -> dict[str, Any]:
+    return {"_id": ObjectId(), "boardId": str(ObjectId()), "title": f"Column {i}", "position": i}
+
+
+def _card(i: int, now: datetime) -> dict[str, Any]:
+    return {
+        "_id": ObjectId(), "boardId": str(ObjectId()), "columnId": str(ObjectId()), "title": f"Card {i}",
+        "position": i, "description": "Benchmark card " * 8, "assignees": ["Rick", "Morty"],
+        "labels": [{"name": "backend", "color": "#3b82f6"}], "dueDate": now,
+        "checklist": [{"text": f"step {n}", "completed": n % 2 == 0} for n in range(4)],
+    }
+
+
+def _legacy_item(doc: dict[str, Any]) -> ItemPublic:
+    item = ItemInDB(id=str(doc["_id"]), title=doc["title"], description=doc.get("description"),
+                    owner_id=str(doc["owner_id"]), created_at=doc["created_at"], updated_at=doc["updated_at"])
+    return ItemPublic(**item.model_dump())
+
+
+def _legacy_user(doc: dict[str, Any]) -> UserPublic:
+    user = UserInDB(id=str(doc["_id"]), email=doc["email"], full_name=doc.get("full_name"),
+                    is_active=doc.get("is_active", True), created_at=doc["created_at"], updated_at=doc["updated_at"])
+    return UserPublic(**user.model_dump())
+
+
+def _legacy_copy(model: type) -> Callable[[dict[str, Any]], Any]:
+    return lambda doc: model(id=str(doc["_id"]), **{k: v for k, v in doc.items() if k != "_id"})
+
+
+CASES: tuple[tuple[str, type, Callable[[int, datetime], dict[str, Any]], Callable[[dict[str, Any]], Any]], ...] = (
+    ("item", ItemPublic, _item, _legacy_item),
+    ("user", UserPublic, _user, _legacy_user),
+    ("board", BoardPublic, _board, _legacy_copy(BoardPublic)),
+    ("column", ColumnPublic, _column, _legacy_copy(ColumnPublic)),
+    ("card", CardPublic, _card, _legacy_copy(CardPublic)),
+)
+
+
+def main(document_count: int, iterations: int) -> None:
+    now = datetime.now(timezone.utc)
+    print(f"document mapping: {document_count} documents per model, {iterations} iterations (p50 per document)")
+    print(f"{'model':<8}{'legacy':>12}{'validated':>12}{'trusted':>12}  trusted path")
+    for name, model, make, legacy in CASES:
+        docs = [make(i, now) for i in range(document_count)]
+        assert [m.model_dump() for m in to_models(model, docs[:10])] == [legacy(d).model_dump() for d in docs[:10]]
+        row = []
+        for fn in (
+            lambda: [legacy(d) for d in docs],
+            lambda: to_models(model, docs, trusted=False),
+            lambda: to_models(model, docs, trusted=True),
+        ):
+            row.append(percentile(time_sync(fn, iterations), 50) * 1000 / document_count)
+        path = "model_construct" if constructible(model) else "validated (nested models)"
+        print(f"{name:<8}" + "".join(f"{us:>9.2f} us" for us in row) + f"  {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    main(args.documents, args.iterations)
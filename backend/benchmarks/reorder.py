@@ -0,0 +1,72 @@
+"""
+Reorder throughput: one update_one per card (legacy) vs. chunked unordered bulk_write.
+
+Seeds a throwaway board, then shuffles 10/100/1000 cards across columns with each
+implementation and reports latency and cards/second.
+
+    uv run python -m backend.benchmarks.reorder --iterations 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from typing import Any
+
+from bson import ObjectId
+
+from backend.benchmarks._common import percentile, time_async
+from backend.database import database_lifespan
+from backend.services import kanban_service
+
+
+async def _legacy_reorder_cards(updates: list[dict[str, Any]]) -> None:
+    # The pre-bulk implementation: one round trip per card
+    for upd in updates:
+        await kanban_service._cards().update_one(
+            {"_id": ObjectId(upd["id"])},
+            {"$set": {"columnId": upd["columnId"], "position": int(upd["position"])}},
+        )
+
+
+def _shuffled(card_ids: list[str], column_ids: list[str], size: int) -> list[dict[str, Any]]:
+    picked = random.sample(card_ids, size)
+    return [
+        {"id": card_id, "columnId": random.choice(column_ids), "position": random.randint(0, 10_000)}
+        for card_id in picked
+    ]
+
+
+async def main(sizes: list[int], iterations: int) -> None:
+    async with database_lifespan():
+        board = await kanban_service._boards().insert_one({"name": "bench-reorder"})
+        board_id = str(board.inserted_id)
+        try:
+            columns = await kanban_service._columns().insert_many(
+                [{"boardId": board_id, "title": f"Column {i}", "position": i} for i in range(4)]
+            )
+            column_ids = [str(c) for c in columns.inserted_ids]
+            cards = await kanban_service._cards().insert_many([
+                {"boardId": board_id, "columnId": column_ids[i % 4], "title": f"Card {i}", "position": i}
+                for i in range(max(sizes))
+            ])
+            card_ids = [str(c) for c in cards.inserted_ids]
+
+            print(f"{'size':>6}  {'strategy':<10} {'p50 ms':>10} {'p99 ms':>10} {'cards/s':>12}")
+            for size in sizes:
+                for label, fn in (("legacy", _legacy_reorder_cards), ("bulk", kanban_service.reorder_cards)):
+                    samples = await time_async(lambda: fn(_shuffled(card_ids, column_ids, size)), iterations, warmup=1)
+                    p50 = percentile(samples, 50)
+                    print(f"{size:>6}  {label:<10} {p50:>10.2f} {percentile(samples, 99):>10.2f} {size / (p50 / 1000):>12.0f}")
+        finally:
+            await kanban_service._cards().delete_many({"boardId": board_id})
+            await kanban_service._columns().delete_many({"boardId": board_id})
+            await kanban_service._boards().delete_one({"_id": ObjectId(board_id)})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.iterations))
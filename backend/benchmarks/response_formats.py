@@ -0,0 +1,99 @@
+"""
+JSON vs MessagePack for typical board and project payloads (and the board's view=summary).
+
+Encodes in-memory payloads (no database needed) the way the negotiated routes do, with
+``dumps`` (orjson) and ``packb`` (MessagePack), and reports body size (raw and gzip -6, as
+a compressing proxy would send it), encode time and decode time (orjson.loads /
+msgpack.unpackb, a stand-in for the client's parser).
+
+    uv run python -m backend.benchmarks.response_formats --cards 200 2000 --iterations 50
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+from datetime import datetime, timedelta
+from typing import Any
+
+import msgpack
+import orjson
+from bson import ObjectId
+
+from backend.benchmarks._common import percentile, time_sync
+from backend.benchmarks.response_serialization import _bundle
+from backend.services.kanban_service import summarize_bundle
+from backend.utils.responses import dumps, packb
+
+
+def _project(i: int) -> dict[str, Any]:
+    # Shaped like the seeded "E-Commerce Platform" project
+    now = datetime(2025, 1, 1)
+    return {
+        "_id": ObjectId(),
+        "name": f"Project {i}",
+        "status": "in-progress",
+        "owner": {"id": ObjectId(), "name": "Rick"},
+        "description": "Complete e-commerce platform with frontend, backend, and mobile apps",
+        "stakeholders": ["Engineering Team", "Product Team", "UX Design", "QA Team"],
+        "okr": {
+            "objective": "Launch MVP e-commerce platform by Q2 2025",
+            "keyResults": ["Achieve 1000 active users in first month", "Process 500 successful transactions"],
+        },
+        "timelineStart": now,
+        "timelineEnd": now + timedelta(days=90),
+        "milestones": [
+            {"title": f"Milestone {m}", "date": now + timedelta(days=15 * m), "completed": m < 2} for m in range(5)
+        ],
+        "blockers": ["Waiting for payment gateway API credentials"],
+        "notes": "Team is making good progress. Weekly standups on Mondays at 10am.",
+        "dueDate": now + timedelta(days=90),
+        "version": 3,
+    }
+
+
+def _project_page(limit: int) -> dict[str, Any]:
+    items = [{"id": str(p["_id"]), **{f: p.get(f) for f in ("name", "status", "owner", "dueDate")}}
+             for p in (_project(i) for i in range(limit))]
+    return {"items": items, "total": 1000, "totalStrategy": "exact", "nextCursor": "abc"}
+
+
+def _row(label: str, content: Any, iterations: int) -> str:
+    json_body, msgpack_body = dumps(content), packb(content)
+    assert msgpack.unpackb(msgpack_body) == orjson.loads(json_body), f"{label}: representations differ"
+    cells = []
+    for body, encode, decode in (
+        (json_body, lambda: dumps(content), lambda: orjson.loads(json_body)),
+        (msgpack_body, lambda: packb(content), lambda: msgpack.unpackb(msgpack_body)),
+    ):
+        cells.append((
+            len(body),
+            len(gzip.compress(body, compresslevel=6)),
+            percentile(time_sync(encode, iterations), 50),
+            percentile(time_sync(decode, iterations), 50),
+        ))
+    (js, jz, je, jd), (ms, mz, me, md) = cells
+    return (
+        f"{label:<22}{js:>11,} {ms:>11,} ({ms / js:>4.0%}){jz:>10,} {mz:>10,}"
+        f"{je:>9.2f} {me:>7.2f}{jd:>9.2f} {md:>7.2f}"
+    )
+
+
+def main(card_counts: list[int], iterations: int) -> None:
+    print(f"response formats, {iterations} iterations (p50 ms)")
+    print(f"{'payload':<22}{'json B':>11} {'msgpack B':>11}{'':7}{'json gz':>10} {'mp gz':>10}"
+          f"{'enc json':>9} {'mp':>7}{'dec json':>9} {'mp':>7}")
+    for cards in card_counts:
+        bundle = _bundle(cards, 6)
+        print(_row(f"board bundle {cards}", bundle, iterations))
+        print(_row("  view=summary", summarize_bundle(bundle), iterations))
+    print(_row("project detail", _project(0), iterations))
+    print(_row("project list (20)", _project_page(20), iterations))
+    print(_row("project list (200)", _project_page(200), iterations))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    main(args.cards, args.iterations)
@@ -0,0 +1,90 @@
+"""
+Per-card serialization cost of the board bundle response.
+
+Builds an in-memory bundle (default 2,000 cards, no database needed) and times turning it
+into response bytes three ways:
+
+* ``response_model``: what ``GET /api/boards/{id}`` did before ``fast_response``: FastAPI
+  re-validates the bundle against ``BoardBundle`` and encodes it with the stdlib json
+* ``response_model + orjson``: the same validation, encoded by the default ORJSONResponse
+* ``fast_response``: the already-built models encoded by orjson directly
+
+    uv run python -m backend.benchmarks.response_serialization --cards 2000 --iterations 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.benchmarks._common import percentile, report, time_async
+from backend.models.kanban import BoardBundle, BoardPublic, CardPublic, ColumnPublic
+from backend.utils.responses import ORJSONResponse, fast_response
+
+
+def _bundle(card_count: int, column_count: int) -> dict[str, Any]:
+    board_id = str(ObjectId())
+    column_ids = [str(ObjectId()) for _ in range(column_count)]
+    due = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    return {
+        "board": BoardPublic(id=board_id, name="bench-board", version=1),
+        "columns": [
+            ColumnPublic(id=cid, boardId=board_id, title=f"Column {i}", position=i) for i, cid in enumerate(column_ids)
+        ],
+        "cards": [
+            CardPublic(
+                id=str(ObjectId()),
+                boardId=board_id,
+                columnId=column_ids[i % column_count],
+                title=f"Card {i}",
+                position=i // column_count,
+                description="Benchmark card " * 8,
+                assignees=["Rick", "Morty"],
+                labels=[{"name": "backend", "color": "#3b82f6"}],
+                dueDate=due,
+                checklist=[{"text": f"step {n}", "completed": n % 2 == 0} for n in range(4)],
+            )
+            for i in range(card_count)
+        ],
+    }
+
+
+async def main(card_count: int, column_count: int, iterations: int) -> None:
+    bundle = _bundle(card_count, column_count)
+    field = create_model_field(name="Response_get_board", type_=BoardBundle, mode="serialization")
+
+    async def via_response_model(response_class: type[JSONResponse]) -> bytes:
+        content = await serialize_response(field=field, response_content=bundle)
+        return response_class(content).body
+
+    async def via_fast_response() -> bytes:
+        return fast_response(bundle).body
+
+    legacy, ours = await via_response_model(JSONResponse), await via_fast_response()
+    assert json.loads(legacy) == json.loads(ours), "fast_response changed the encoded bundle"
+
+    print(f"board bundle serialization: {card_count} cards / {column_count} columns, {iterations} iterations, {len(ours):,} bytes")
+    for label, fn in (
+        ("response_model", lambda: via_response_model(JSONResponse)),
+        ("response_model + orjson", lambda: via_response_model(ORJSONResponse)),
+        ("fast_response", via_fast_response),
+    ):
+        samples = await time_async(fn, iterations)
+        per_card_us = percentile(samples, 50) * 1000 / card_count
+        print(f"{report(label, samples)}  ({per_card_us:.2f} us/card)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.cards, args.columns, args.iterations))
@@ -0,0 +1,107 @@
+"""
+Ticker fan-out load test: thousands of WebSocket subscribers on one worker.
+
+Runs the real feed and per-subscriber send loop (``ticker_service.stream_frames``) against
+in-memory sockets, a share of which are slow, while a publisher updates random projects.
+Reports per-tick broadcast cost, delivery latency to fast subscribers, and how many frames
+slow subscribers skipped (and caught up on via snapshots) instead of queueing.
+
+    uv run python -m backend.benchmarks.ticker_fanout --subscribers 5000 --seconds 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import resource
+import time
+
+from backend.benchmarks._common import percentile
+from backend.config import settings
+from backend.services import ticker_service
+from backend.services.ticker_service import TickerFeed
+
+
+class _Socket:
+    def __init__(self, send_delay: float, sent_at: dict[str, float], latencies: list[float]) -> None:
+        self._send_delay = send_delay
+        self._sent_at = sent_at
+        self._latencies = latencies
+        self.received = 0
+
+    async def send_text(self, frame: str) -> None:
+        if self._send_delay:
+            await asyncio.sleep(self._send_delay)
+        else:
+            # Yield like a real socket write would
+            await asyncio.sleep(0)
+            broadcast_at = self._sent_at.get(frame)
+            if broadcast_at is not None:
+                self._latencies.append((time.perf_counter() - broadcast_at) * 1000)
+        self.received += 1
+
+
+async def main(subscribers: int, slow_share: float, projects: int, rate: int, seconds: float, tick_ms: int, max_frames: int) -> None:
+    feed = TickerFeed(max_frames=max_frames)
+    # Route publish_metrics to this feed
+    ticker_service.ticker_feed = feed
+    # frame -> when it was broadcast; frames are shared strings, so this is one entry per tick
+    sent_at: dict[str, float] = {}
+    latencies: list[float] = []
+    slow_count = int(subscribers * slow_share)
+    sockets = [_Socket(1.0 if i < slow_count else 0.0, sent_at, latencies) for i in range(subscribers)]
+    subs = [feed.subscribe() for _ in sockets]
+    senders = [asyncio.create_task(ticker_service.stream_frames(sub, sock.send_text)) for sub, sock in zip(subs, sockets)]
+
+    broadcast_ms: list[float] = []
+    project_ids = [f"bench-{i}" for i in range(projects)]
+
+    async def publisher() -> None:
+        while True:
+            for _ in range(rate // 10 or 1):
+                ticker_service.publish_metrics(
+                    random.choice(project_ids),
+                    {"profit": random.uniform(-1000, 5000), "margin": random.random(), "time_saved": random.uniform(0, 20)},
+                )
+            await asyncio.sleep(0.1)
+
+    async def ticker() -> None:
+        while True:
+            await asyncio.sleep(tick_ms / 1000)
+            start = time.perf_counter()
+            feed.flush()
+            frame = feed.broadcaster.last_frame
+            if frame is not None:
+                sent_at[frame] = start
+            broadcast_ms.append((time.perf_counter() - start) * 1000)
+
+    tasks = [asyncio.create_task(publisher()), asyncio.create_task(ticker())]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    for sub in subs:
+        sub.close()
+    await asyncio.gather(*tasks, *senders, return_exceptions=True)
+
+    stats = feed.stats()
+    fast_received = [s.received for s in sockets[slow_count:]]
+    slow_received = [s.received for s in sockets[:slow_count]]
+    print(f"subscribers={subscribers} (slow={slow_count})  projects={projects}  updates/s={rate}  tick={tick_ms}ms")
+    print(f"ticks={stats['ticks']}  broadcast p50={percentile(broadcast_ms, 50):.2f}ms p99={percentile(broadcast_ms, 99):.2f}ms")
+    print(f"delivery to fast subscribers p50={percentile(latencies, 50):.2f}ms p99={percentile(latencies, 99):.2f}ms")
+    print(f"messages/fast subscriber min={min(fast_received, default=0)}  messages/slow subscriber max={max(slow_received, default=0)}")
+    print(f"dropped frames={stats['dropped']}  catch-up snapshots={stats['snapshots']}")
+    print(f"max RSS={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--slow-share", type=float, default=0.05, help="Share of subscribers taking 1s per send")
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--rate", type=int, default=500, help="Metric updates published per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--tick-ms", type=int, default=settings.TICKER_TICK_INTERVAL_MS)
+    parser.add_argument("--max-frames", type=int, default=settings.TICKER_WS_MAX_PENDING_FRAMES)
+    args = parser.parse_args()
+    asyncio.run(main(args.subscribers, args.slow_share, args.projects, args.rate, args.seconds, args.tick_ms, args.max_frames))
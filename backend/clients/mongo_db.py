@@ -1,11 +1,86 @@
-from typing import AsyncGenerator
+import asyncio
+import threading
+from typing import Any, AsyncGenerator
 from contextlib import asynccontextmanager
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
 
 from backend.config import settings
 
 
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool telemetry per server, fed by PyMongo's CMAP events.
+    Events arrive on driver threads, so counters are guarded by a lock.
+    """
+
+    _COUNTERS = ("created", "closed", "checkout_started", "checked_out", "checked_in", "checkout_failed", "cleared")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._servers: dict[str, dict[str, int]] = {}
+
+    def _bump(self, event: Any, counter: str) -> None:
+        address = "%s:%s" % event.address if isinstance(event.address, tuple) else str(event.address)
+        with self._lock:
+            counters = self._servers.setdefault(address, dict.fromkeys(self._COUNTERS, 0))
+            counters[counter] += 1
+
+    def pool_created(self, event: Any) -> None:
+        pass
+
+    def pool_cleared(self, event: Any) -> None:
+        self._bump(event, "cleared")
+
+    def pool_closed(self, event: Any) -> None:
+        pass
+
+    def connection_created(self, event: Any) -> None:
+        self._bump(event, "created")
+
+    def connection_ready(self, event: Any) -> None:
+        pass
+
+    def connection_closed(self, event: Any) -> None:
+        self._bump(event, "closed")
+
+    def connection_check_out_started(self, event: Any) -> None:
+        self._bump(event, "checkout_started")
+
+    def connection_check_out_failed(self, event: Any) -> None:
+        self._bump(event, "checkout_failed")
+
+    def connection_checked_out(self, event: Any) -> None:
+        self._bump(event, "checked_out")
+
+    def connection_checked_in(self, event: Any) -> None:
+        self._bump(event, "checked_in")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            servers = {address: dict(counters) for address, counters in self._servers.items()}
+        out: dict[str, Any] = {"servers": {}}
+        totals = {"open": 0, "inUse": 0, "available": 0, "waitQueue": 0, "checkoutFailures": 0}
+        for address, c in servers.items():
+            open_ = c["created"] - c["closed"]
+            in_use = c["checked_out"] - c["checked_in"]
+            server = {
+                "open": open_,
+                "inUse": in_use,
+                "available": max(open_ - in_use, 0),
+                "waitQueue": max(c["checkout_started"] - c["checked_out"] - c["checkout_failed"], 0),
+                "checkoutFailures": c["checkout_failed"],
+                "poolCleared": c["cleared"],
+            }
+            out["servers"][address] = server
+            for key in totals:
+                totals[key] += server[key]
+        out.update(totals)
+        return out
+
+
+pool_stats = PoolStats()
 _mongo_client: AsyncIOMotorClient | None = None
 
 
@@ -21,7 +96,12 @@ def get_mongo_client() -> AsyncIOMotorClient:
             # Disable wire version check for Cosmos DB (reports wire version 6)
             # PyMongo 4.x requires wire version 8+, but Cosmos DB is compatible
             connect=False,  # Lazy connection to bypass initial version check
-            retryWrites=False  # Cosmos DB doesn't support retryable writes
+            retryWrites=False,  # Cosmos DB doesn't support retryable writes
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            event_listeners=[pool_stats],
         )
     return _mongo_client
 
@@ -31,14 +111,20 @@ def get_database(db_name: str = "appdb") -> AsyncIOMotorDatabase:
     return client[db_name]
 
 
+async def warm_up_pool(connections: int) -> None:
+    """Open up to ``connections`` pooled connections by running that many concurrent pings."""
+    client = get_mongo_client()
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(max(connections, 1))))
+
+
 @asynccontextmanager
 async def mongo_lifespan() -> AsyncGenerator[None, None]:
     try:
+        if settings.MONGO_WARMUP_CONNECTIONS > 0:
+            await warm_up_pool(settings.MONGO_WARMUP_CONNECTIONS)
         yield
     finally:
         global _mongo_client
         if _mongo_client is not None:
             _mongo_client.close()
             _mongo_client = None
-
-
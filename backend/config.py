@@ -1,5 +1,6 @@
 from pydantic import AnyHttpUrl, Field, computed_field, field_validator, ConfigDict
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Literal
 import os
 
 
@@ -36,6 +37,79 @@ class Settings(BaseSettings):
     OIDC_REDIRECT_URI: str | None = Field(default=None, alias="OIDC_REDIRECT_URI")
     APP_ID: str | None = Field(default=None, alias="APP_ID")
     MONGODB_URI: str = Field(default="mongodb://localhost:27017", alias="MONGODB_URI")
+    # Connection pool sizing (passed to the Motor client)
+    MONGO_MAX_POOL_SIZE: int = Field(default=100, alias="MONGO_MAX_POOL_SIZE")
+    MONGO_MIN_POOL_SIZE: int = Field(default=5, alias="MONGO_MIN_POOL_SIZE")
+    MONGO_MAX_IDLE_TIME_MS: int | None = Field(default=300_000, alias="MONGO_MAX_IDLE_TIME_MS")
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int | None = Field(default=5_000, alias="MONGO_WAIT_QUEUE_TIMEOUT_MS")
+    # Connections opened during startup, before the app reports ready
+    MONGO_WARMUP_CONNECTIONS: int = Field(default=5, alias="MONGO_WARMUP_CONNECTIONS")
+    # "aggregate" fetches a board bundle with one $lookup pipeline; "concurrent" issues the
+    # board/columns/cards queries in parallel (for backends with weak $lookup support)
+    BOARD_BUNDLE_STRATEGY: Literal["aggregate", "concurrent"] = Field(default="aggregate", alias="BOARD_BUNDLE_STRATEGY")
+    # Maximum operations per bulk_write request when reordering cards/columns
+    REORDER_BATCH_SIZE: int = Field(default=500, alias="REORDER_BATCH_SIZE")
+    # "position" orders cards/columns by integer position; "rank" by lexicographic rank strings,
+    # so a move updates only the moved document
+    ORDERING_MODE: Literal["position", "rank"] = Field(default="position", alias="ORDERING_MODE")
+    # Rank length that triggers a background rebalance of the column (or board) being edited
+    RANK_MAX_LENGTH: int = Field(default=12, alias="RANK_MAX_LENGTH")
+    # In-process board bundle cache (per replica; other replicas see writes after at most the TTL)
+    BOARD_CACHE_ENABLED: bool = Field(default=True, alias="BOARD_CACHE_ENABLED")
+    BOARD_CACHE_TTL_SECONDS: float = Field(default=30.0, alias="BOARD_CACHE_TTL_SECONDS")
+    BOARD_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, alias="BOARD_CACHE_MAX_BYTES")
+    # Lifetime of cached filtered project counts (GET /api/projects?count=cached|auto)
+    PROJECT_COUNT_CACHE_TTL_SECONDS: float = Field(default=15.0, alias="PROJECT_COUNT_CACHE_TTL_SECONDS")
+    # Source of board WebSocket deltas: "local" publishes this process's kanban writes; "change_stream"
+    # follows a MongoDB change stream instead so every replica sees every write (needs a replica set)
+    BOARD_EVENTS_SOURCE: Literal["local", "change_stream"] = Field(default="local", alias="BOARD_EVENTS_SOURCE")
+    # Distinct cards/columns a board subscriber may have pending before it is told to resync
+    BOARD_WS_MAX_PENDING: int = Field(default=1000, alias="BOARD_WS_MAX_PENDING")
+    # Minimum gap between two messages to one subscriber; deltas arriving in between are coalesced
+    BOARD_WS_FLUSH_INTERVAL_MS: int = Field(default=50, alias="BOARD_WS_FLUSH_INTERVAL_MS")
+    # Writes kept in each board's change log for GET /api/boards/{id}/changes; older clients get the full bundle
+    BOARD_CHANGELOG_LENGTH: int = Field(default=200, alias="BOARD_CHANGELOG_LENGTH")
+    # A single write touching more cards/columns than this is logged without its ops ("ops": None):
+    # /changes then answers with the full bundle and change-stream subscribers are told to resync
+    BOARD_CHANGELOG_MAX_OPS: int = Field(default=100, alias="BOARD_CHANGELOG_MAX_OPS")
+    # Same for a write whose ops exceed this many BSON bytes (create deltas carry whole documents);
+    # bounds the log at BOARD_CHANGELOG_LENGTH x this (3.2MB by default), well under the 16MB document limit
+    BOARD_CHANGELOG_MAX_ENTRY_BYTES: int = Field(default=16 * 1024, alias="BOARD_CHANGELOG_MAX_ENTRY_BYTES")
+    # Cache-Control per GET route; responses carry an ETag, so "no-cache" means "revalidate every time"
+    CACHE_CONTROL_BOARD: str = Field(default="private, no-cache", alias="CACHE_CONTROL_BOARD")
+    CACHE_CONTROL_BOARD_LIST: str = Field(default="private, no-cache", alias="CACHE_CONTROL_BOARD_LIST")
+    CACHE_CONTROL_TASKS: str = Field(default="private, no-cache", alias="CACHE_CONTROL_TASKS")
+    CACHE_CONTROL_PROJECT: str = Field(default="private, no-cache", alias="CACHE_CONTROL_PROJECT")
+    CACHE_CONTROL_PROJECT_LIST: str = Field(default="private, no-cache", alias="CACHE_CONTROL_PROJECT_LIST")
+    # How long a replica trusts its remembered project versions when answering If-None-Match. Writes
+    # through other replicas do not invalidate them, so a changed project can be answered 304 for up
+    # to this long; 0 (default) checks the version in Mongo (one projected read) on every revalidation
+    PROJECT_VERSION_CACHE_TTL_SECONDS: float = Field(default=0.0, alias="PROJECT_VERSION_CACHE_TTL_SECONDS")
+
+    # Days of profit history in each ticker sparkline (GET /api/metrics/ticker)
+    TICKER_HISTORY_LENGTH: int = Field(default=30, alias="TICKER_HISTORY_LENGTH")
+    # Updates within one tick are coalesced per project and broadcast as a single message
+    TICKER_TICK_INTERVAL_MS: int = Field(default=1000, alias="TICKER_TICK_INTERVAL_MS")
+    # Messages a ticker subscriber may have queued before it is skipped ahead to a snapshot
+    TICKER_WS_MAX_PENDING_FRAMES: int = Field(default=8, alias="TICKER_WS_MAX_PENDING_FRAMES")
+    # Operations per bulk_write request when storing metric snapshots and rollups
+    METRICS_BULK_CHUNK_SIZE: int = Field(default=1000, alias="METRICS_BULK_CHUNK_SIZE")
+    # NDJSON lines validated and written together by POST /api/metrics/ingest (bounds its memory use)
+    METRICS_INGEST_BATCH_SIZE: int = Field(default=1000, alias="METRICS_INGEST_BATCH_SIZE")
+    # Longest accepted NDJSON line, in bytes
+    METRICS_INGEST_MAX_LINE_BYTES: int = Field(default=64 * 1024, alias="METRICS_INGEST_MAX_LINE_BYTES")
+    # Per-line errors listed in an ingest report; further failures are only counted
+    METRICS_INGEST_MAX_ERRORS: int = Field(default=1000, alias="METRICS_INGEST_MAX_ERRORS")
+    # Seconds between background portfolio reconciles that repair drift (0 disables; see POST /admin/metrics/portfolio/reconcile)
+    METRICS_RECONCILE_INTERVAL_SECONDS: float = Field(default=0.0, alias="METRICS_RECONCILE_INTERVAL_SECONDS")
+    # Snapshot buckets per recompute batch (POST /admin/metrics/recompute) and processes calculating batches
+    METRICS_RECOMPUTE_BATCH_BUCKETS: int = Field(default=500, alias="METRICS_RECOMPUTE_BATCH_BUCKETS")
+    METRICS_RECOMPUTE_WORKERS: int = Field(default=2, alias="METRICS_RECOMPUTE_WORKERS")
+    # In-process cache of downsampled index series (GET /api/metrics/projects/{id}/series), per replica
+    SERIES_CACHE_TTL_SECONDS: float = Field(default=300.0, alias="SERIES_CACHE_TTL_SECONDS")
+    SERIES_CACHE_MAX_BYTES: int = Field(default=16 * 1024 * 1024, alias="SERIES_CACHE_MAX_BYTES")
+    # How long GET /api/metrics/ticker reuses its last aggregation
+    TICKER_CACHE_TTL_SECONDS: float = Field(default=5.0, alias="TICKER_CACHE_TTL_SECONDS")
 
     @computed_field
     @property
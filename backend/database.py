@@ -1,11 +1,101 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional
+import asyncio
+import base64
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Iterable, Mapping, Optional, Sequence, Union
 
-from bson import ObjectId
+from bson import ObjectId, json_util
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 
-from backend.clients.mongo_db import get_database
+from backend.clients.mongo_db import get_database, mongo_lifespan
+
+
+@dataclass
+class BulkWriteOutcome:
+    """Aggregated result of a (possibly chunked) unordered bulk write."""
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_count: int = 0
+    # Index into the submitted operations -> error message, for operations that failed
+    errors: dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated query."""
+    items: list[dict[str, Any]]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+# Field selection for reads: an inclusion mapping {"field": 1} or an iterable of field names
+Projection = Union[Mapping[str, Any], Iterable[str]]
+
+
+def _with_fields(projection: Projection, fields: Iterable[str]) -> dict[str, Any]:
+    # Ensure ``fields`` (e.g. the sort keys a cursor is built from) survive the projection
+    spec = dict(projection) if isinstance(projection, Mapping) else {f: 1 for f in projection}
+    if any(spec.get(k) for k in spec if k != "_id"):
+        spec.update({f: 1 for f in fields if f != "_id"})
+    else:
+        for f in fields:
+            spec.pop(f, None)
+    return spec
+
+
+def _get_path(doc: dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _keyset_sort(sort: Optional[Iterable[tuple[str, int]]]) -> list[tuple[str, int]]:
+    # _id is always the final tie-breaker so every position in the order is unique
+    spec = [(f, d) for f, d in (sort or []) if f != "_id"]
+    id_direction = next((d for f, d in (sort or []) if f == "_id"), 1)
+    return spec + [("_id", id_direction)]
+
+
+def encode_cursor(doc: dict[str, Any], sort: list[tuple[str, int]]) -> str:
+    """Opaque continuation token holding the sort key values of ``doc``, tied to ``sort``."""
+    payload = {"s": [[f, d] for f, d in sort], "v": [_get_path(doc, f) for f, _ in sort]}
+    return base64.urlsafe_b64encode(json_util.dumps(payload).encode()).decode()
+
+
+def decode_cursor(token: str, sort: list[tuple[str, int]]) -> list[Any]:
+    """Return the sort key values stored in ``token``; ValueError if malformed or issued for another sort."""
+    try:
+        payload = json_util.loads(base64.urlsafe_b64decode(token.encode()))
+        spec, values = payload["s"], payload["v"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if [tuple(s) for s in spec] != [tuple(s) for s in sort] or len(values) != len(sort):
+        raise ValueError("cursor does not match the requested sort")
+    return values
+
+
+def keyset_filter(sort: list[tuple[str, int]], values: list[Any]) -> dict[str, Any]:
+    """
+    Filter matching documents that sort strictly after ``values`` under ``sort``.
+    Follows MongoDB's ordering where null/missing sorts before any other value.
+    """
+    branches: list[dict[str, Any]] = []
+    for i, (field_name, direction) in enumerate(sort):
+        prefix = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        value = values[i]
+        if direction >= 0:
+            branches.append({**prefix, field_name: {"$ne": None} if value is None else {"$gt": value}})
+        elif value is not None:
+            branches.append({**prefix, field_name: {"$lt": value}})
+            branches.append({**prefix, field_name: None})
+    return {"$or": branches} if branches else {"_id": {"$exists": False}}
 
 
 class MongoDatabase:
@@ -17,6 +107,10 @@ class MongoDatabase:
     def __init__(self, db_name: str = "appdb") -> None:
         self._db: AsyncIOMotorDatabase = get_database(db_name)
 
+    @property
+    def name(self) -> str:
+        return self._db.name
+
     def collection(self, name: str) -> AsyncIOMotorCollection:
         return self._db[name]
 
@@ -27,24 +121,29 @@ class MongoDatabase:
         return document
 
     # Read
-    async def find_one_by_id(self, collection: str, id_value: str) -> Optional[dict[str, Any]]:
+    async def find_one_by_id(
+        self, collection: str, id_value: str, *, projection: Optional[Projection] = None
+    ) -> Optional[dict[str, Any]]:
         if not ObjectId.is_valid(id_value):
             return None
-        return await self.collection(collection).find_one({"_id": ObjectId(id_value)})
+        return await self.collection(collection).find_one({"_id": ObjectId(id_value)}, projection)
 
-    async def find_one(self, collection: str, filter: dict[str, Any]) -> Optional[dict[str, Any]]:
-        return await self.collection(collection).find_one(filter)
+    async def find_one(
+        self, collection: str, filter: dict[str, Any], *, projection: Optional[Projection] = None
+    ) -> Optional[dict[str, Any]]:
+        return await self.collection(collection).find_one(filter, projection)
 
     async def find_many(
         self,
         collection: str,
         filter: Optional[dict[str, Any]] = None,
         *,
-        limit: int = 100,
+        limit: Optional[int] = None,
         skip: int = 0,
         sort: Optional[Iterable[tuple[str, int]]] = None,
+        projection: Optional[Projection] = None,
     ) -> list[dict[str, Any]]:
-        cursor = self.collection(collection).find(filter or {})
+        cursor = self.collection(collection).find(filter or {}, projection)
         if sort:
             cursor = cursor.sort(list(sort))
         if skip:
@@ -53,6 +152,45 @@ class MongoDatabase:
             cursor = cursor.limit(limit)
         return [doc async for doc in cursor]
 
+    async def find_page(
+        self,
+        collection: str,
+        filter: Optional[dict[str, Any]] = None,
+        *,
+        sort: Optional[Iterable[tuple[str, int]]] = None,
+        limit: int = 50,
+        after: Optional[str] = None,
+        skip: int = 0,
+        with_total: bool = False,
+        projection: Optional[Projection] = None,
+    ) -> Page:
+        """
+        Keyset pagination: returns up to ``limit`` documents ordered by ``sort`` (plus ``_id``)
+        and an opaque ``next_cursor`` to pass back as ``after``. ``skip`` is only honoured
+        without a cursor, for legacy page-number callers. The exact total, when requested,
+        is counted concurrently with the page query. Raises ValueError for a bad cursor.
+        """
+        spec = _keyset_sort(sort)
+        if projection:
+            projection = _with_fields(projection, [f for f, _ in spec])
+        base = filter or {}
+        query = base
+        if after:
+            after_filter = keyset_filter(spec, decode_cursor(after, spec))
+            query = {"$and": [base, after_filter]} if base else after_filter
+        cursor = self.collection(collection).find(query, projection).sort(spec)
+        if skip and not after:
+            cursor = cursor.skip(skip)
+        cursor = cursor.limit(limit + 1)
+        if with_total:
+            docs, total = await asyncio.gather(
+                cursor.to_list(length=None), self.collection(collection).count_documents(base)
+            )
+        else:
+            docs, total = await cursor.to_list(length=None), None
+        next_cursor = encode_cursor(docs[limit - 1], spec) if len(docs) > limit else None
+        return Page(items=docs[:limit], next_cursor=next_cursor, total=total)
+
     # Update
     async def update_one_by_id(self, collection: str, id_value: str, update: dict[str, Any]) -> bool:
         if not ObjectId.is_valid(id_value):
@@ -60,6 +198,95 @@ class MongoDatabase:
         result = await self.collection(collection).update_one({"_id": ObjectId(id_value)}, {"$set": update})
         return result.matched_count == 1
 
+    async def find_one_and_update(
+        self,
+        collection: str,
+        filter: dict[str, Any],
+        update: dict[str, Any],
+        *,
+        projection: Optional[Projection] = None,
+        sort: Optional[Iterable[tuple[str, int]]] = None,
+        upsert: bool = False,
+    ) -> Optional[dict[str, Any]]:
+        """
+        Apply ``update`` (an update document such as ``{"$set": ...}``) to the first match and
+        return the document as it is after the write, in a single round trip.
+        """
+        return await self.collection(collection).find_one_and_update(
+            filter,
+            update,
+            projection=projection,
+            sort=list(sort) if sort else None,
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def update_one_by_id_and_return(
+        self, collection: str, id_value: str, update: dict[str, Any], *, projection: Optional[Projection] = None
+    ) -> Optional[dict[str, Any]]:
+        """``$set`` ``update`` on the document with ``id_value`` and return the updated document."""
+        if not ObjectId.is_valid(id_value):
+            return None
+        return await self.find_one_and_update(
+            collection, {"_id": ObjectId(id_value)}, {"$set": update}, projection=projection
+        )
+
+    async def upsert_one(
+        self,
+        collection: str,
+        filter: dict[str, Any],
+        update: dict[str, Any],
+        *,
+        projection: Optional[Projection] = None,
+    ) -> dict[str, Any]:
+        """
+        Update the first match of ``filter`` or insert it, returning the resulting document.
+        Use ``$setOnInsert`` in ``update`` for fields that must only be written on insert.
+        """
+        doc = await self.find_one_and_update(collection, filter, update, projection=projection, upsert=True)
+        if doc is None:
+            # With upsert and ReturnDocument.AFTER the server always returns a document
+            raise RuntimeError(f"upsert into {collection} returned no document")
+        return doc
+
+    # Change streams
+    def watch(self, pipeline: Optional[list[dict[str, Any]]] = None, **kwargs: Any) -> Any:
+        """Open a database-level change stream (requires a replica set); use with ``async with``."""
+        return self._db.watch(pipeline, **kwargs)
+
+    # Bulk
+    async def bulk_write(
+        self,
+        collection: str,
+        operations: Sequence[Any],
+        *,
+        chunk_size: int = 500,
+    ) -> BulkWriteOutcome:
+        """
+        Run write operations as unordered bulk writes, split into chunks of ``chunk_size``.
+        Chunks are sent concurrently; a failing operation does not stop the others.
+        """
+        outcome = BulkWriteOutcome()
+        if not operations:
+            return outcome
+        coll = self.collection(collection)
+
+        async def run_chunk(offset: int) -> None:
+            chunk = list(operations[offset:offset + chunk_size])
+            try:
+                result = await coll.bulk_write(chunk, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as exc:
+                details = exc.details
+                for err in details.get("writeErrors", []):
+                    outcome.errors[offset + err["index"]] = err.get("errmsg", "write failed")
+            outcome.matched_count += details.get("nMatched", 0)
+            outcome.modified_count += details.get("nModified", 0)
+            outcome.upserted_count += details.get("nUpserted", 0)
+
+        await asyncio.gather(*(run_chunk(offset) for offset in range(0, len(operations), chunk_size)))
+        return outcome
+
     # Delete
     async def delete_one_by_id(self, collection: str, id_value: str) -> bool:
         if not ObjectId.is_valid(id_value):
@@ -67,4 +294,49 @@ class MongoDatabase:
         result = await self.collection(collection).delete_one({"_id": ObjectId(id_value)})
         return result.deleted_count == 1
 
+    async def find_one_and_delete(
+        self,
+        collection: str,
+        filter: dict[str, Any],
+        *,
+        projection: Optional[Projection] = None,
+        sort: Optional[Iterable[tuple[str, int]]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Delete the first match of ``filter`` and return it (None if nothing matched)."""
+        return await self.collection(collection).find_one_and_delete(
+            filter, projection=projection, sort=list(sort) if sort else None
+        )
+
+    async def delete_one_by_id_and_return(
+        self, collection: str, id_value: str, *, projection: Optional[Projection] = None
+    ) -> Optional[dict[str, Any]]:
+        if not ObjectId.is_valid(id_value):
+            return None
+        return await self.find_one_and_delete(collection, {"_id": ObjectId(id_value)}, projection=projection)
+
+
+_shared_db: Optional[MongoDatabase] = None
+
+
+def get_db() -> MongoDatabase:
+    """
+    The application-scoped data-access object. Services and FastAPI dependencies share this
+    one instance (and therefore one client and connection pool) instead of building their own.
+    """
+    global _shared_db
+    if _shared_db is None:
+        _shared_db = MongoDatabase()
+    return _shared_db
+
+
+@asynccontextmanager
+async def database_lifespan() -> AsyncGenerator[MongoDatabase, None]:
+    """Open and warm the pool, yield the shared handle, and drop it when the client closes."""
+    global _shared_db
+    async with mongo_lifespan():
+        try:
+            yield get_db()
+        finally:
+            _shared_db = None
+
 
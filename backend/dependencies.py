@@ -1,6 +1,12 @@
 from typing import Annotated
 
-from fastapi import Header, HTTPException
+from fastapi import Depends, Header, HTTPException
+
+from backend.database import MongoDatabase, get_db
+
+
+# The application-scoped data-access object, for routes that talk to Mongo directly
+DatabaseDep = Annotated[MongoDatabase, Depends(get_db)]
 
 
 async def get_token_header(x_token: Annotated[str, Header()]):
@@ -1,8 +1,82 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+
+from backend.clients.mongo_db import pool_stats
+from backend.config import settings
+from backend.dependencies import DatabaseDep
+from backend.services import board_events, kanban_service, portfolio_service, recompute_service, series_service, ticker_service
+from backend.services.metrics_service import CALCULATION_VERSION
 
 router = APIRouter()
 
 
 @router.post("/")
 async def update_admin():
-    return {"message": "Admin getting schwifty"}
\ No newline at end of file
+    return {"message": "Admin getting schwifty"}
+
+
+@router.get("/cache/boards")
+async def board_cache_stats():
+    return kanban_service.board_cache.stats()
+
+
+@router.delete("/cache/boards")
+async def clear_board_cache():
+    kanban_service.board_cache.clear()
+    return {"ok": True}
+
+
+@router.get("/cache/series")
+async def series_cache_stats():
+    return series_service.series_cache.stats()
+
+
+@router.get("/events/boards")
+async def board_event_stats():
+    """Board WebSocket fan-out: subscribers, pending/coalesced deltas and resyncs"""
+    return {"source": settings.BOARD_EVENTS_SOURCE, **board_events.board_bus.stats()}
+
+
+@router.get("/events/ticker")
+async def ticker_event_stats():
+    """Ticker WebSocket fan-out: ticks, subscribers, queued/dropped frames and catch-up snapshots"""
+    return ticker_service.ticker_feed.stats()
+
+
+@router.post("/metrics/portfolio/reconcile")
+async def reconcile_portfolio(apply: bool = False):
+    """Recompute the portfolio aggregate from the snapshots and report drift; ``apply`` repairs it"""
+    return await portfolio_service.reconcile(apply=apply)
+
+
+@router.get("/metrics/recompute")
+async def recompute_progress(version: str = CALCULATION_VERSION):
+    """Recompute job state: checkpoint, processed buckets/days, percent and live throughput"""
+    return await recompute_service.progress(version)
+
+
+@router.post("/metrics/recompute")
+async def start_recompute(version: str = CALCULATION_VERSION, force: bool = False, restart: bool = False):
+    """Recalculate stored snapshots under ``version``, resuming from the last checkpoint unless ``restart``"""
+    try:
+        return await recompute_service.start(version, force=force, restart=restart)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown calculation version {version}")
+    except recompute_service.RecomputeRunning as exc:
+        raise HTTPException(status_code=409, detail=f"A recompute to {exc} is already running")
+
+
+@router.delete("/metrics/recompute")
+async def cancel_recompute():
+    """Stop the running recompute; a later start resumes from its checkpoint"""
+    return {"cancelled": await recompute_service.cancel()}
+
+
+@router.get("/db/pool")
+async def db_pool_stats(db: DatabaseDep):
+    """Connection pool usage: open/in-use/available connections and wait-queue depth per server"""
+    return {
+        "database": db.name,
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        **pool_stats.snapshot(),
+    }
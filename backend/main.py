@@ -5,24 +5,48 @@ from .internals import admin
 from .routers import items, users
 from backend.routers import projects as projects_router
 from backend.routers import kanban as kanban_router
+from backend.routers import realtime as realtime_router
+from backend.routers import metrics as metrics_router
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from backend.auth import azure_scheme
 from backend.config import settings
-from backend.clients.mongo_db import mongo_lifespan
+from backend.database import database_lifespan
+from backend.services import board_events, kanban_service, portfolio_service, ticker_service
 from backend.utils.seed import seed_initial_data
 from backend.utils.indexes import ensure_indexes
+from backend.utils.migrations import migrate_due_dates, migrate_positions_to_ranks
+from backend.utils.responses import ORJSONResponse
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    async with mongo_lifespan():
+    async with database_lifespan() as db:
+        app.state.db = db
         # Only load Azure AD config if tenant ID is provided
         if settings.AZURE_TENANT_ID:
             await azure_scheme.openid_config.load_config()
         await seed_initial_data()
         await ensure_indexes()
+        await migrate_due_dates()
+        if settings.ORDERING_MODE == "rank":
+            await migrate_positions_to_ranks()
+        change_stream = None
+        if settings.BOARD_EVENTS_SOURCE == "change_stream":
+            change_stream = asyncio.create_task(
+                board_events.follow_change_stream(db, on_change=kanban_service.invalidate_board_cache)
+            )
+        background = [asyncio.create_task(ticker_service.ticker_feed.run(settings.TICKER_TICK_INTERVAL_MS / 1000))]
+        if settings.METRICS_RECONCILE_INTERVAL_SECONDS > 0:
+            background.append(asyncio.create_task(portfolio_service.run_reconcile(settings.METRICS_RECONCILE_INTERVAL_SECONDS)))
         yield
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        if change_stream is not None:
+            change_stream.cancel()
+            await asyncio.gather(change_stream, return_exceptions=True)
 
 
 app = FastAPI(
@@ -33,6 +57,7 @@ app = FastAPI(
         'scopes': settings.SCOPE_NAME,
     },
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
  
@@ -44,6 +69,8 @@ app.include_router(users.router)
 app.include_router(items.router)
 app.include_router(projects_router.router)
 app.include_router(kanban_router.router)
+app.include_router(metrics_router.router)
+app.include_router(realtime_router.router)
 app.include_router(
     admin.router,
     prefix="/admin",
@@ -58,6 +85,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=['*'],
         allow_headers=['*'],
+        expose_headers=['X-Next-Cursor', 'ETag'],
     )
 
  
@@ -1,11 +1,11 @@
 """Board models for Kanban boards"""
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional, Union
 
 from pydantic import BaseModel, Field
 
-from backend.models.card import CardPublic
+from backend.models.card import CardPublic, CardSummary
 from backend.models.column import ColumnPublic
 
 
@@ -31,6 +31,8 @@ class BoardUpdate(BaseModel):
 class BoardInDB(BoardBase):
     """Board model as stored in database with ID"""
     id: str
+    # Incremented by every card/column/board write; see GET /api/boards/{id}/changes
+    version: int = 0
 
 
 class BoardPublic(BoardInDB):
@@ -41,7 +43,8 @@ class BoardPublic(BoardInDB):
 class BoardsListResponse(BaseModel):
     """Response model for listing boards"""
     items: list[BoardPublic]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = Field(default=None, validation_alias="nextCursor", serialization_alias="nextCursor")
 
 
 class BoardBundle(BaseModel):
@@ -50,3 +53,53 @@ class BoardBundle(BaseModel):
     columns: list[ColumnPublic]
     cards: list[CardPublic]
 
+
+class BoardSummaryBundle(BaseModel):
+    """Board data for the column view: cards without description and checklist (view=summary)"""
+    board: BoardPublic
+    columns: list[ColumnPublic]
+    cards: list[CardSummary]
+
+
+class PagedBoardBundle(BaseModel):
+    """Board data with only the first cards of each column (cardsPerColumn=N); the rest via the column card pages"""
+    board: BoardPublic
+    columns: list[ColumnPublic]
+    cards: list[Union[CardPublic, CardSummary]]
+    column_totals: dict[str, int] = Field(validation_alias="columnTotals", serialization_alias="columnTotals")
+    # Per column with more cards: the ``after`` token of its next page
+    next_after: dict[str, str] = Field(default_factory=dict, validation_alias="nextAfter", serialization_alias="nextAfter")
+
+
+class BoardChange(BaseModel):
+    """One logged write: the delta also pushed over WS /ws/boards/{id}, tagged with the board version it produced"""
+    v: int
+    op: str
+    id: str
+    data: Optional[dict[str, Any]] = None
+
+
+class BoardChanges(BaseModel):
+    """Response model for board delta sync"""
+    version: int
+    # True when the log no longer reaches back to ``since``; ``bundle`` then holds the whole board
+    full: bool = False
+    changes: list[BoardChange] = Field(default_factory=list)
+    bundle: Optional[BoardBundle] = None
+
+
+class ReorderItemResult(BaseModel):
+    """Outcome of a single card/column move within a reorder request"""
+    id: str
+    matched: bool = False  # document exists
+    modified: bool = False  # document changed (False when already in place)
+    error: Optional[str] = None
+
+
+class ReorderResult(BaseModel):
+    """Response model for bulk card/column reordering"""
+    ok: bool
+    matched: int
+    modified: int
+    failed: int
+    results: list[ReorderItemResult]
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -25,6 +25,7 @@ class CardBase(BaseModel):
     board_id: Optional[str] = Field(default=None, validation_alias="boardId", serialization_alias="boardId")
     title: str
     position: int
+    rank: Optional[str] = None  # Lexicographic order key, used when ORDERING_MODE=rank
     description: Optional[str] = None
     project_id: Optional[str] = Field(default=None, validation_alias="projectId", serialization_alias="projectId")
     
@@ -57,6 +58,13 @@ class CardUpdate(BaseModel):
     comment_count: Optional[int] = Field(default=None, validation_alias="commentCount", serialization_alias="commentCount")
 
 
+class CardMove(BaseModel):
+    """Schema for moving a card between two neighbours (rank ordering)"""
+    column_id: str = Field(validation_alias="columnId", serialization_alias="columnId")
+    prev_id: Optional[str] = Field(default=None, validation_alias="prevId", serialization_alias="prevId")  # card above the new slot
+    next_id: Optional[str] = Field(default=None, validation_alias="nextId", serialization_alias="nextId")  # card below the new slot
+
+
 class CardInDB(CardBase):
     """Card model as stored in database with ID"""
     id: str
@@ -66,3 +74,39 @@ class CardPublic(CardInDB):
     """Card model for public API responses"""
     pass
 
+
+class CardSummary(BaseModel):
+    """Card as the column view shows it (GET /api/boards/{id}?view=summary); details via GET /api/cards/{id}"""
+    id: str
+    column_id: str = Field(validation_alias="columnId", serialization_alias="columnId")
+    title: str
+    position: int
+    rank: Optional[str] = None
+    project_id: Optional[str] = Field(default=None, validation_alias="projectId", serialization_alias="projectId")
+    assignees: list[str] = Field(default_factory=list)
+    labels: list[Label] = Field(default_factory=list)
+    due_date: Optional[datetime] = Field(default=None, validation_alias="dueDate", serialization_alias="dueDate")
+    attachment_count: int = Field(default=0, validation_alias="attachmentCount", serialization_alias="attachmentCount")
+    comment_count: int = Field(default=0, validation_alias="commentCount", serialization_alias="commentCount")
+    checklist_done: int = Field(default=0, validation_alias="checklistDone", serialization_alias="checklistDone")
+    checklist_total: int = Field(default=0, validation_alias="checklistTotal", serialization_alias="checklistTotal")
+
+
+class ColumnCardsPage(BaseModel):
+    """One page of a column's cards (GET /api/boards/{id}/columns/{column_id}/cards)"""
+    items: list[Union[CardPublic, CardSummary]]
+    total: Optional[int] = None
+    # Pass as ``after`` for the next page; None on the last page
+    next_after: Optional[str] = Field(default=None, validation_alias="nextAfter", serialization_alias="nextAfter")
+
+
+class TaskPublic(CardPublic):
+    """Card listed in the cross-board task view, with its board and column names"""
+    board_name: Optional[str] = Field(default=None, validation_alias="boardName", serialization_alias="boardName")
+    column_name: Optional[str] = Field(default=None, validation_alias="columnName", serialization_alias="columnName")
+
+
+class TasksResponse(BaseModel):
+    """Response model for the cross-board task list"""
+    items: list[TaskPublic]
+    next_cursor: Optional[str] = Field(default=None, validation_alias="nextCursor", serialization_alias="nextCursor")
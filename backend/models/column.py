@@ -11,6 +11,7 @@ class ColumnBase(BaseModel):
     board_id: str = Field(validation_alias="boardId", serialization_alias="boardId")
     title: str
     position: int
+    rank: Optional[str] = None  # Lexicographic order key, used when ORDERING_MODE=rank
 
 
 class ColumnCreate(ColumnBase):
@@ -25,6 +26,12 @@ class ColumnUpdate(BaseModel):
     position: Optional[int] = None
 
 
+class ColumnMove(BaseModel):
+    """Schema for moving a column between two neighbours (rank ordering)"""
+    prev_id: Optional[str] = Field(default=None, validation_alias="prevId", serialization_alias="prevId")  # column to the left
+    next_id: Optional[str] = Field(default=None, validation_alias="nextId", serialization_alias="nextId")  # column to the right
+
+
 class ColumnInDB(ColumnBase):
     """Column model as stored in database with ID"""
     id: str
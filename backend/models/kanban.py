@@ -7,25 +7,37 @@ from __future__ import annotations
 from backend.models.board import (
     BoardBase,
     BoardBundle,
+    BoardChange,
+    BoardChanges,
     BoardCreate,
     BoardInDB,
     BoardPublic,
     BoardsListResponse,
+    BoardSummaryBundle,
     BoardUpdate,
+    PagedBoardBundle,
+    ReorderItemResult,
+    ReorderResult,
 )
 from backend.models.card import (
     CardBase,
     CardCreate,
     CardInDB,
+    CardMove,
     CardPublic,
+    CardSummary,
     CardUpdate,
     ChecklistItem,
+    ColumnCardsPage,
     Label,
+    TaskPublic,
+    TasksResponse,
 )
 from backend.models.column import (
     ColumnBase,
     ColumnCreate,
     ColumnInDB,
+    ColumnMove,
     ColumnPublic,
     ColumnUpdate,
 )
@@ -39,11 +51,18 @@ __all__ = [
     "BoardPublic",
     "BoardsListResponse",
     "BoardBundle",
+    "BoardSummaryBundle",
+    "PagedBoardBundle",
+    "BoardChange",
+    "BoardChanges",
+    "ReorderItemResult",
+    "ReorderResult",
     # Column models
     "ColumnBase",
     "ColumnCreate",
     "ColumnUpdate",
     "ColumnInDB",
+    "ColumnMove",
     "ColumnPublic",
     # Card models
     "Label",
@@ -52,7 +71,12 @@ __all__ = [
     "CardCreate",
     "CardUpdate",
     "CardInDB",
+    "CardMove",
     "CardPublic",
+    "CardSummary",
+    "ColumnCardsPage",
+    "TaskPublic",
+    "TasksResponse",
 ]
 
 
@@ -0,0 +1,83 @@
+"""Project metrics models (docs/METRICS_MODEL.md)"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProjectTickerDatum(BaseModel):
+    """One project on the ticker bar (frontend/src/types/ticker.ts)"""
+    project_id: str = Field(validation_alias="projectId", serialization_alias="projectId")
+    symbol: str
+    name: str
+    profit: float  # latest daily profit
+    margin: float
+    time_saved_hrs: float = Field(validation_alias="timeSavedHrs", serialization_alias="timeSavedHrs")
+    prs: Optional[int] = None
+    app_events: Optional[int] = Field(default=None, validation_alias="appEvents", serialization_alias="appEvents")
+    index_series: list[float] = Field(default_factory=list, validation_alias="indexSeries", serialization_alias="indexSeries")
+
+
+class TickerResponse(BaseModel):
+    items: list[ProjectTickerDatum]
+
+
+class TickerDelta(BaseModel):
+    """Changed ticker fields of one project; ``indexPoint`` is appended to its sparkline"""
+    project_id: str = Field(validation_alias="projectId", serialization_alias="projectId")
+    profit: Optional[float] = None
+    margin: Optional[float] = None
+    time_saved_hrs: Optional[float] = Field(default=None, validation_alias="timeSavedHrs", serialization_alias="timeSavedHrs")
+    prs: Optional[int] = None
+    app_events: Optional[int] = Field(default=None, validation_alias="appEvents", serialization_alias="appEvents")
+    index_point: Optional[float] = Field(default=None, validation_alias="indexPoint", serialization_alias="indexPoint")
+
+
+class RawInputs(BaseModel):
+    """Measured inputs of one project-day (docs/METRICS_MODEL.md, "Audit Trail")"""
+    billable_hours: float = Field(ge=0)
+    billable_rate: float = Field(ge=0)
+    actual_hours: float = Field(gt=0)  # projects require time
+    cost_rate: float = Field(ge=0)
+    fixed_costs: float = Field(ge=0)
+    baseline_hours: float = Field(gt=0)  # must have a reference point
+    prs: Optional[int] = Field(default=None, ge=0)
+    commits: Optional[int] = Field(default=None, ge=0)
+    lead_time_improvement: Optional[float] = None
+    cycle_time_improvement: Optional[float] = None
+    app_events: Optional[int] = Field(default=None, ge=0)
+
+
+class MetricRecord(BaseModel):
+    """One NDJSON line of POST /api/metrics/ingest"""
+    project_id: str = Field(min_length=1)
+    date: date
+    raw_inputs: RawInputs
+
+
+class IngestError(BaseModel):
+    line: int
+    error: str
+
+
+class IngestReport(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    errors: list[IngestError] = Field(default_factory=list)
+    # More lines failed than METRICS_INGEST_MAX_ERRORS; only the first ones are listed
+    errors_truncated: bool = Field(default=False, validation_alias="errorsTruncated", serialization_alias="errorsTruncated")
+
+
+class PortfolioSummary(BaseModel):
+    """Totals across all projects; margins come from the totals, averages are per project"""
+    total_revenue: float = Field(validation_alias="totalRevenue", serialization_alias="totalRevenue")
+    total_cost: float = Field(validation_alias="totalCost", serialization_alias="totalCost")
+    total_profit: float = Field(validation_alias="totalProfit", serialization_alias="totalProfit")
+    overall_margin: float = Field(validation_alias="overallMargin", serialization_alias="overallMargin")
+    total_time_saved: float = Field(validation_alias="totalTimeSaved", serialization_alias="totalTimeSaved")
+    average_profit: float = Field(validation_alias="averageProfit", serialization_alias="averageProfit")
+    average_margin: float = Field(validation_alias="averageMargin", serialization_alias="averageMargin")
+    project_count: int = Field(validation_alias="projectCount", serialization_alias="projectCount")
+    updated_at: Optional[datetime] = Field(default=None, validation_alias="updatedAt", serialization_alias="updatedAt")
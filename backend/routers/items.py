@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from ..dependencies import get_token_header
 from backend.services import item_service
@@ -11,8 +13,18 @@ router = APIRouter(
 
 
 @router.get("/")
-async def read_items():
-    return await item_service.list_items_mapping()
+async def read_items(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+):
+    try:
+        items, next_cursor = await item_service.list_items_mapping(limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.get("/{item_id}")
@@ -1,33 +1,143 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from backend.models.board import BoardCreate, BoardUpdate, BoardPublic, BoardsListResponse, BoardBundle
-from backend.models.column import ColumnCreate, ColumnUpdate, ColumnPublic
-from backend.models.card import CardCreate, CardUpdate, CardPublic
+from backend.models.board import BoardCreate, BoardUpdate, BoardPublic, BoardsListResponse, BoardBundle, BoardChanges, BoardSummaryBundle, PagedBoardBundle, ReorderResult
+from backend.models.column import ColumnCreate, ColumnUpdate, ColumnPublic, ColumnMove
+from backend.models.card import CardCreate, CardUpdate, CardPublic, CardMove, ColumnCardsPage, TasksResponse
+from backend.config import settings
 from backend.services import kanban_service
+from backend.utils.http_cache import conditional_response, etag_matches, not_modified, set_validators, version_etag
+from backend.utils.responses import NegotiatedResponse, NegotiatedRoute, fast_response
 
 
-router = APIRouter(prefix="/api", tags=["kanban"])
+router = APIRouter(
+    prefix="/api", tags=["kanban"], route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
 
-@router.get("/boards", response_model=BoardsListResponse)
-async def list_boards():
-    # simple list of boards
-    boards = [
-        {"id": str(b["_id"]), **{k: v for k, v in b.items() if k != "_id"}}
-        async for b in kanban_service._boards().find({}).sort([("name", 1)])
-    ]
-    return {"items": [BoardPublic(**b) for b in boards], "total": len(boards)}
+@router.get("/boards", response_model=BoardsListResponse, response_model_exclude_unset=True)
+async def list_boards(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False, alias="includeTotal"),
+    fields: Optional[str] = Query(None, description="Comma-separated board fields to return"),
+):
+    try:
+        boards, total, next_cursor = await kanban_service.list_boards(
+            limit=limit, cursor=cursor, include_total=include_total, fields=fields
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    payload = {"items": boards, "total": total, "nextCursor": next_cursor}
+    return conditional_response(request, response, payload, settings.CACHE_CONTROL_BOARD_LIST)
 
 
-@router.get("/boards/{board_id}", response_model=BoardBundle)
-async def get_board(board_id: str):
-    data = await kanban_service.get_board_with_children(board_id)
+@router.get("/boards/{board_id}", response_model=Union[BoardBundle, BoardSummaryBundle, PagedBoardBundle])
+async def get_board(
+    board_id: str,
+    request: Request,
+    response: Response,
+    view: Literal["full", "summary"] = Query("full", description="summary: cards without description and checklist"),
+    cards_per_column: Optional[int] = Query(
+        None, alias="cardsPerColumn", ge=1, le=500,
+        description="Only the first N cards of each column, plus per-column totals; the rest via /columns/{id}/cards",
+    ),
+):
+    # The version is read before the bundle, so the ETag never claims a newer version than
+    # the data it is sent with; an unchanged board is answered without reading the bundle
+    version = await kanban_service.get_board_version(board_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Board not found")
+    variant: tuple[Any, ...] = ("summary",) if view == "summary" else ()
+    if cards_per_column:
+        variant += (f"first{cards_per_column}",)
+    etag = version_etag("board", board_id, version, *variant)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CACHE_CONTROL_BOARD)
+    if cards_per_column:
+        data = await kanban_service.get_board_first_cards(board_id, cards_per_column)
+        if data and view == "summary":
+            data["cards"] = [kanban_service.summarize_card(card) for card in data["cards"]]
+    elif view == "summary":
+        data = await kanban_service.get_board_summary(board_id)
+    else:
+        data = await kanban_service.get_board_with_children(board_id)
     if not data:
         raise HTTPException(status_code=404, detail="Board not found")
-    return data
+    etag = version_etag("board", board_id, min(version, data["board"].version), *variant)
+    set_validators(response, etag, settings.CACHE_CONTROL_BOARD)
+    # Already built from validated models; skip BoardBundle re-validation
+    return fast_response(data, response)
+
+
+@router.get("/boards/{board_id}/columns/{column_id}/cards", response_model=ColumnCardsPage)
+async def list_column_cards(
+    board_id: str,
+    column_id: str,
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Position (rank in rank mode) of the last card seen, or a nextAfter token"),
+    limit: int = Query(50, ge=1, le=500),
+    include_total: bool = Query(False, alias="includeTotal"),
+    view: Literal["full", "summary"] = Query("full", description="summary: cards without description and checklist"),
+):
+    version = await kanban_service.get_board_version(board_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Board not found")
+    variant: tuple[Any, ...] = (after or "start", limit)
+    if include_total:
+        variant += ("total",)
+    if view == "summary":
+        variant += ("summary",)
+    etag = version_etag("column", column_id, version, *variant)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CACHE_CONTROL_BOARD)
+    try:
+        page = await kanban_service.list_column_cards(
+            board_id, column_id, after=after, limit=limit, include_total=include_total
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid after: {after}")
+    if page is None:
+        raise HTTPException(status_code=404, detail="Column not found")
+    cards, total, next_after = page
+    items = [kanban_service.summarize_card(card) for card in cards] if view == "summary" else cards
+    set_validators(response, etag, settings.CACHE_CONTROL_BOARD)
+    return fast_response({"items": items, "total": total, "nextAfter": next_after}, response)
+
+
+@router.get("/boards/{board_id}/changes", response_model=BoardChanges)
+async def get_board_changes(board_id: str, since: int = Query(..., ge=0, description="Board version the client already has")):
+    data = await kanban_service.get_board_changes(board_id, since)
+    if not data:
+        raise HTTPException(status_code=404, detail="Board not found")
+    return fast_response(data)
+
+
+@router.get("/tasks", response_model=TasksResponse, response_model_exclude_unset=True)
+async def list_tasks(
+    request: Request,
+    response: Response,
+    assignee: Optional[str] = Query(None),
+    label: Optional[str] = Query(None),
+    overdue: bool = Query(False),
+    project_id: Optional[str] = Query(None, alias="projectId"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated card fields to return"),
+):
+    """Cards across all boards sorted by due date (undated last), cursor-paginated"""
+    try:
+        items, next_cursor = await kanban_service.list_tasks(
+            assignee=assignee, label=label, overdue=overdue, project_id=project_id, limit=limit, cursor=cursor, fields=fields
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return conditional_response(request, response, {"items": items, "nextCursor": next_cursor}, settings.CACHE_CONTROL_TASKS)
 
 
 @router.post("/boards", response_model=BoardPublic)
@@ -42,10 +152,10 @@ async def patch_board(board_id: str, body: BoardUpdate):
     return {"ok": True}
 
 @router.get("/projects/{project_id}/boards", response_model=BoardsListResponse)
-async def list_project_boards(project_id: str):
+async def list_project_boards(project_id: str, request: Request, response: Response):
     """Get all boards for a specific project"""
     boards = await kanban_service.list_boards_by_project(project_id)
-    return {"items": boards, "total": len(boards)}
+    return conditional_response(request, response, {"items": boards, "total": len(boards)}, settings.CACHE_CONTROL_BOARD_LIST)
 
 @router.delete("/boards/{board_id}")
 async def delete_board(board_id: str):
@@ -55,6 +165,22 @@ async def delete_board(board_id: str):
     return {"ok": True}
 
 
+def _reject_positions_in_rank_mode(move_route: str) -> None:
+    # Rank mode orders by rank, so a position write would be stored but never shown
+    if settings.ORDERING_MODE == "rank":
+        raise HTTPException(status_code=409, detail=f"Rank ordering is enabled; use {move_route}")
+
+
+# Declared before /columns/{id} routes so "reorder" is not captured as an id
+@router.patch("/columns/reorder", response_model=ReorderResult)
+async def patch_columns_reorder(body: dict[str, Any]):
+    _reject_positions_in_rank_mode("POST /api/columns/{id}/move")
+    updates = body.get("updates")
+    if not isinstance(updates, list):
+        raise HTTPException(status_code=400, detail="updates must be a list")
+    return await kanban_service.reorder_columns(updates)
+
+
 @router.post("/columns", response_model=ColumnPublic)
 async def post_column(body: ColumnCreate):
     return await kanban_service.create_column(body.board_id, body.title, body.position)
@@ -62,12 +188,29 @@ async def post_column(body: ColumnCreate):
 
 @router.patch("/columns/{column_id}")
 async def patch_column(column_id: str, body: ColumnUpdate):
+    if body.position is not None:
+        _reject_positions_in_rank_mode("POST /api/columns/{id}/move")
     ok = await kanban_service.update_column(column_id, title=body.title, position=body.position)
     if not ok:
         raise HTTPException(status_code=404, detail="Column not found")
     return {"ok": True}
 
 
+@router.post("/columns/{column_id}/move", response_model=ColumnPublic)
+async def post_column_move(column_id: str, body: ColumnMove):
+    if settings.ORDERING_MODE != "rank":
+        raise HTTPException(status_code=409, detail="Rank ordering is disabled")
+    try:
+        col = await kanban_service.move_column(column_id, body.prev_id, body.next_id)
+    except kanban_service.MoveTargetNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except kanban_service.MoveConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if not col:
+        raise HTTPException(status_code=404, detail="Column not found")
+    return col
+
+
 @router.delete("/columns/{column_id}")
 async def delete_column(column_id: str):
     ok = await kanban_service.delete_column(column_id)
@@ -76,6 +219,16 @@ async def delete_column(column_id: str):
     return {"ok": True}
 
 
+# Declared before /cards/{id} routes so "reorder" is not captured as an id
+@router.patch("/cards/reorder", response_model=ReorderResult)
+async def patch_cards_reorder(body: dict[str, Any]):
+    _reject_positions_in_rank_mode("POST /api/cards/{id}/move")
+    updates = body.get("updates")
+    if not isinstance(updates, list):
+        raise HTTPException(status_code=400, detail="updates must be a list")
+    return await kanban_service.reorder_cards(updates)
+
+
 @router.post("/cards", response_model=CardPublic)
 async def post_card(body: CardCreate):
     # Extract all fields from the Pydantic model
@@ -86,16 +239,51 @@ async def post_card(body: CardCreate):
     return await kanban_service.create_card(column_id, title, position, **card_data)
 
 
+@router.get("/cards/{card_id}", response_model=CardPublic)
+async def get_card(card_id: str, request: Request, response: Response):
+    # Versioned by its board: every card write bumps the board version. As for the bundle,
+    # the version is read before the card itself.
+    board_id = await kanban_service.get_card_board_id(card_id)
+    version = await kanban_service.get_board_version(board_id) if board_id else None
+    if version is None:
+        raise HTTPException(status_code=404, detail="Card not found")
+    etag = version_etag("card", card_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CACHE_CONTROL_BOARD)
+    card = await kanban_service.get_card(card_id)
+    if not card:
+        raise HTTPException(status_code=404, detail="Card not found")
+    set_validators(response, etag, settings.CACHE_CONTROL_BOARD)
+    return fast_response(card, response)
+
+
 @router.patch("/cards/{card_id}")
 async def patch_card(card_id: str, body: CardUpdate):
     # Convert Pydantic model to dict with camelCase keys, excluding unset fields
     update_data = body.model_dump(by_alias=True, exclude_unset=True)
+    if "position" in update_data or "columnId" in update_data:
+        _reject_positions_in_rank_mode("POST /api/cards/{id}/move")
     ok = await kanban_service.update_card(card_id, **update_data)
     if not ok:
         raise HTTPException(status_code=404, detail="Card not found")
     return {"ok": True}
 
 
+@router.post("/cards/{card_id}/move", response_model=CardPublic)
+async def post_card_move(card_id: str, body: CardMove):
+    if settings.ORDERING_MODE != "rank":
+        raise HTTPException(status_code=409, detail="Rank ordering is disabled")
+    try:
+        card = await kanban_service.move_card(card_id, body.column_id, body.prev_id, body.next_id)
+    except kanban_service.MoveTargetNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except kanban_service.MoveConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if not card:
+        raise HTTPException(status_code=404, detail="Card not found")
+    return card
+
+
 @router.delete("/cards/{card_id}")
 async def delete_card(card_id: str):
     ok = await kanban_service.delete_card(card_id)
@@ -104,21 +292,3 @@ async def delete_card(card_id: str):
     return {"ok": True}
 
 
-@router.patch("/cards/reorder")
-async def patch_cards_reorder(body: dict[str, Any]):
-    updates = body.get("updates")
-    if not isinstance(updates, list):
-        raise HTTPException(status_code=400, detail="updates must be a list")
-    await kanban_service.reorder_cards(updates)
-    return {"ok": True}
-
-
-@router.patch("/columns/reorder")
-async def patch_columns_reorder(body: dict[str, Any]):
-    updates = body.get("updates")
-    if not isinstance(updates, list):
-        raise HTTPException(status_code=400, detail="updates must be a list")
-    await kanban_service.reorder_columns(updates)
-    return {"ok": True}
-
-
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from backend.models.metrics import IngestReport, PortfolioSummary, TickerResponse
+from backend.services import ingest_service, portfolio_service, series_service, snapshot_service, ticker_service
+from backend.services.metrics_service import MetricName
+
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/ticker", response_model=TickerResponse)
+async def get_ticker():
+    """Latest metrics and profit sparkline of every active project; live updates: WS /ws/metrics/ticker"""
+    return {"items": await ticker_service.get_ticker_items()}
+
+
+@router.get("/portfolio", response_model=PortfolioSummary)
+async def get_portfolio():
+    """Portfolio totals and averages, read from one incrementally maintained document"""
+    return await portfolio_service.get_portfolio()
+
+
+@router.post("/ingest", response_model=IngestReport)
+async def ingest_metrics(request: Request):
+    """
+    Store daily raw inputs sent as NDJSON, one ``{"project_id", "date", "raw_inputs": {...}}``
+    per line (docs/METRICS_MODEL.md). The body is streamed and processed in batches; a record
+    for an existing project and day replaces it. Returns counts and the errors of rejected lines.
+    """
+    return await ingest_service.ingest_ndjson(request.stream())
+
+
+# Longest range one snapshot/rollup query may cover
+MAX_RANGE_DAYS = 366
+
+
+def _date_range(start: Optional[date], end: Optional[date]) -> tuple[date, date]:
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    return start, end
+
+
+@router.get("/projects/{project_id}/daily")
+async def get_daily_snapshots(project_id: str, start: Optional[date] = Query(None), end: Optional[date] = Query(None)):
+    """Daily snapshots (raw inputs, calculated metrics, metadata) between start and end; defaults to the last 30 days"""
+    start, end = _date_range(start, end)
+    return {"items": await snapshot_service.get_daily(project_id, start, end)}
+
+
+@router.get("/projects/{project_id}/rollups")
+async def get_rollups(
+    project_id: str,
+    period: snapshot_service.Period = Query("week"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+):
+    """Weekly or monthly totals with margin and automation lift computed from them"""
+    start, end = _date_range(start, end)
+    return {"items": await snapshot_service.get_rollups(project_id, period, start, end)}
+
+
+@router.get("/projects/{project_id}/series")
+async def get_series(
+    project_id: str,
+    metric: MetricName = Query("profit"),
+    window: int = Query(30, ge=1, le=3650, description="Days of history, ending today"),
+    points: int = Query(30, ge=3, le=1000, description="Maximum points returned (LTTB downsampling)"),
+    baseline: Optional[float] = Query(None, description="Index base (= 100); defaults to the first value in the window"),
+):
+    """A daily metric over the window as an index series, downsampled for sparklines"""
+    return await series_service.get_series(project_id, metric=metric, window=window, points=points, baseline=baseline)
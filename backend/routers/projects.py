@@ -2,24 +2,40 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from backend.config import settings
 from backend.services import projects_service
+from backend.utils.http_cache import conditional_response, etag_matches, not_modified, set_validators, version_etag
+from backend.utils.responses import NegotiatedResponse, NegotiatedRoute, fast_response
 from backend.models.project import ProjectCreate, ProjectUpdate
 
 
-router = APIRouter(prefix="/api/projects", tags=["projects"])
+router = APIRouter(
+    prefix="/api/projects", tags=["projects"], route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
 
 
 @router.get("")
 async def list_projects(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=200),
     sort: Optional[str] = Query(None),
     filter: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    count: projects_service.CountStrategy = Query("exact"),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return"),
 ):
-    items, total = await projects_service.list_projects(page=page, limit=limit, sort=sort, filter=filter)
-    return {"items": items, "total": total}
+    try:
+        items, total, total_strategy, next_cursor = await projects_service.list_projects(
+            page=page, limit=limit, sort=sort, filter=filter, cursor=cursor, count=count, fields=fields
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    payload = {"items": items, "total": total, "totalStrategy": total_strategy, "nextCursor": next_cursor}
+    return conditional_response(request, response, payload, settings.CACHE_CONTROL_PROJECT_LIST, fast=True)
 
 
 @router.post("")
@@ -27,11 +43,24 @@ async def create_project(body: ProjectCreate):
     return await projects_service.create_project(body)
 
 @router.get("/{project_id}")
-async def get_project(project_id: str):
+async def get_project(project_id: str, request: Request, response: Response):
+    # Revalidation needs only the version, not the whole document
+    if "if-none-match" in request.headers:
+        version = await projects_service.get_project_version(project_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        etag = version_etag("project", project_id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag, settings.CACHE_CONTROL_PROJECT)
     proj = await projects_service.get_project(project_id)
     if not proj:
         raise HTTPException(status_code=404, detail="Project not found")
-    return proj
+    etag = version_etag("project", project_id, proj["version"])
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CACHE_CONTROL_PROJECT)
+    set_validators(response, etag, settings.CACHE_CONTROL_PROJECT)
+    # A raw document: encode its BSON values directly instead of via jsonable_encoder
+    return fast_response(proj, response)
 
 
 @router.patch("/{project_id}")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+from bson import ObjectId
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from backend.config import settings
+from backend.services import ticker_service
+from backend.services.board_events import board_bus
+
+
+router = APIRouter(tags=["realtime"])
+
+
+@router.websocket("/ws/boards/{board_id}")
+async def board_updates(websocket: WebSocket, board_id: str):
+    """
+    Push board deltas as ``{"type": "deltas", "boardId", "deltas": [...]}``. Deltas that pile
+    up while a message is being sent are coalesced per card/column; a subscriber that falls too
+    far behind gets ``{"type": "resync"}`` and should catch up through
+    GET /api/boards/{board_id}/changes?since=<the highest delta "v" it has seen>.
+    """
+    if not ObjectId.is_valid(board_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscription = board_bus.subscribe(board_id)
+    flush_interval = settings.BOARD_WS_FLUSH_INTERVAL_MS / 1000
+
+    async def send_updates() -> None:
+        while True:
+            deltas, resync = await subscription.next_batch()
+            if subscription.closed:
+                return
+            if resync:
+                await websocket.send_json({"type": "resync", "boardId": board_id})
+            if deltas:
+                await websocket.send_json({"type": "deltas", "boardId": board_id, "deltas": deltas})
+            # Anything published meanwhile is coalesced into the next message
+            await asyncio.sleep(flush_interval)
+
+    sender = asyncio.create_task(send_updates())
+    try:
+        # Clients do not send anything; reading only notices the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
+@router.websocket("/ws/metrics/ticker")
+async def ticker_updates(websocket: WebSocket):
+    """
+    Push ``{"type": "delta", "deltas": [TickerDelta, ...]}`` once per tick, with updates
+    coalesced per project. A subscriber too slow to keep up skips the queued messages and
+    gets one delta carrying the latest values of every project instead.
+    """
+    await websocket.accept()
+    subscription = ticker_service.ticker_feed.subscribe()
+    sender = asyncio.create_task(ticker_service.stream_frames(subscription, websocket.send_text))
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
@@ -1,12 +1,24 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
 from backend.services import user_service
 
 router = APIRouter()
 
 
 @router.get("/users/", tags=["users"], responses={404: {"description": "Not found"}},)
-async def read_users():
-    return await user_service.list_usernames()
+async def read_users(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+):
+    try:
+        users, next_cursor = await user_service.list_usernames(limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 
 @router.get("/users/me", tags=["users"])
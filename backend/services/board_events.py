@@ -0,0 +1,187 @@
+"""
+Board deltas for real-time clients.
+
+A delta is ``{"op": "<entity>.<action>", "id": ..., "data": {...}}`` where entity is board,
+column or card and action is created, updated, moved or deleted; ``data`` carries only the
+fields that changed (the whole document for ``created``). ``kanban_service`` logs the deltas
+of every write on the board document and publishes them, unless BOARD_EVENTS_SOURCE is
+"change_stream", in which case ``follow_change_stream`` reads them back from MongoDB instead
+so all replicas see all writes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from bson import ObjectId, encode as bson_encode
+from fastapi.encoders import jsonable_encoder
+from pymongo.errors import OperationFailure, PyMongoError
+
+from backend.config import settings
+from backend.database import MongoDatabase
+from backend.utils.events import Event, EventBus
+
+logger = logging.getLogger(__name__)
+
+# Fields whose change turns an update into a move
+MOVE_FIELDS = frozenset({"columnId", "position", "rank"})
+
+
+def _delta_key(delta: Event) -> Hashable:
+    return delta["op"].split(".", 1)[0], delta["id"]
+
+
+def merge_deltas(previous: Event, current: Event) -> Optional[Event]:
+    """Coalesce two pending deltas for the same entity; None if they cancel out."""
+    entity, before = previous["op"].split(".", 1)
+    after = current["op"].split(".", 1)[1]
+    if after == "deleted":
+        return None if before == "created" else current
+    if before == "deleted":
+        return current
+    if before == "created":
+        action = "created"
+    else:
+        action = after if after == before else "updated"
+    data = {**previous.get("data", {}), **current.get("data", {})}
+    return {**previous, **current, "op": f"{entity}.{action}", "data": data}
+
+
+# Topic = board id
+board_bus = EventBus(max_pending=settings.BOARD_WS_MAX_PENDING, key=_delta_key, merge=merge_deltas)
+
+
+def delta(op: str, id_value: Any, data: Optional[dict[str, Any]] = None) -> Event:
+    out: Event = {"op": op, "id": str(id_value)}
+    if data:
+        out["data"] = jsonable_encoder(
+            {k: v for k, v in data.items() if k not in ("_id", "id")}, custom_encoder={ObjectId: str}
+        )
+    return out
+
+
+def change_delta(entity: str, id_value: Any, changes: dict[str, Any]) -> Event:
+    """``<entity>.moved`` if ``changes`` touches ordering fields, otherwise ``<entity>.updated``."""
+    action = "moved" if entity != "board" and MOVE_FIELDS.intersection(changes) else "updated"
+    return delta(f"{entity}.{action}", id_value, changes)
+
+
+def publish(board_id: Optional[str], *deltas: Event) -> None:
+    if not board_id or settings.BOARD_EVENTS_SOURCE != "local":
+        return
+    for d in deltas:
+        board_bus.publish(board_id, d)
+
+
+# Change log
+#
+# Each board document carries ``version`` and ``changeLog``, the deltas of its most recent
+# writes (one entry per write, ``{"ops": [...], "at": ...}``), both updated atomically in the
+# same update. The last entry therefore belongs to ``version`` and entry i to
+# ``version - len(changeLog) + 1 + i``. An entry with ``ops: None`` was too large to log
+# (BOARD_CHANGELOG_MAX_OPS, BOARD_CHANGELOG_MAX_ENTRY_BYTES), which keeps the log's share of
+# the board document bounded. Only ``kanban_service.get_board_changes`` and the change stream
+# read the log; every other board read projects it away (``{"changeLog": 0}``).
+
+
+def log_entry(deltas: Sequence[Event], at: Any) -> dict[str, Any]:
+    ops: Optional[list[Event]] = list(deltas) if len(deltas) <= settings.BOARD_CHANGELOG_MAX_OPS else None
+    if ops and len(bson_encode({"ops": ops})) > settings.BOARD_CHANGELOG_MAX_ENTRY_BYTES:
+        ops = None
+    return {"ops": ops, "at": at}
+
+
+def changes_since(board: dict[str, Any], since: int) -> Optional[list[Event]]:
+    """
+    The logged deltas after version ``since``, each tagged with its version ``v``; None if the
+    log no longer reaches back that far (or ``since`` is ahead of the board).
+    """
+    version = board.get("version", 0)
+    log = board.get("changeLog") or []
+    oldest = version - len(log) + 1
+    if since > version or since < oldest - 1:
+        return None
+    out: list[Event] = []
+    for offset, entry in enumerate(log[since - oldest + 1:]):
+        if entry.get("ops") is None:
+            return None
+        out.extend({**op, "v": since + 1 + offset} for op in entry["ops"])
+    return out
+
+
+# Change stream adapter
+
+# Resume token no longer in the oplog (ChangeStreamHistoryLost / ChangeStreamFatalError)
+_HISTORY_LOST_CODES = {280, 286}
+
+
+def deltas_from_change(change: dict[str, Any]) -> tuple[str, Optional[list[Event]]]:
+    """
+    Translate a change event on the boards collection into (board id, deltas). Card/column
+    writes reach the boards collection as change log appends, so only boards are watched.
+    Deltas are None when the write cannot be replayed and subscribers must resync.
+    """
+    board_id = str(change["documentKey"]["_id"])
+    op_type = change["operationType"]
+    if op_type == "delete":
+        return board_id, [delta("board.deleted", board_id)]
+    version = change.get("updateDescription", {}).get("updatedFields", {}).get("version")
+    if op_type != "update" or version is None:
+        return board_id, []
+    full = change.get("fullDocument")
+    if not full:
+        # Deleted before the lookup ran; the delete event follows
+        return board_id, []
+    # The looked-up document may already be a few writes ahead, so pick this event's entry
+    log = full.get("changeLog") or []
+    index = version - (full.get("version", 0) - len(log) + 1)
+    ops = log[index].get("ops") if 0 <= index < len(log) else None
+    if ops is None:
+        return board_id, None
+    return board_id, [{**op, "v": version} for op in ops]
+
+
+async def follow_change_stream(
+    db: MongoDatabase,
+    *,
+    on_change: Optional[Callable[[Optional[str]], None]] = None,
+    retry_seconds: float = 1.0,
+) -> None:
+    """
+    Feed ``board_bus`` from a MongoDB change stream on the boards collection, resuming after
+    transient errors. ``on_change(board_id)`` runs for every board write (board_id is None
+    after events were lost), e.g. to invalidate caches written by other replicas.
+    Runs until cancelled.
+    """
+    pipeline = [{"$match": {"ns.coll": "boards", "operationType": {"$in": ["update", "delete"]}}}]
+    resume_token = None
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    board_id, deltas = deltas_from_change(change)
+                    if deltas is None:
+                        board_bus.resync(board_id)
+                    elif not deltas:
+                        continue
+                    if on_change is not None:
+                        on_change(board_id)
+                    for d in deltas or ():
+                        board_bus.publish(board_id, d)
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as exc:
+            if exc.code in _HISTORY_LOST_CODES:
+                # Events were missed; every subscriber has to reload its board
+                logger.warning("Board change stream history lost, forcing resync: %s", exc)
+                resume_token = None
+                board_bus.resync_all()
+                if on_change is not None:
+                    on_change(None)
+            else:
+                logger.warning("Board change stream failed, retrying: %s", exc)
+        except PyMongoError as exc:
+            logger.warning("Board change stream interrupted, retrying: %s", exc)
+        await asyncio.sleep(retry_seconds)
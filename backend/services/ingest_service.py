@@ -0,0 +1,102 @@
+"""
+Bulk ingestion of raw metric inputs from NDJSON (POST /api/metrics/ingest).
+
+Lines are parsed and validated one by one as they stream in, collected into batches of
+METRICS_INGEST_BATCH_SIZE, checked against the derived-value rules of docs/METRICS_MODEL.md
+("Validation Checks") in one vectorized pass, and stored with ``record_snapshots``: one read
+and two unordered bulk writes per batch. Only one batch is held in memory at a time.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncIterable, Optional
+
+import numpy as np
+from pydantic import ValidationError
+
+from backend.config import settings
+from backend.models.metrics import IngestError, IngestReport, MetricRecord
+from backend.services import series_service, snapshot_service, ticker_service
+from backend.services.metrics_service import DAILY_INPUTS, calculator, columns_from_records
+from backend.utils.ndjson import iter_lines
+
+# (check, message) over the calculated metrics of a batch; per-field rules live on RawInputs
+_RULES = (
+    (lambda m: m["revenue"] >= 0, "revenue must be >= 0"),
+    (lambda m: m["cost"] >= 0, "cost must be >= 0"),
+    (lambda m: m["margin"] <= 1, "margin must be <= 1"),
+)
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'line'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+class _Report:
+    def __init__(self, max_errors: int) -> None:
+        self.report = IngestReport()
+        self._max_errors = max_errors
+
+    def accept(self, count: int) -> None:
+        self.report.accepted += count
+
+    def reject(self, line: int, error: str) -> None:
+        self.report.rejected += 1
+        if len(self.report.errors) < self._max_errors:
+            self.report.errors.append(IngestError(line=line, error=error))
+        else:
+            self.report.errors_truncated = True
+
+
+def check_rules(records: list[dict[str, Any]]) -> list[Optional[str]]:
+    """The first violated derived-value rule of each record (None if it passes)."""
+    metrics = calculator.calculate_batch(columns_from_records([r["raw_inputs"] for r in records], DAILY_INPUTS))
+    failures: list[Optional[str]] = [None] * len(records)
+    for passes, message in _RULES:
+        for index in np.flatnonzero(~passes(metrics)):
+            failures[index] = failures[index] or message
+    return failures
+
+
+async def _write_batch(batch: list[tuple[int, dict[str, Any]]], report: _Report) -> None:
+    failures = check_rules([record for _, record in batch])
+    valid = []
+    for (line, record), failure in zip(batch, failures):
+        if failure:
+            report.reject(line, failure)
+        else:
+            valid.append((line, record))
+    if not valid:
+        return
+    records = [record for _, record in valid]
+    entries = snapshot_service.build_entries(records)
+    outcome = await snapshot_service.record_snapshots(records, entries=entries)
+    for index, message in sorted(outcome.errors.items()):
+        report.reject(valid[index][0], f"write failed: {message}")
+    report.accept(len(valid) - len(outcome.errors))
+    stored = [i for i in range(len(valid)) if i not in outcome.errors]
+    series_service.invalidate_series(str(records[i]["project_id"]) for i in stored)
+    ticker_service.publish_snapshots([records[i] for i in stored], [entries[i] for i in stored])
+
+
+async def ingest_ndjson(chunks: AsyncIterable[bytes]) -> IngestReport:
+    """Validate and store every line of an NDJSON byte stream; returns the per-line report."""
+    report = _Report(settings.METRICS_INGEST_MAX_ERRORS)
+    batch: list[tuple[int, dict[str, Any]]] = []
+    async for line_no, line in iter_lines(chunks, max_line_bytes=settings.METRICS_INGEST_MAX_LINE_BYTES):
+        if line is None:
+            report.reject(line_no, f"line exceeds {settings.METRICS_INGEST_MAX_LINE_BYTES} bytes")
+            continue
+        try:
+            record = MetricRecord.model_validate_json(line)
+        except ValidationError as exc:
+            report.reject(line_no, _validation_message(exc))
+            continue
+        batch.append((line_no, record.model_dump(exclude_none=True)))
+        if len(batch) >= settings.METRICS_INGEST_BATCH_SIZE:
+            await _write_batch(batch, report)
+            batch = []
+    if batch:
+        await _write_batch(batch, report)
+    return report.report
@@ -3,19 +3,17 @@ from typing import Any, Optional
 
 from bson import ObjectId
 
-from backend.database import MongoDatabase
-from backend.models import ItemCreate, ItemUpdate, ItemInDB, ItemPublic
+from backend.database import get_db
+from backend.models import ItemCreate, ItemUpdate, ItemPublic
+from backend.utils.documents import to_model
 
 
-def _serialize_item(document: dict[str, Any]) -> ItemInDB:
-    return ItemInDB(
-        id=str(document["_id"]),
-        title=document["title"],
-        description=document.get("description"),
-        owner_id=str(document["owner_id"]),
-        created_at=document["created_at"],
-        updated_at=document["updated_at"],
-    )
+# Fields read for the slug -> name mapping
+_MAPPING_FIELDS = ("slug", "name", "title")
+
+
+def _serialize_item(document: dict[str, Any]) -> ItemPublic:
+    return to_model(ItemPublic, document)
 
 
 async def create_item(data: ItemCreate) -> ItemPublic:
@@ -27,18 +25,17 @@ async def create_item(data: ItemCreate) -> ItemPublic:
         "created_at": now,
         "updated_at": now,
     }
-    db = MongoDatabase()
+    db = get_db()
     item_doc = await db.insert_one("items", item_doc)
-    item = _serialize_item(item_doc)
-    return ItemPublic(**item.model_dump())
+    return _serialize_item(item_doc)
 
 
 async def get_item_by_id(item_id: str) -> Optional[ItemPublic]:
-    db = MongoDatabase()
+    db = get_db()
     doc = await db.find_one_by_id("items", item_id)
     if not doc:
         return None
-    return ItemPublic(**_serialize_item(doc).model_dump())
+    return _serialize_item(doc)
 
 
 async def update_item(item_id: str, changes: ItemUpdate) -> Optional[ItemPublic]:
@@ -47,38 +44,51 @@ async def update_item(item_id: str, changes: ItemUpdate) -> Optional[ItemPublic]
         return await get_item_by_id(item_id)
 
     update_doc["updated_at"] = datetime.now(timezone.utc)
-    db = MongoDatabase()
-    await db.update_one_by_id("items", item_id, update_doc)
-    return await get_item_by_id(item_id)
+    db = get_db()
+    doc = await db.update_one_by_id_and_return("items", item_id, update_doc)
+    if not doc:
+        return None
+    return _serialize_item(doc)
 
 
 async def delete_item(item_id: str) -> bool:
-    db = MongoDatabase()
+    db = get_db()
     return await db.delete_one_by_id("items", item_id)
 
 
-async def list_items_mapping() -> dict[str, dict[str, str]]:
-    db = MongoDatabase()
-    docs = await db.find_many("items")
+async def list_items_mapping(
+    *, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> tuple[dict[str, dict[str, str]], Optional[str]]:
+    """
+    Map item slug -> {"name": ...}. Without ``limit`` every item is returned; with it, one
+    keyset page plus the cursor for the next. Raises ValueError for an invalid cursor.
+    """
+    db = get_db()
+    next_cursor: Optional[str] = None
+    if limit is None:
+        docs = await db.find_many("items", projection=_MAPPING_FIELDS)
+    else:
+        page = await db.find_page("items", limit=limit, after=cursor, projection=_MAPPING_FIELDS)
+        docs, next_cursor = page.items, page.next_cursor
     result: dict[str, dict[str, str]] = {}
     for doc in docs:
         slug = doc.get("slug")
         name = doc.get("name") or doc.get("title")
         if slug and name:
             result[str(slug)] = {"name": str(name)}
-    return result
+    return result, next_cursor
 
 
 async def get_item_name_by_slug(slug: str) -> Optional[str]:
-    db = MongoDatabase()
-    doc = await db.find_one("items", {"slug": slug})
+    db = get_db()
+    doc = await db.find_one("items", {"slug": slug}, projection=("name", "title"))
     if not doc:
         return None
     return str(doc.get("name") or doc.get("title") or "")
 
 
 async def update_item_name_by_slug(slug: str, new_name: str) -> bool:
-    db = MongoDatabase()
+    db = get_db()
     updated = await db.collection("items").update_one({"slug": slug}, {"$set": {"name": new_name}})
     return updated.matched_count == 1
 
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from datetime import datetime, timezone
 from typing import Any, Optional
 
-from bson import ObjectId
+from bson import ObjectId, encode as bson_encode
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
 
-from backend.database import MongoDatabase
-from backend.models.kanban import BoardPublic, ColumnPublic, CardPublic
+from backend.config import settings
+from backend.database import MongoDatabase, get_db
+from backend.services import board_events
+from backend.models.kanban import BoardBase, BoardPublic, CardBase, CardPublic, CardSummary, ColumnPublic, ReorderItemResult, ReorderResult, TaskPublic
+from backend.utils.cache import LRUCache
+from backend.utils.documents import cursor_to_models, to_model, to_models
+from backend.utils.fields import model_field_names, parse_fields
+from backend.utils.rank import evenly_spaced_ranks, rank_between
+
+
+logger = logging.getLogger(__name__)
 
 
 def _db() -> MongoDatabase:
-    return MongoDatabase()
+    return get_db()
 
 
 def _boards():
@@ -24,27 +38,325 @@ def _cards():
     return _db().collection("cards")
 
 
+# Fields clients may select with ``fields=`` on list endpoints
+BOARD_FIELDS = tuple(model_field_names(BoardBase))
+CARD_FIELDS = tuple(model_field_names(CardBase))
+
+# Board bundles keyed by board id; every write path below invalidates the board it touched
+board_cache: LRUCache[dict[str, Any]] = LRUCache(
+    max_bytes=settings.BOARD_CACHE_MAX_BYTES,
+    ttl_seconds=settings.BOARD_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_board_cache(board_id: Optional[str]) -> None:
+    """Drop one cached bundle, or all of them when the board is unknown (e.g. a change stream delete)."""
+    if board_id:
+        board_cache.invalidate(board_id)
+    else:
+        board_cache.clear()
+
+
+async def _changed(board_id: Optional[str], *deltas: dict[str, Any]) -> None:
+    """
+    Every write path ends here: bump the board version and log the deltas on the board
+    document (one atomic update), drop the cached bundle, then notify the board's subscribers.
+
+    The bundle is dropped only once the new version is stored: a load that ran in between
+    (old version, new data) started before the invalidation, so it is never cached.
+    """
+    if not board_id:
+        return
+    version: Optional[int] = None
+    if ObjectId.is_valid(board_id):
+        try:
+            doc = await _db().find_one_and_update(
+                "boards",
+                {"_id": ObjectId(board_id)},
+                {
+                    "$inc": {"version": 1},
+                    "$push": {"changeLog": {
+                        "$each": [board_events.log_entry(deltas, datetime.now(timezone.utc))],
+                        "$slice": -settings.BOARD_CHANGELOG_LENGTH,
+                    }},
+                },
+                projection={"version": 1},
+            )
+        except PyMongoError as exc:
+            # The write itself is stored; without a version its deltas cannot be replayed, so
+            # drop the bundle and have this process's subscribers reload the board
+            logger.warning("Could not log changes of board %s, forcing resync: %s", board_id, exc)
+            board_cache.invalidate(board_id)
+            board_events.board_bus.resync(board_id)
+            return
+        version = doc["version"] if doc else None
+    board_cache.invalidate(board_id)
+    board_events.publish(board_id, *({**d, "v": version} if version is not None else d for d in deltas))
+
+
+def _order_field() -> str:
+    return "rank" if settings.ORDERING_MODE == "rank" else "position"
+
+
+# Error codes meaning the server cannot run the pipeline at all: unknown stage or operator,
+# unsupported command or syntax, as older servers and some Cosmos DB versions report them.
+# These switch this process to the concurrent fetch for good. Anything else, such as a
+# bundle over the 16MB limit, Cosmos throttling (16500), a timeout or a failover, falls
+# back for the one request and leaves the pipeline on.
+_LOOKUP_UNSUPPORTED_CODES = {9, 115, 168, 40324}
+_lookup_supported = True
+
+
+async def _fetch_bundle_aggregate(board_id: str) -> Optional[tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]]:
+    """Fetch board, columns and cards in one round trip using uncorrelated $lookup stages."""
+    pipeline = [
+        {"$match": {"_id": ObjectId(board_id)}},
+        {"$project": {"changeLog": 0}},
+        {"$lookup": {
+            "from": "columns",
+            "pipeline": [{"$match": {"boardId": board_id}}, {"$sort": {_order_field(): 1}}],
+            "as": "columns",
+        }},
+        {"$lookup": {
+            "from": "cards",
+            "pipeline": [{"$match": {"boardId": board_id}}],
+            "as": "cards",
+        }},
+    ]
+    docs = await _boards().aggregate(pipeline).to_list(length=1)
+    if not docs:
+        return None
+    board = docs[0]
+    return board, board.pop("columns"), board.pop("cards")
+
+
+async def _fetch_bundle_concurrent(board_id: str) -> Optional[tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]]:
+    """Fetch board, columns and cards as three queries issued in parallel."""
+    board, columns, cards = await asyncio.gather(
+        _boards().find_one({"_id": ObjectId(board_id)}, {"changeLog": 0}),
+        _columns().find({"boardId": board_id}).sort([(_order_field(), 1)]).to_list(length=None),
+        _cards().find({"boardId": board_id}).to_list(length=None),
+    )
+    if not board:
+        return None
+    return board, columns, cards
+
+
+async def _fetch_bundle(board_id: str) -> Optional[tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]]:
+    global _lookup_supported
+    if settings.BOARD_BUNDLE_STRATEGY == "aggregate" and _lookup_supported:
+        try:
+            return await _fetch_bundle_aggregate(board_id)
+        except OperationFailure as exc:
+            if exc.code in _LOOKUP_UNSUPPORTED_CODES:
+                logger.warning("$lookup bundle pipeline unsupported, using concurrent fetch: %s", exc)
+                _lookup_supported = False
+            else:
+                logger.info("$lookup bundle pipeline failed for board %s, using concurrent fetch: %s", board_id, exc)
+    return await _fetch_bundle_concurrent(board_id)
+
+
 async def get_board_with_children(board_id: str) -> dict[str, Any] | None:
-    board = await _boards().find_one({"_id": ObjectId(board_id)})
+    if not ObjectId.is_valid(board_id):
+        return None
+    if settings.BOARD_CACHE_ENABLED:
+        cached = board_cache.get(board_id)
+        if cached is not None:
+            return cached
+    generation = board_cache.generation(board_id)
+    fetched = await _fetch_bundle(board_id)
+    if fetched is None:
+        return None
+    board, columns, cards = fetched
+    bundle = {
+        "board": to_model(BoardPublic, board),
+        "columns": to_models(ColumnPublic, columns),
+        "cards": to_models(CardPublic, cards),
+    }
+    if settings.BOARD_CACHE_ENABLED:
+        size = sum(len(bson_encode(doc)) for doc in (board, *columns, *cards))
+        board_cache.put(board_id, bundle, size, generation=generation)
+    return bundle
+
+
+async def get_board_version(board_id: str) -> Optional[int]:
+    """
+    The board's current version, from the cached bundle when there is one, otherwise with a
+    single indexed read. None if the board does not exist.
+    """
+    if not ObjectId.is_valid(board_id):
+        return None
+    if settings.BOARD_CACHE_ENABLED:
+        cached = board_cache.get(board_id)
+        if cached is not None:
+            return cached["board"].version
+    doc = await _boards().find_one({"_id": ObjectId(board_id)}, {"version": 1})
+    return doc.get("version", 0) if doc else None
+
+
+async def get_board_changes(board_id: str, since: int) -> Optional[dict[str, Any]]:
+    """
+    Deltas logged after version ``since``, or the full bundle (``full``) when the change log
+    no longer reaches back that far. None if the board does not exist.
+    """
+    if not ObjectId.is_valid(board_id):
+        return None
+    board = await _boards().find_one({"_id": ObjectId(board_id)}, {"version": 1, "changeLog": 1})
+    if not board:
+        return None
+    version = board.get("version", 0)
+    changes = board_events.changes_since(board, since)
+    if changes is not None:
+        return {"version": version, "full": False, "changes": changes}
+    bundle = await get_board_with_children(board_id)
+    if bundle is None:
+        return None
+    # Report the older of the two versions: the one read above precedes every read behind the
+    # bundle, and the bundle's own may be older still if it came from the cache. Deltas the
+    # bundle already contains are replayed harmlessly on the next sync.
+    return {"version": min(version, bundle["board"].version), "full": True, "changes": [], "bundle": bundle}
+
+
+# (attribute, response key, required) of the card fields view=summary keeps; description and
+# checklist are left to GET /api/cards/{id}
+_SUMMARY_FIELDS = tuple(
+    (name, field.serialization_alias or name, field.is_required())
+    for name, field in CardSummary.model_fields.items()
+    if name not in ("checklist_done", "checklist_total")
+)
+
+
+def summarize_card(card: CardPublic) -> dict[str, Any]:
+    """``card`` as a CardSummary payload; optional fields that are empty are left out."""
+    out: dict[str, Any] = {}
+    for name, key, required in _SUMMARY_FIELDS:
+        value = getattr(card, name)
+        if required or value:
+            out[key] = value
+    if card.checklist:
+        out["checklistDone"] = sum(1 for item in card.checklist if item.completed)
+        out["checklistTotal"] = len(card.checklist)
+    return out
+
+
+def summarize_bundle(bundle: dict[str, Any]) -> dict[str, Any]:
+    return {"board": bundle["board"], "columns": bundle["columns"], "cards": [summarize_card(c) for c in bundle["cards"]]}
+
+
+async def get_board_summary(board_id: str) -> dict[str, Any] | None:
+    """The board bundle with summarized cards, derived from the (cached) full bundle."""
+    bundle = await get_board_with_children(board_id)
+    return summarize_bundle(bundle) if bundle else None
+
+
+async def get_card_board_id(card_id: str) -> Optional[str]:
+    if not ObjectId.is_valid(card_id):
+        return None
+    doc = await _cards().find_one({"_id": ObjectId(card_id)}, {"boardId": 1})
+    return doc.get("boardId") if doc else None
+
+
+async def get_card(card_id: str) -> Optional[CardPublic]:
+    if not ObjectId.is_valid(card_id):
+        return None
+    doc = await _cards().find_one({"_id": ObjectId(card_id)})
+    return to_model(CardPublic, doc) if doc else None
+
+
+# Per-column card pages (served from the (columnId, position|rank, _id) indexes)
+
+def _parse_after(after: str) -> dict[str, Any]:
+    """
+    Filter for the cards after ``after``: an order key (a position, or a rank in rank mode),
+    optionally followed by ``:<card id>`` to break ties between equal keys, as in the
+    ``nextAfter`` tokens returned with each page. Raises ValueError if it is malformed.
+    """
+    field = _order_field()
+    key, _, card_id = after.rpartition(":")
+    if not key or not ObjectId.is_valid(card_id):
+        key, card_id = after, ""
+    value: Any = key if field == "rank" else int(key)
+    if not card_id:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$gt": value}}, {field: value, "_id": {"$gt": ObjectId(card_id)}}]}
+
+
+async def _column_page(column_id: str, after: Optional[str], limit: int) -> tuple[list[dict[str, Any]], Optional[str]]:
+    field = _order_field()
+    query: dict[str, Any] = {"columnId": column_id}
+    if after:
+        query.update(_parse_after(after))
+    # One extra card tells whether there is a next page
+    docs = await _cards().find(query).sort([(field, 1), ("_id", 1)]).limit(limit + 1).to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, f"{docs[-1].get(field)}:{docs[-1]['_id']}"
+
+
+async def list_column_cards(
+    board_id: str, column_id: str, *, after: Optional[str] = None, limit: int, include_total: bool = False
+) -> Optional[tuple[list[CardPublic], Optional[int], Optional[str]]]:
+    """
+    One page of a column's cards in board order, after the ``after`` token: (cards, total
+    cards in the column if ``include_total``, token of the next page). None if the column is
+    not on the board. Raises ValueError for a malformed ``after``.
+    """
+    if not ObjectId.is_valid(board_id) or not ObjectId.is_valid(column_id):
+        return None
+    if after:
+        _parse_after(after)
+    lookups = [
+        _columns().find_one({"_id": ObjectId(column_id), "boardId": board_id}, {"_id": 1}),
+        _column_page(column_id, after, limit),
+    ]
+    if include_total:
+        lookups.append(_cards().count_documents({"columnId": column_id}))
+    column, (docs, next_after), *total = await asyncio.gather(*lookups)
+    if not column:
+        return None
+    return to_models(CardPublic, docs), total[0] if total else None, next_after
+
+
+async def get_board_first_cards(board_id: str, per_column: int) -> dict[str, Any] | None:
+    """
+    The board bundle with only the first ``per_column`` cards of each column, plus every
+    column's card count (``columnTotals``) and the token of its next page (``nextAfter``,
+    columns with more cards only). Each column is one indexed, limited query, so only the
+    (index-only) counts grow with the board.
+    """
+    if not ObjectId.is_valid(board_id):
+        return None
+    board, columns = await asyncio.gather(
+        _boards().find_one({"_id": ObjectId(board_id)}, {"changeLog": 0}),
+        _columns().find({"boardId": board_id}).sort([(_order_field(), 1)]).to_list(length=None),
+    )
     if not board:
         return None
-    columns = [ColumnPublic(id=str(c["_id"]), **{k: v for k, v in c.items() if k != "_id"}) async for c in _columns().find({"boardId": board_id}).sort([("position", 1)])]
-    cards = [CardPublic(id=str(c["_id"]), **{k: v for k, v in c.items() if k != "_id"}) async for c in _cards().find({"boardId": board_id})]
+    column_ids = [str(c["_id"]) for c in columns]
+    pages, totals = await asyncio.gather(
+        asyncio.gather(*(_column_page(cid, None, per_column) for cid in column_ids)),
+        asyncio.gather(*(_cards().count_documents({"columnId": cid}) for cid in column_ids)),
+    )
     return {
-        "board": BoardPublic(id=str(board["_id"]), **{k: v for k, v in board.items() if k != "_id"}),
-        "columns": columns,
-        "cards": cards,
+        "board": to_model(BoardPublic, board),
+        "columns": to_models(ColumnPublic, columns),
+        "cards": to_models(CardPublic, [doc for docs, _ in pages for doc in docs]),
+        "columnTotals": dict(zip(column_ids, totals)),
+        "nextAfter": {cid: token for cid, (_, token) in zip(column_ids, pages) if token},
     }
 
 
 async def create_board(name: str, project_id: Optional[str] = None, description: Optional[str] = None) -> BoardPublic:
-    doc = {"name": name}
+    doc: dict[str, Any] = {"name": name, "version": 0}
     if project_id:
         doc["projectId"] = project_id
     if description:
         doc["description"] = description
     result = await _boards().insert_one(doc)
-    return BoardPublic(id=str(result.inserted_id), **doc)
+    board_id = str(result.inserted_id)
+    board_events.publish(board_id, board_events.delta("board.created", board_id, doc))
+    return BoardPublic(id=board_id, **doc)
 
 async def update_board(board_id: str, name: Optional[str] = None, project_id: Optional[str] = None, description: Optional[str] = None) -> bool:
     updates = {}
@@ -57,26 +369,50 @@ async def update_board(board_id: str, name: Optional[str] = None, project_id: Op
     if not updates:
         return False
     res = await _boards().update_one({"_id": ObjectId(board_id)}, {"$set": updates})
-    return res.matched_count == 1
+    if res.matched_count != 1:
+        return False
+    await _changed(board_id, board_events.change_delta("board", board_id, updates))
+    return True
 
 async def delete_board(board_id: str) -> bool:
     # Optionally cascade delete columns/cards; for now, just board
     res = await _boards().delete_one({"_id": ObjectId(board_id)})
-    return res.deleted_count == 1
+    if res.deleted_count != 1:
+        return False
+    await _changed(board_id, board_events.delta("board.deleted", board_id))
+    return True
+
+
+async def list_boards(
+    *, limit: int, cursor: Optional[str] = None, include_total: bool = False, fields: Optional[str] = None
+) -> tuple[list[BoardPublic], Optional[int], Optional[str]]:
+    """
+    Boards ordered by name, keyset-paginated, reading only ``fields`` (name is always included).
+    Raises ValueError for an invalid cursor or unknown field.
+    """
+    selected = parse_fields(fields, BOARD_FIELDS, default=BOARD_FIELDS, required=("name",))
+    page = await _db().find_page(
+        "boards", sort=[("name", 1)], limit=limit, after=cursor, with_total=include_total, projection=selected
+    )
+    boards = to_models(BoardPublic, page.items)
+    return boards, page.total, page.next_cursor
 
 
 async def list_boards_by_project(project_id: str) -> list[BoardPublic]:
     """Get all boards for a specific project"""
-    boards = [
-        BoardPublic(id=str(b["_id"]), **{k: v for k, v in b.items() if k != "_id"})
-        async for b in _boards().find({"projectId": project_id}).sort([("name", 1)])
-    ]
-    return boards
+    return await cursor_to_models(
+        BoardPublic, _boards().find({"projectId": project_id}, {"changeLog": 0}).sort([("name", 1)])
+    )
 
 
 async def create_column(board_id: str, title: str, position: int) -> ColumnPublic:
     doc = {"boardId": board_id, "title": title, "position": position}
+    if settings.ORDERING_MODE == "rank":
+        doc["rank"] = rank_between(await _last_rank("columns", {"boardId": board_id}), None)
     result = await _columns().insert_one(doc)
+    await _changed(board_id, board_events.delta("column.created", result.inserted_id, doc))
+    if len(doc.get("rank") or "") > settings.RANK_MAX_LENGTH:
+        _schedule_rebalance("columns", "boardId", board_id)
     return ColumnPublic(id=str(result.inserted_id), **doc)
 
 
@@ -88,13 +424,19 @@ async def update_column(column_id: str, *, title: Optional[str] = None, position
         update["position"] = position
     if not update:
         return True
-    res = await _columns().update_one({"_id": ObjectId(column_id)}, {"$set": update})
-    return res.matched_count == 1
+    doc = await _db().update_one_by_id_and_return("columns", column_id, update, projection={"boardId": 1})
+    if not doc:
+        return False
+    await _changed(doc.get("boardId"), board_events.change_delta("column", column_id, update))
+    return True
 
 
 async def delete_column(column_id: str) -> bool:
-    res = await _columns().delete_one({"_id": ObjectId(column_id)})
-    return res.deleted_count == 1
+    doc = await _db().delete_one_by_id_and_return("columns", column_id, projection={"boardId": 1})
+    if not doc:
+        return False
+    await _changed(doc.get("boardId"), board_events.delta("column.deleted", column_id))
+    return True
 
 
 async def create_card(column_id: str, title: str, position: int, **extras: Any) -> CardPublic:
@@ -102,49 +444,386 @@ async def create_card(column_id: str, title: str, position: int, **extras: Any)
     col = await _columns().find_one({"_id": ObjectId(column_id)})
     board_id = col.get("boardId") if col else None
     doc = {"columnId": column_id, "boardId": board_id, "title": title, "position": position, **extras}
+    if settings.ORDERING_MODE == "rank" and not doc.get("rank"):
+        doc["rank"] = rank_between(await _last_rank("cards", {"columnId": column_id}), None)
     result = await _cards().insert_one(doc)
+    await _changed(board_id, board_events.delta("card.created", result.inserted_id, doc))
+    if len(doc.get("rank") or "") > settings.RANK_MAX_LENGTH:
+        _schedule_rebalance("cards", "columnId", column_id)
     return CardPublic(id=str(result.inserted_id), **doc)
 
 
 async def update_card(card_id: str, **changes: Any) -> bool:
     # Allow moving across columns by changing columnId/position
-    res = await _cards().update_one({"_id": ObjectId(card_id)}, {"$set": changes})
-    return res.matched_count == 1
+    doc = await _db().update_one_by_id_and_return("cards", card_id, changes, projection={"boardId": 1})
+    if not doc:
+        return False
+    await _changed(doc.get("boardId"), board_events.change_delta("card", card_id, changes))
+    return True
 
 
 async def delete_card(card_id: str) -> bool:
-    res = await _cards().delete_one({"_id": ObjectId(card_id)})
-    return res.deleted_count == 1
-
-
-async def reorder_cards(updates: list[dict[str, Any]]) -> None:
-    # updates: [{id, columnId, position}, ...]
-    if not updates:
-        return
-    bulk_ops = []
+    doc = await _db().delete_one_by_id_and_return("cards", card_id, projection={"boardId": 1})
+    if not doc:
+        return False
+    await _changed(doc.get("boardId"), board_events.delta("card.deleted", card_id))
+    return True
+
+
+async def _bulk_reorder(collection: str, updates: list[dict[str, Any]], fields: tuple[str, ...]) -> ReorderResult:
+    """
+    Apply reorder updates with a constant number of round trips: one read of the current
+    values, then chunked unordered bulk writes for the documents that actually move.
+
+    Each write only matches while its document is not yet in place, so when the bulk result
+    reports every write as modified each item was; otherwise the written documents are read
+    back and an item counts as modified if its document still exists and holds the new values
+    (if another writer moved it there first, its delta is redundant but still correct).
+    """
+    results: dict[str, ReorderItemResult] = {}
+    ordered: list[ReorderItemResult] = []
+    planned: dict[str, dict[str, Any]] = {}
     for upd in updates:
-        card_id = upd["id"]
+        item_id = str(upd.get("id", "")) if isinstance(upd, dict) else ""
+        item = ReorderItemResult(id=item_id)
+        ordered.append(item)
+        if not ObjectId.is_valid(item_id):
+            item.error = "invalid id"
+            continue
         set_doc: dict[str, Any] = {}
-        if "columnId" in upd:
+        if "columnId" in fields and "columnId" in upd:
             set_doc["columnId"] = upd["columnId"]
         if "position" in upd:
-            set_doc["position"] = int(upd["position"])
+            try:
+                set_doc["position"] = int(upd["position"])
+            except (TypeError, ValueError):
+                item.error = "invalid position"
+                continue
         if not set_doc:
+            item.error = "nothing to update"
+            continue
+        if item_id in results:
+            results[item_id].error = "superseded by a later update"
+        results[item_id] = item
+        planned[item_id] = set_doc
+
+    existing: dict[str, dict[str, Any]] = {}
+    if planned:
+        cursor = _db().collection(collection).find(
+            {"_id": {"$in": [ObjectId(i) for i in planned]}}, {"boardId": 1, **{f: 1 for f in fields}}
+        )
+        existing = {str(doc["_id"]): doc async for doc in cursor}
+
+    ops: list[UpdateOne] = []
+    op_ids: list[str] = []
+    for item_id, set_doc in planned.items():
+        current = existing.get(item_id)
+        if current is None:
+            results[item_id].error = "not found"
             continue
-        bulk_ops.append({"filter": {"_id": ObjectId(card_id)}, "update": {"$set": set_doc}})
-    for op in bulk_ops:
-        await _cards().update_one(op["filter"], op["update"]) 
+        results[item_id].matched = True
+        if all(current.get(k) == v for k, v in set_doc.items()):
+            continue
+        ops.append(UpdateOne(
+            {"_id": ObjectId(item_id), "$or": [{k: {"$ne": v}} for k, v in set_doc.items()]},
+            {"$set": set_doc},
+        ))
+        op_ids.append(item_id)
+
+    outcome = await _db().bulk_write(collection, ops, chunk_size=settings.REORDER_BATCH_SIZE)
+    for index, message in outcome.errors.items():
+        results[op_ids[index]].error = message
+    written = [item_id for index, item_id in enumerate(op_ids) if index not in outcome.errors]
+    if outcome.modified_count < len(written):
+        # Some documents vanished or were moved into place by another writer since the read
+        cursor = _db().collection(collection).find(
+            {"_id": {"$in": [ObjectId(i) for i in written]}}, {f: 1 for f in fields}
+        )
+        now = {str(doc["_id"]): doc async for doc in cursor}
+        for item_id in written:
+            doc = now.get(item_id)
+            if doc is None:
+                results[item_id].matched = False
+                results[item_id].error = "not found"
+            else:
+                results[item_id].modified = all(doc.get(k) == v for k, v in planned[item_id].items())
+    else:
+        for item_id in written:
+            results[item_id].modified = True
+    by_board: dict[Optional[str], list[dict[str, Any]]] = {}
+    for item_id in written:
+        if results[item_id].modified:
+            by_board.setdefault(existing[item_id].get("boardId"), []).append(
+                board_events.change_delta(collection[:-1], item_id, planned[item_id])
+            )
+    for board_id, deltas in by_board.items():
+        await _changed(board_id, *deltas)
+
+    failed = sum(1 for item in ordered if item.error)
+    return ReorderResult(
+        ok=failed == 0,
+        matched=sum(1 for item in ordered if item.matched),
+        modified=sum(1 for item in ordered if item.modified),
+        failed=failed,
+        results=ordered,
+    )
+
+
+async def reorder_cards(updates: list[dict[str, Any]]) -> ReorderResult:
+    # updates: [{id, columnId, position}, ...]
+    return await _bulk_reorder("cards", updates, ("columnId", "position"))
 
 
-async def reorder_columns(updates: list[dict[str, Any]]) -> None:
+async def reorder_columns(updates: list[dict[str, Any]]) -> ReorderResult:
     # updates: [{id, position}, ...]
-    if not updates:
+    return await _bulk_reorder("columns", updates, ("position",))
+
+
+# Rank ordering
+
+class MoveTargetNotFound(Exception):
+    """A move names a column or neighbour that does not exist."""
+
+
+class MoveConflict(Exception):
+    """A move names a neighbour outside the target list, or the moved document itself."""
+
+
+_rebalance_tasks: dict[tuple[str, str], asyncio.Task] = {}
+# Scopes asked to rebalance while their rebalance was running; it runs once more
+_rebalance_again: set[tuple[str, str]] = set()
+
+
+async def _last_rank(collection: str, scope: dict[str, Any]) -> Optional[str]:
+    doc = await _db().collection(collection).find_one(
+        {**scope, "rank": {"$gt": ""}}, {"rank": 1}, sort=[("rank", -1)]
+    )
+    return doc["rank"] if doc else None
+
+
+async def _rank_for_slot(
+    collection: str,
+    scope_field: str,
+    scope_value: str,
+    moving_id: str,
+    prev_id: Optional[str],
+    next_id: Optional[str],
+) -> str:
+    """
+    Compute a rank between two neighbours; with no neighbours, append to the end of the scope.
+    Raises MoveTargetNotFound if a neighbour does not exist, MoveConflict if one is the moved
+    document or is not in ``{scope_field: scope_value}``.
+    """
+    if prev_id is None and next_id is None:
+        return rank_between(await _last_rank(collection, {scope_field: scope_value}), None)
+    requested = [i for i in (prev_id, next_id) if i is not None]
+    if moving_id in requested or prev_id == next_id:
+        raise MoveConflict("neighbours must be two other documents")
+    for neighbour_id in requested:
+        if not ObjectId.is_valid(neighbour_id):
+            raise MoveTargetNotFound(f"neighbour {neighbour_id} not found")
+    neighbours = {
+        str(doc["_id"]): doc
+        async for doc in _db().collection(collection).find(
+            {"_id": {"$in": [ObjectId(i) for i in requested]}}, {"rank": 1, scope_field: 1}
+        )
+    }
+    for neighbour_id in requested:
+        doc = neighbours.get(neighbour_id)
+        if doc is None:
+            raise MoveTargetNotFound(f"neighbour {neighbour_id} not found")
+        if doc.get(scope_field) != scope_value:
+            raise MoveConflict(f"neighbour {neighbour_id} is not in {scope_field} {scope_value}")
+    before = neighbours[prev_id].get("rank") if prev_id else None
+    after = neighbours[next_id].get("rank") if next_id else None
+    try:
+        return rank_between(before, after)
+    except ValueError:
+        # Neighbours are out of order (e.g. two concurrent moves produced the same rank);
+        # place after `before` and let a rebalance restore a strict order
+        _schedule_rebalance(collection, scope_field, scope_value)
+        return rank_between(before, None)
+
+
+def _log_rebalance_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Rank rebalance failed", exc_info=task.exception())
+
+
+async def _rebalance_until_settled(collection: str, scope_field: str, scope_value: str) -> None:
+    # A rank written while a rebalance runs (e.g. an append after the old last rank) is not
+    # part of its read, so go again if anything asked for one in the meantime
+    key = (collection, scope_value)
+    while True:
+        _rebalance_again.discard(key)
+        await rebalance_ranks(collection, {scope_field: scope_value})
+        if key not in _rebalance_again:
+            return
+
+
+def _schedule_rebalance(collection: str, scope_field: str, scope_value: str) -> None:
+    key = (collection, scope_value)
+    if key in _rebalance_tasks:
+        _rebalance_again.add(key)
         return
-    for upd in updates:
-        col_id = upd["id"]
-        pos = int(upd["position"]) if "position" in upd else None
-        if pos is None:
-            continue
-        await _columns().update_one({"_id": ObjectId(col_id)}, {"$set": {"position": pos}})
-
-
+    task = asyncio.create_task(_rebalance_until_settled(collection, scope_field, scope_value))
+    _rebalance_tasks[key] = task
+    task.add_done_callback(lambda t: _rebalance_tasks.pop(key, None))
+    task.add_done_callback(_log_rebalance_failure)
+
+
+async def rebalance_ranks(
+    collection: str,
+    scope: dict[str, Any],
+    *,
+    sort: Optional[list[tuple[str, int]]] = None,
+) -> int:
+    """
+    Rewrite the ranks of every document in ``scope`` (a column's cards or a board's columns)
+    as short, evenly spaced keys, keeping the current order. Returns the number of documents updated.
+    """
+    cursor = _db().collection(collection).find(scope, {"rank": 1, "boardId": 1}).sort(sort or [("rank", 1), ("position", 1), ("_id", 1)])
+    docs = await cursor.to_list(length=None)
+    changed = [
+        (doc, rank) for doc, rank in zip(docs, evenly_spaced_ranks(len(docs))) if doc.get("rank") != rank
+    ]
+    ops = [UpdateOne({"_id": doc["_id"]}, {"$set": {"rank": rank}}) for doc, rank in changed]
+    await _db().bulk_write(collection, ops, chunk_size=settings.REORDER_BATCH_SIZE)
+    by_board: dict[Optional[str], list[dict[str, Any]]] = {}
+    for doc, rank in changed:
+        by_board.setdefault(doc.get("boardId"), []).append(board_events.change_delta(collection[:-1], doc["_id"], {"rank": rank}))
+    for board_id, deltas in by_board.items():
+        await _changed(board_id, *deltas)
+    return len(ops)
+
+
+async def move_card(card_id: str, column_id: str, prev_id: Optional[str] = None, next_id: Optional[str] = None) -> Optional[CardPublic]:
+    """
+    Move a card between two neighbours in ``column_id``, updating only the moved card. The
+    column may be on another board, in which case the card leaves one board and joins the
+    other. None if the card does not exist; raises MoveTargetNotFound / MoveConflict (see
+    ``_rank_for_slot``), MoveTargetNotFound also for an unknown column.
+    """
+    if not ObjectId.is_valid(card_id):
+        return None
+    if not ObjectId.is_valid(column_id):
+        raise MoveTargetNotFound(f"column {column_id} not found")
+    card, col = await asyncio.gather(
+        _cards().find_one({"_id": ObjectId(card_id)}, {"boardId": 1}),
+        _columns().find_one({"_id": ObjectId(column_id)}, {"boardId": 1}),
+    )
+    if not card:
+        return None
+    if not col:
+        raise MoveTargetNotFound(f"column {column_id} not found")
+    old_board_id, board_id = card.get("boardId"), col.get("boardId")
+    rank = await _rank_for_slot("cards", "columnId", column_id, card_id, prev_id, next_id)
+    changes = {"columnId": column_id, "rank": rank}
+    if board_id != old_board_id:
+        changes["boardId"] = board_id
+    doc = await _db().update_one_by_id_and_return("cards", card_id, changes)
+    if not doc:
+        return None
+    if board_id == old_board_id:
+        await _changed(board_id, board_events.change_delta("card", card_id, changes))
+    else:
+        await _changed(old_board_id, board_events.delta("card.deleted", card_id))
+        await _changed(board_id, board_events.delta("card.created", card_id, doc))
+    if len(rank) > settings.RANK_MAX_LENGTH:
+        _schedule_rebalance("cards", "columnId", column_id)
+    return to_model(CardPublic, doc)
+
+
+async def move_column(column_id: str, prev_id: Optional[str] = None, next_id: Optional[str] = None) -> Optional[ColumnPublic]:
+    """
+    Move a column between two neighbours on its board, updating only the moved column.
+    None if the column does not exist; raises MoveTargetNotFound / MoveConflict for bad neighbours.
+    """
+    if not ObjectId.is_valid(column_id):
+        return None
+    col = await _columns().find_one({"_id": ObjectId(column_id)}, {"boardId": 1})
+    if not col:
+        return None
+    board_id = col["boardId"]
+    rank = await _rank_for_slot("columns", "boardId", board_id, column_id, prev_id, next_id)
+    doc = await _db().update_one_by_id_and_return("columns", column_id, {"rank": rank})
+    if not doc:
+        return None
+    await _changed(board_id, board_events.change_delta("column", column_id, {"rank": rank}))
+    if len(rank) > settings.RANK_MAX_LENGTH:
+        _schedule_rebalance("columns", "boardId", board_id)
+    return to_model(ColumnPublic, doc)
+
+
+# Cross-board task list
+
+_TASK_SORT = [("dueDate", 1), ("boardId", 1)]
+# Sort keys and the fields TaskPublic cannot do without
+_TASK_REQUIRED_FIELDS = ("columnId", "boardId", "title", "position", "dueDate")
+
+
+async def list_tasks(
+    *,
+    assignee: Optional[str] = None,
+    label: Optional[str] = None,
+    overdue: bool = False,
+    project_id: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> tuple[list[TaskPublic], Optional[str]]:
+    """
+    Cards across all boards ordered by due date (undated cards last), served from the
+    (dueDate, boardId, _id) index. Returns one page plus an opaque cursor for the next one.
+    ``fields`` narrows the card fields read beyond the ones a task always carries.
+    Raises ValueError for a malformed cursor or unknown field.
+    """
+    selected = parse_fields(fields, CARD_FIELDS, default=CARD_FIELDS, required=_TASK_REQUIRED_FIELDS)
+    # Mongo sorts null first, so dated ("d") and undated ("u") cards are paged as two phases
+    phase, _, after = (cursor or "d:").partition(":")
+    if phase not in ("d", "u"):
+        raise ValueError("invalid cursor")
+    base: dict[str, Any] = {}
+    if assignee:
+        base["assignees"] = assignee
+    if label:
+        base["labels.name"] = label
+    if project_id:
+        base["boardId"] = {"$in": [str(b["_id"]) async for b in _boards().find({"projectId": project_id}, {"_id": 1})]}
+
+    docs: list[dict[str, Any]] = []
+    next_cursor: Optional[str] = None
+    if phase == "d":
+        due_filter = {"$lt": datetime.now(timezone.utc)} if overdue else {"$ne": None}
+        page = await _db().find_page(
+            "cards", {**base, "dueDate": due_filter}, sort=_TASK_SORT, limit=limit, after=after or None, projection=selected
+        )
+        docs = page.items
+        if page.next_cursor:
+            next_cursor = f"d:{page.next_cursor}"
+        elif not overdue:
+            phase, after = "u", ""
+            if len(docs) == limit:
+                next_cursor = "u:"
+    if phase == "u" and len(docs) < limit:
+        page = await _db().find_page(
+            "cards", {**base, "dueDate": None}, sort=_TASK_SORT, limit=limit - len(docs), after=after or None, projection=selected
+        )
+        docs.extend(page.items)
+        next_cursor = f"u:{page.next_cursor}" if page.next_cursor else None
+
+    board_ids = {d["boardId"] for d in docs if ObjectId.is_valid(d.get("boardId") or "")}
+    column_ids = {d["columnId"] for d in docs if ObjectId.is_valid(d.get("columnId") or "")}
+    boards, columns = await asyncio.gather(
+        _boards().find({"_id": {"$in": [ObjectId(i) for i in board_ids]}}, {"name": 1}).to_list(length=None),
+        _columns().find({"_id": {"$in": [ObjectId(i) for i in column_ids]}}, {"title": 1}).to_list(length=None),
+    )
+    board_names = {str(b["_id"]): b.get("name") for b in boards}
+    column_names = {str(c["_id"]): c.get("title") for c in columns}
+    items = [
+        to_model(
+            TaskPublic, d, boardName=board_names.get(d.get("boardId")), columnName=column_names.get(d.get("columnId"))
+        )
+        for d in docs
+    ]
+    return items, next_cursor
@@ -0,0 +1,236 @@
+"""
+Project value metrics, as specified in docs/METRICS_MODEL.md.
+
+``MetricsCalculator`` keeps the doc's scalar API (one project-day per call) and adds a
+columnar engine: ``calculate_batch`` takes equal-length arrays of inputs (e.g. every
+project × day in the portfolio, flattened) and computes every metric in one vectorized
+NumPy pass, applying the doc's divide-by-zero guards element-wise.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Literal, Mapping, Optional, Sequence, Union, get_args
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Stored with every snapshot so metrics can be recomputed when the formulas change
+CALCULATION_VERSION = "v1.0"
+
+DAILY_INPUTS = ("billable_hours", "billable_rate", "actual_hours", "cost_rate", "fixed_costs", "baseline_hours")
+MetricName = Literal["revenue", "cost", "profit", "margin", "time_saved", "automation_lift"]
+DAILY_METRICS: tuple[str, ...] = get_args(MetricName)
+DEV_INPUTS = ("prs", "commits", "lead_time_improvement", "cycle_time_improvement")
+DEFAULT_DEV_WEIGHTS: dict[str, float] = {"prs": 3, "commits": 1, "lead_time": 5, "cycle_time": 5}
+
+Columns = Mapping[str, ArrayLike]
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # x / d where d > 0, else 0.0 (the doc's guard for margin and automation lift)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+class MetricsCalculator:
+    """Calculate project value metrics using defensible formulas."""
+
+    # Scalar API (docs/METRICS_MODEL.md, "Implementation Notes")
+
+    def calculate_daily_metrics(
+        self,
+        billable_hours: float,
+        billable_rate: float,
+        actual_hours: float,
+        cost_rate: float,
+        fixed_costs: float,
+        baseline_hours: float,
+    ) -> dict[str, float]:
+        """Calculate all core metrics for a single day."""
+        revenue = billable_hours * billable_rate
+        cost = (actual_hours * cost_rate) + fixed_costs
+        profit = revenue - cost
+        margin = profit / revenue if revenue > 0 else 0.0
+        time_saved = baseline_hours - actual_hours
+        automation_lift = time_saved / baseline_hours if baseline_hours > 0 else 0.0
+        return {
+            "revenue": revenue,
+            "cost": cost,
+            "profit": profit,
+            "margin": margin,
+            "time_saved": time_saved,
+            "automation_lift": automation_lift,
+        }
+
+    def calculate_dev_signal(
+        self,
+        prs: int,
+        commits: int,
+        lead_time_improvement: float,
+        cycle_time_improvement: float,
+        weights: Optional[dict[str, float]] = None,
+    ) -> float:
+        """Calculate development velocity signal."""
+        if weights is None:
+            weights = DEFAULT_DEV_WEIGHTS
+        return (
+            weights["prs"] * prs
+            + weights["commits"] * commits
+            + weights["lead_time"] * lead_time_improvement
+            + weights["cycle_time"] * cycle_time_improvement
+        )
+
+    def calculate_ops_signal(self, events: Union[Mapping[str, float], Iterable[float]]) -> float:
+        """Sum of app usage events (form submissions, job runs, API calls, ...)."""
+        return sum(events.values() if isinstance(events, Mapping) else events)
+
+    def calculate_total_signals(self, dev_signal: float, ops_signal: float) -> float:
+        return dev_signal + ops_signal
+
+    def to_index_series(self, values: list[float], baseline: Optional[float] = None) -> list[float]:
+        """Normalize a series to index with baseline=100."""
+        if not values:
+            return []
+        if baseline is None:
+            baseline = values[0]
+        if baseline == 0:
+            baseline = 1  # Avoid division by zero
+        return [(v / baseline) * 100 for v in values]
+
+    # Batch API
+
+    def calculate_batch(self, inputs: Columns, *, weights: Optional[dict[str, float]] = None) -> dict[str, np.ndarray]:
+        """
+        Columnar ``calculate_daily_metrics``: ``inputs`` maps each of DAILY_INPUTS to an array
+        (one element per project-day) and the result maps each of DAILY_METRICS to an array.
+        If all of DEV_INPUTS are present ``dev_signal`` is added; if ``ops_events`` is (a 1-D
+        array of summed events, or 2-D with one column per event type) ``ops_signal`` is
+        added, and ``total_signals`` when both are.
+        Raises KeyError for a missing daily input and ValueError for mismatched lengths.
+        """
+        cols = {name: np.asarray(inputs[name], dtype=np.float64) for name in DAILY_INPUTS}
+        revenue = cols["billable_hours"] * cols["billable_rate"]
+        cost = cols["actual_hours"] * cols["cost_rate"] + cols["fixed_costs"]
+        profit = revenue - cost
+        time_saved = cols["baseline_hours"] - cols["actual_hours"]
+        out = {
+            "revenue": revenue,
+            "cost": cost,
+            "profit": profit,
+            "margin": _safe_divide(profit, revenue),
+            "time_saved": time_saved,
+            "automation_lift": _safe_divide(time_saved, cols["baseline_hours"]),
+        }
+        if all(name in inputs for name in DEV_INPUTS):
+            out["dev_signal"] = self.dev_signal_batch(*(inputs[name] for name in DEV_INPUTS), weights=weights)
+        if "ops_events" in inputs:
+            out["ops_signal"] = self.ops_signal_batch(inputs["ops_events"])
+        if "dev_signal" in out and "ops_signal" in out:
+            out["total_signals"] = out["dev_signal"] + out["ops_signal"]
+        return out
+
+    def dev_signal_batch(
+        self,
+        prs: ArrayLike,
+        commits: ArrayLike,
+        lead_time_improvement: ArrayLike,
+        cycle_time_improvement: ArrayLike,
+        *,
+        weights: Optional[dict[str, float]] = None,
+    ) -> np.ndarray:
+        w = weights or DEFAULT_DEV_WEIGHTS
+        return (
+            w["prs"] * np.asarray(prs, dtype=np.float64)
+            + w["commits"] * np.asarray(commits, dtype=np.float64)
+            + w["lead_time"] * np.asarray(lead_time_improvement, dtype=np.float64)
+            + w["cycle_time"] * np.asarray(cycle_time_improvement, dtype=np.float64)
+        )
+
+    def ops_signal_batch(self, events: ArrayLike) -> np.ndarray:
+        arr = np.asarray(events, dtype=np.float64)
+        return arr.sum(axis=-1) if arr.ndim > 1 else arr
+
+    def index_series_batch(self, values: ArrayLike, baseline: Optional[ArrayLike] = None) -> np.ndarray:
+        """
+        ``to_index_series`` for many series at once: ``values`` is (series × points) and
+        ``baseline`` one value per series (default: each series' first point). Zero
+        baselines become 1, as in the scalar version.
+        """
+        arr = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if arr.shape[-1] == 0:
+            return arr
+        base = arr[:, 0] if baseline is None else np.broadcast_to(np.asarray(baseline, dtype=np.float64), arr.shape[:1])
+        base = np.where(base == 0, 1.0, base)
+        return arr / base[:, None] * 100
+
+    def aggregate_portfolio(self, metrics: Mapping[str, ArrayLike]) -> dict[str, float]:
+        """
+        Portfolio rollup of per-project ``revenue``, ``cost``, ``time_saved`` and ``margin``
+        ("Aggregation Across Projects"): the overall margin comes from the totals, the
+        average margin is the mean of the project margins.
+        """
+        revenue = np.asarray(metrics["revenue"], dtype=np.float64)
+        cost = np.asarray(metrics["cost"], dtype=np.float64)
+        count = int(revenue.size)
+        total_revenue = float(revenue.sum())
+        total_profit = total_revenue - float(cost.sum())
+        margins = metrics.get("margin")
+        if margins is None:
+            margins = _safe_divide(revenue - cost, revenue)
+        return {
+            "total_revenue": total_revenue,
+            "total_cost": float(cost.sum()),
+            "total_profit": total_profit,
+            "overall_margin": total_profit / total_revenue if total_revenue > 0 else 0.0,
+            "total_time_saved": float(np.asarray(metrics["time_saved"], dtype=np.float64).sum()),
+            "average_profit": total_profit / count if count else 0.0,
+            "average_margin": float(np.mean(margins)) if count else 0.0,
+            "project_count": count,
+        }
+
+
+def lttb_indices(x: ArrayLike, y: ArrayLike, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of the ``threshold`` points of
+    (x, y) that best preserve the shape of the line (always including the first and last).
+    Returns every index when the series is no longer than ``threshold`` or threshold < 3.
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    n = ys.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    # threshold - 2 buckets between the fixed first and last points; bucket i is edges[i]:edges[i + 1]
+    edges = np.append(np.linspace(1, n - 1, threshold - 1).astype(np.int64), n)
+    # Average point of each bucket, and of the last point as the final "next bucket"
+    starts, counts = edges[:-1], np.diff(edges)
+    avg_x = np.add.reduceat(xs, starts) / counts
+    avg_y = np.add.reduceat(ys, starts) / counts
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Triangle between the previous pick, each candidate and the next bucket's average
+        area = np.abs(
+            (xs[a] - avg_x[i + 1]) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (avg_y[i + 1] - ys[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+# Formula version -> calculator; register a new MetricsCalculator subclass here when formulas
+# change, then recompute stored snapshots with recompute_service
+FORMULA_VERSIONS: dict[str, type[MetricsCalculator]] = {CALCULATION_VERSION: MetricsCalculator}
+
+
+def calculate_batch_for_version(version: str, inputs: Columns) -> dict[str, np.ndarray]:
+    """``calculate_batch`` with the formulas of ``version``; a top-level function so process pools can run it."""
+    return FORMULA_VERSIONS[version]().calculate_batch(inputs)
+
+
+def columns_from_records(records: Sequence[Mapping[str, Any]], fields: Sequence[str] = DAILY_INPUTS) -> dict[str, np.ndarray]:
+    """Pivot row-shaped raw inputs into the float64 columns ``calculate_batch`` takes."""
+    return {name: np.fromiter((r[name] for r in records), dtype=np.float64, count=len(records)) for name in fields}
+
+
+calculator = MetricsCalculator()
@@ -0,0 +1,248 @@
+"""
+Portfolio aggregates ("Aggregation Across Projects" in docs/METRICS_MODEL.md).
+
+``snapshot_service.record_snapshots`` maintains one ``metric_portfolio`` document with
+``$inc``: summed totals, the number of projects and the sum of their margins. Reading the
+portfolio is therefore a single document fetch. ``reconcile`` recomputes everything from
+the stored snapshots to detect (and optionally repair) drift, e.g. from concurrent
+ingests of the same project or a write interrupted between its bulk writes.
+
+Ingest keeps running while a reconcile does, so repairs never overwrite totals: each
+drifted project's rollups are re-read just before the repair and moved by ``$inc`` of
+(expected - stored), guarded on the totals read, so an ingest ``$inc`` landing in between
+makes the guard fail and the project is left for the next run. The portfolio is then
+moved to the sum of the all-time rollups the same way. Not fenced: an ingest whose
+snapshot write lands just before the re-read and whose rollup ``$inc`` lands just after
+the repair is counted twice; the next reconcile reports and corrects that.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Iterable, Mapping, Optional
+
+from pymongo import DeleteOne, UpdateOne
+
+from backend.config import settings
+from backend.database import get_db
+from backend.services import snapshot_service
+from backend.services.snapshot_service import PORTFOLIO, PORTFOLIO_ID, ROLLUPS, SNAPSHOTS
+
+logger = logging.getLogger(__name__)
+
+# Relative difference below which a stored total counts as correct (float summation order)
+_DRIFT_TOLERANCE = 1e-9
+
+
+def summarize(doc: Mapping[str, Any]) -> dict[str, Any]:
+    """The portfolio document as the doc's totals and averages."""
+    totals = doc.get("totals") or {}
+    count = int(doc.get("project_count") or 0)
+    total_revenue, total_cost = totals.get("revenue", 0.0), totals.get("cost", 0.0)
+    total_profit = total_revenue - total_cost
+    return {
+        "totalRevenue": total_revenue,
+        "totalCost": total_cost,
+        "totalProfit": total_profit,
+        "overallMargin": total_profit / total_revenue if total_revenue > 0 else 0.0,
+        "totalTimeSaved": totals.get("time_saved", 0.0),
+        "averageProfit": total_profit / count if count else 0.0,
+        "averageMargin": doc.get("margin_sum", 0.0) / count if count else 0.0,
+        "projectCount": count,
+        "updatedAt": doc.get("updated_at"),
+    }
+
+
+async def get_portfolio() -> dict[str, Any]:
+    doc = await get_db().collection(PORTFOLIO).find_one({"_id": PORTFOLIO_ID})
+    return summarize(doc or {})
+
+
+def _drifted(stored: float, expected: float) -> bool:
+    return abs(stored - expected) > _DRIFT_TOLERANCE * max(1.0, abs(expected))
+
+
+def _expected_rollups(
+    buckets: Iterable[Mapping[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, float]], int]:
+    """
+    The week, month and all-time rollups ``record_snapshots`` should have produced from
+    ``buckets``: (rollup id -> ``$setOnInsert`` fields, rollup id -> totals, days seen).
+    """
+    meta: dict[str, dict[str, Any]] = {}
+    totals: dict[str, dict[str, float]] = {}
+    days = 0
+    for bucket in buckets:
+        project_id = bucket["project_id"]
+        for dd, entry in (bucket.get("days") or {}).items():
+            days += 1
+            day = date.fromisoformat(f"{bucket['month']}-{dd}")
+            contribution = snapshot_service.contribution(entry)
+            rids = [snapshot_service.all_time_id(project_id)]
+            meta.setdefault(rids[0], {"project_id": project_id, "period": "all", "key": "all"})
+            for period in ("week", "month"):
+                rid = snapshot_service.rollup_id(project_id, period, day)
+                if rid not in meta:
+                    key, start = snapshot_service.period_key(period, day)
+                    meta[rid] = {
+                        "project_id": project_id, "period": period, "key": key, "start": start.isoformat(),
+                    }
+                rids.append(rid)
+            for rid in rids:
+                target = totals.setdefault(rid, {})
+                for name, value in contribution.items():
+                    target[name] = target.get(name, 0.0) + value
+    return meta, totals, days
+
+
+def _totals_drifted(have: Mapping[str, Any], want: Mapping[str, float]) -> bool:
+    return any(_drifted(float(have.get(n, 0.0)), want.get(n, 0.0)) for n in have.keys() | want.keys())
+
+
+def _guard(doc_id: str, fields: Mapping[str, Any]) -> dict[str, Any]:
+    """Filter matching ``doc_id`` only while ``fields`` still hold the values read."""
+    return {"_id": doc_id, **fields}
+
+
+def _correction(have: Mapping[str, Any], want: Mapping[str, Any], prefix: str = "totals.") -> dict[str, Any]:
+    """The ``$inc`` taking the ``have`` fields to ``want``."""
+    return {
+        f"{prefix}{name}": want.get(name, 0.0) - have.get(name, 0.0)
+        for name in have.keys() | want.keys()
+        if want.get(name, 0.0) != have.get(name, 0.0)
+    }
+
+
+async def _repair_project(project_id: str) -> None:
+    """
+    Move one project's rollups (all periods) to what its snapshots add up to: the rollups
+    are read first, then the snapshots; drifted rollups get a guarded ``$inc``, missing
+    ones are inserted and ones without snapshots deleted.
+    """
+    db = get_db()
+    rollups = db.collection(ROLLUPS).find({"project_id": project_id}, {"totals": 1})
+    stored = {doc["_id"]: doc.get("totals") or {} async for doc in rollups}
+    buckets = db.collection(SNAPSHOTS).find({"project_id": project_id}, {"project_id": 1, "month": 1, "days": 1})
+    meta, expected, _ = _expected_rollups([bucket async for bucket in buckets])
+    ops: list[Any] = []
+    for rid, have in stored.items():
+        guard = _guard(rid, {f"totals.{n}": v for n, v in have.items()})
+        if rid not in expected:
+            ops.append(DeleteOne(guard))
+        elif _totals_drifted(have, expected[rid]):
+            ops.append(UpdateOne(guard, {"$inc": _correction(have, expected[rid])}))
+    for rid in expected.keys() - stored.keys():
+        # Inserted only if no ingest created it in the meantime
+        ops.append(
+            UpdateOne({"_id": rid}, {"$setOnInsert": {**meta[rid], "totals": expected[rid]}}, upsert=True)
+        )
+    await db.bulk_write(ROLLUPS, ops, chunk_size=settings.METRICS_BULK_CHUNK_SIZE)
+
+
+async def _repair_portfolio() -> None:
+    """Move the portfolio document to the sum of the all-time rollups (read after it)."""
+    db = get_db()
+    stored = await db.collection(PORTFOLIO).find_one({"_id": PORTFOLIO_ID}) or {}
+    cursor = db.collection(ROLLUPS).find({"period": "all"}, {"totals": 1})
+    rollups = [doc.get("totals") or {} async for doc in cursor]
+    want_totals: dict[str, float] = {}
+    for totals in rollups:
+        for name, value in totals.items():
+            want_totals[name] = want_totals.get(name, 0.0) + float(value)
+    want = {"project_count": len(rollups), "margin_sum": sum(snapshot_service.margin_of(t) for t in rollups)}
+    have_totals = stored.get("totals") or {}
+    have = {name: stored.get(name, 0) for name in want}
+    if not stored:
+        await db.collection(PORTFOLIO).update_one(
+            {"_id": PORTFOLIO_ID},
+            {"$setOnInsert": {"totals": want_totals, **want}, "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
+        return
+    inc = {**_correction(have_totals, want_totals), **_correction(have, want, prefix="")}
+    if not inc:
+        return
+    guard = {f"totals.{n}": v for n, v in have_totals.items()}
+    guard.update({name: stored[name] for name in want if name in stored})
+    await db.collection(PORTFOLIO).update_one(
+        _guard(PORTFOLIO_ID, guard), {"$inc": inc, "$currentDate": {"updated_at": True}}
+    )
+
+
+async def reconcile(*, apply: bool = False) -> dict[str, Any]:
+    """
+    Recompute the portfolio and every project's rollups (all-time, weekly and monthly) from
+    the snapshot buckets and report where the stored values differ: ``drift`` for the
+    portfolio, ``driftedProjects`` for projects with a drifted, missing or orphaned rollup
+    (one without snapshots). With ``apply`` those projects and the portfolio are repaired
+    as described in the module docstring.
+    """
+    started = time.perf_counter()
+    db = get_db()
+    cursor = db.collection(SNAPSHOTS).find({}, {"project_id": 1, "month": 1, "days": 1}).batch_size(500)
+    meta, expected, days = _expected_rollups([bucket async for bucket in cursor])
+    projects = {rid: totals for rid, totals in expected.items() if meta[rid]["period"] == "all"}
+
+    expected_totals: dict[str, float] = {}
+    for totals in projects.values():
+        for name, value in totals.items():
+            expected_totals[name] = expected_totals.get(name, 0.0) + value
+    expected_portfolio = {
+        "project_count": len(projects),
+        "margin_sum": sum(snapshot_service.margin_of(t) for t in projects.values()),
+    }
+
+    stored = await db.collection(PORTFOLIO).find_one({"_id": PORTFOLIO_ID}) or {}
+    drift: dict[str, dict[str, float]] = {}
+    stored_totals = stored.get("totals") or {}
+    for name in expected_totals.keys() | stored_totals.keys():
+        have, want = float(stored_totals.get(name, 0.0)), expected_totals.get(name, 0.0)
+        if _drifted(have, want):
+            drift[f"totals.{name}"] = {"stored": have, "expected": want, "difference": have - want}
+    for name, want in expected_portfolio.items():
+        have = float(stored.get(name, 0.0))
+        if _drifted(have, float(want)):
+            drift[name] = {"stored": have, "expected": float(want), "difference": have - float(want)}
+
+    drifted: set[str] = set()
+    unseen = set(expected)
+    async for doc in db.collection(ROLLUPS).find({}, {"project_id": 1, "totals": 1}):
+        unseen.discard(doc["_id"])
+        want_totals: Optional[dict[str, float]] = expected.get(doc["_id"])
+        if want_totals is None or _totals_drifted(doc.get("totals") or {}, want_totals):
+            drifted.add(doc["project_id"])
+    # Rollups the snapshots call for but that do not exist
+    drifted.update(meta[rid]["project_id"] for rid in unseen)
+    drifted_projects = sorted(drifted)
+
+    applied = apply and bool(drift or drifted_projects)
+    if applied:
+        for project_id in drifted_projects:
+            await _repair_project(project_id)
+        await _repair_portfolio()
+
+    return {
+        "projects": len(projects),
+        "days": days,
+        "drift": drift,
+        "driftedProjects": drifted_projects,
+        "applied": applied,
+        "durationMs": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def run_reconcile(interval: float) -> None:
+    """Reconcile (and repair) every ``interval`` seconds until cancelled, logging any drift."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            report = await reconcile(apply=True)
+        except Exception:
+            logger.exception("Portfolio reconcile failed")
+            continue
+        if report["applied"]:
+            logger.warning(
+                "Portfolio drift repaired: %s; projects: %s", report["drift"], report["driftedProjects"]
+            )
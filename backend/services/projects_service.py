@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from typing import Any, Optional, Tuple
+import asyncio
+from typing import Any, Literal, Optional, Tuple
 
-from bson import ObjectId
+from bson import ObjectId, json_util
 
-from backend.database import MongoDatabase
-from backend.models.project import ProjectCreate, ProjectUpdate
+from backend.config import settings
+from backend.database import get_db
+from backend.models.project import ProjectBase, ProjectCreate, ProjectUpdate
+from backend.utils.cache import LRUCache
+from backend.utils.fields import model_field_names, parse_fields
 
 
 def _projects() -> Any:
-    return MongoDatabase().collection("projects")
+    return get_db().collection("projects")
 
 
 def _mongo_sort(sort_param: Optional[str]) -> Optional[list[tuple[str, int]]]:
@@ -46,36 +50,103 @@ def _mongo_filter(filter_param: Optional[str]) -> dict[str, Any]:
     return {}
 
 
-async def list_projects(
-    *, page: int, limit: int, sort: Optional[str], filter: Optional[str]
-) -> tuple[list[dict[str, Any]], int]:
+# Fields a project list row carries unless the client asks for others via ``fields=``
+LIST_FIELDS = ("name", "status", "owner", "dueDate")
+SELECTABLE_FIELDS = tuple(model_field_names(ProjectBase))
+
+CountStrategy = Literal["auto", "exact", "estimated", "cached", "none"]
+
+# Filtered totals keyed by the normalized Mongo filter; cleared on every project write
+_count_cache: LRUCache[int] = LRUCache(max_bytes=1024 * 1024, ttl_seconds=settings.PROJECT_COUNT_CACHE_TTL_SECONDS)
+# Last seen ``version`` per project id, for answering If-None-Match without a read. Only this
+# process's writes invalidate it, hence the (configurable, default zero) TTL
+_version_cache: LRUCache[int] = LRUCache(max_bytes=1024 * 1024, ttl_seconds=settings.PROJECT_VERSION_CACHE_TTL_SECONDS)
+
+
+async def _count_projects(mongo_filter: dict[str, Any], strategy: CountStrategy) -> tuple[Optional[int], str]:
+    """Resolve ``strategy`` to a total and the name of the strategy that actually produced it."""
+    if strategy == "none":
+        return None, "none"
+    if strategy == "auto":
+        strategy = "cached" if mongo_filter else "estimated"
     collection = _projects()
+    if strategy == "estimated" and not mongo_filter:
+        return await collection.estimated_document_count(), "estimated"
+    if strategy in ("estimated", "cached"):
+        # estimated_document_count cannot apply a filter
+        key = json_util.dumps(mongo_filter, sort_keys=True)
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached, "cached"
+        generation = _count_cache.generation(key)
+        total = await collection.count_documents(mongo_filter)
+        _count_cache.put(key, total, len(key) + 64, generation=generation)
+        return total, "exact"
+    return await collection.count_documents(mongo_filter), "exact"
+
+
+def _invalidate_counts() -> None:
+    _count_cache.clear()
+
+
+async def list_projects(
+    *,
+    page: int,
+    limit: int,
+    sort: Optional[str],
+    filter: Optional[str],
+    cursor: Optional[str] = None,
+    count: CountStrategy = "exact",
+    fields: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[int], str, Optional[str]]:
+    """
+    Returns (items, total, total_strategy, next_cursor). Pass ``cursor`` from a previous
+    response to continue by keyset; ``page`` is only used for the first request and kept
+    for older clients. The total is computed concurrently with the page query according to
+    ``count``. Only ``fields`` (default LIST_FIELDS) are read from Mongo.
+    Raises ValueError for an invalid cursor or unknown field.
+    """
+    selected = parse_fields(fields, SELECTABLE_FIELDS, default=LIST_FIELDS)
     mongo_filter = _mongo_filter(filter)
-    sort_spec = _mongo_sort(sort)
     skip = max(page - 1, 0) * max(limit, 0)
-
-    cursor = collection.find(mongo_filter)
-    if sort_spec:
-        cursor = cursor.sort(sort_spec)
-    cursor = cursor.skip(skip).limit(limit)
-
-    items = [
-        {
-            "id": str(doc["_id"]),
-            "name": doc["name"],
-            "status": doc["status"],
-            "owner": doc["owner"],
-            "dueDate": doc.get("dueDate"),
-        }
-        async for doc in cursor
-    ]
-    total = await collection.count_documents(mongo_filter)
-    return items, total
+    result, (total, total_strategy) = await asyncio.gather(
+        get_db().find_page(
+            "projects",
+            mongo_filter,
+            sort=_mongo_sort(sort),
+            limit=limit,
+            after=cursor,
+            skip=skip,
+            projection=selected,
+        ),
+        _count_projects(mongo_filter, count),
+    )
+    items = [{"id": str(doc["_id"]), **{f: doc.get(f) for f in selected}} for doc in result.items]
+    return items, total, total_strategy, result.next_cursor
+
+
+async def get_project_version(project_id: str) -> Optional[int]:
+    """
+    The project's ``version``: remembered if PROJECT_VERSION_CACHE_TTL_SECONDS allows,
+    otherwise read from Mongo on its own. None if the project does not exist.
+    """
+    cached = _version_cache.get(project_id)
+    if cached is not None:
+        return cached
+    generation = _version_cache.generation(project_id)
+    doc = await _projects().find_one({"_id": ObjectId(project_id)}, {"version": 1})
+    if not doc:
+        return None
+    version = doc.get("version", 0)
+    _version_cache.put(project_id, version, 64, generation=generation)
+    return version
 
 
 async def create_project(data: ProjectCreate) -> dict[str, Any]:
     doc = data.model_dump(by_alias=True)
+    doc["version"] = 0
     result = await _projects().insert_one(doc)
+    _invalidate_counts()
     # Normalize ObjectId values inside nested objects if any
     # Use Pydantic's model_dump with custom serializer for ObjectId normalization
     normalized_doc = data.model_dump(mode='json')
@@ -83,11 +154,14 @@ async def create_project(data: ProjectCreate) -> dict[str, Any]:
 
 
 async def get_project(project_id: str) -> Optional[dict[str, Any]]:
+    generation = _version_cache.generation(project_id)
     doc = await _projects().find_one({"_id": ObjectId(project_id)})
     if not doc:
         return None
     doc_out: dict[str, Any] = {k: v for k, v in doc.items() if k != "_id"}
     doc_out["id"] = str(doc["_id"])
+    doc_out["version"] = doc.get("version", 0)
+    _version_cache.put(project_id, doc_out["version"], 64, generation=generation)
     return doc_out
 
 
@@ -97,13 +171,18 @@ async def update_project(project_id: str, changes: ProjectUpdate) -> Optional[di
         # Return current
         doc = await _projects().find_one({"_id": ObjectId(project_id)})
         return None if not doc else {"id": str(doc["_id"]), **{k: v for k, v in doc.items() if k != "_id"}}
-    await _projects().update_one({"_id": ObjectId(project_id)}, {"$set": update_doc})
-    doc = await _projects().find_one({"_id": ObjectId(project_id)})
+    doc = await get_db().find_one_and_update(
+        "projects", {"_id": ObjectId(project_id)}, {"$set": update_doc, "$inc": {"version": 1}}
+    )
+    _invalidate_counts()
+    _version_cache.invalidate(project_id)
     return None if not doc else {"id": str(doc["_id"]), **{k: v for k, v in doc.items() if k != "_id"}}
 
 
 async def delete_project(project_id: str) -> bool:
     res = await _projects().delete_one({"_id": ObjectId(project_id)})
+    _invalidate_counts()
+    _version_cache.invalidate(project_id)
     return res.deleted_count == 1
 
 
@@ -0,0 +1,214 @@
+"""
+Recompute stored snapshots under a (new) formula version.
+
+The job walks ``metric_snapshots`` in ``_id`` order, METRICS_RECOMPUTE_BATCH_BUCKETS buckets
+at a time, and sends each batch's raw inputs as columns to a process pool running
+``calculate_batch_for_version``. Up to METRICS_RECOMPUTE_WORKERS batches are calculated
+while earlier ones are written back in order through ``record_recalculated`` (bulk writes
+of the metrics and metadata only, which also move the rollups and portfolio by the
+difference; a day re-ingested while its batch was being calculated is left as ingested).
+After each write the last bucket id is saved as the checkpoint in ``metric_jobs``, so a
+restarted or cancelled job resumes there. Days already at the target version are skipped
+unless ``force`` is set. One job per process.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from backend.config import settings
+from backend.database import get_db
+from backend.services import series_service, snapshot_service, ticker_service
+from backend.services.metrics_service import (
+    CALCULATION_VERSION,
+    DAILY_INPUTS,
+    FORMULA_VERSIONS,
+    calculate_batch_for_version,
+    columns_from_records,
+)
+
+logger = logging.getLogger(__name__)
+
+JOBS = "metric_jobs"
+
+
+class RecomputeRunning(Exception):
+    pass
+
+
+def _job_id(version: str) -> str:
+    return f"recompute:{version}"
+
+
+def _jobs() -> Any:
+    return get_db().collection(JOBS)
+
+
+_task: Optional[asyncio.Task] = None
+# Live counters of the running job (the persisted document is updated once per batch)
+_live: dict[str, Any] = {}
+
+
+def _records(buckets: list[dict[str, Any]], version: str, force: bool) -> list[dict[str, Any]]:
+    records = []
+    for bucket in buckets:
+        for dd, entry in sorted((bucket.get("days") or {}).items()):
+            metadata = entry.get("metadata") or {}
+            if not force and metadata.get("calculation_version") == version:
+                continue
+            records.append({
+                "project_id": bucket["project_id"],
+                "date": f"{bucket['month']}-{dd}",
+                "raw_inputs": entry.get("raw_inputs") or {},
+                "calculated_at": metadata.get("calculated_at"),
+            })
+    return records
+
+
+async def _run(version: str, force: bool) -> None:
+    jobs = _jobs()
+    job = await jobs.find_one({"_id": _job_id(version)}) or {}
+    checkpoint = job.get("checkpoint")
+    snapshots = get_db().collection(snapshot_service.SNAPSHOTS)
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    _live.update(version=version, days=0, buckets=0, started=started)
+    await jobs.update_one(
+        {"_id": _job_id(version)},
+        {
+            "$set": {"status": "running", "version": version, "force": force, "error": None,
+                     "total_buckets": await snapshots.count_documents({}),
+                     "run_started_at": datetime.now(timezone.utc)},
+            "$setOnInsert": {"started_at": datetime.now(timezone.utc), "processed_buckets": 0, "recomputed_days": 0,
+                             "skipped_days": 0},
+        },
+        upsert=True,
+    )
+
+    async def write(buckets: list[dict[str, Any]], records: list[dict[str, Any]], future: Any) -> None:
+        recomputed = 0
+        if records:
+            metrics = await future
+            outcome = await snapshot_service.record_recalculated(records, metrics, version)
+            if outcome.errors:
+                raise RuntimeError(f"{len(outcome.errors)} snapshot writes failed, e.g. {next(iter(outcome.errors.values()))}")
+            recomputed = outcome.matched_count
+        _live["days"] += recomputed
+        _live["buckets"] += len(buckets)
+        await jobs.update_one(
+            {"_id": _job_id(version)},
+            {
+                "$set": {"checkpoint": buckets[-1]["_id"], "updated_at": datetime.now(timezone.utc)},
+                "$inc": {"processed_buckets": len(buckets), "recomputed_days": recomputed,
+                         "skipped_days": len(records) - recomputed},
+            },
+        )
+
+    inflight: deque[tuple[list[dict[str, Any]], list[dict[str, Any]], Any]] = deque()
+    pool = ProcessPoolExecutor(max_workers=settings.METRICS_RECOMPUTE_WORKERS)
+    try:
+        while not _live.get("stop"):
+            query = {"_id": {"$gt": checkpoint}} if checkpoint is not None else {}
+            size = settings.METRICS_RECOMPUTE_BATCH_BUCKETS
+            cursor = snapshots.find(query, {"project_id": 1, "month": 1, "days": 1}).sort("_id", 1).limit(size)
+            buckets = await cursor.to_list(length=size)
+            if not buckets:
+                break
+            checkpoint = buckets[-1]["_id"]
+            records = _records(buckets, version, force)
+            future = None
+            if records:
+                columns = columns_from_records([r["raw_inputs"] for r in records], DAILY_INPUTS)
+                future = loop.run_in_executor(pool, calculate_batch_for_version, version, columns)
+            inflight.append((buckets, records, future))
+            if len(inflight) >= settings.METRICS_RECOMPUTE_WORKERS:
+                await write(*inflight.popleft())
+        while inflight and not _live.get("stop"):
+            await write(*inflight.popleft())
+    finally:
+        # Batches not yet written are recalculated on resume; don't block the loop waiting for them
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if _live.get("stop"):
+        await jobs.update_one({"_id": _job_id(version)}, {"$set": {"status": "cancelled"}})
+        logger.info("Recompute to %s cancelled after %s days", version, _live["days"])
+        return
+    await jobs.update_one(
+        {"_id": _job_id(version)},
+        {"$set": {"status": "completed", "finished_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)}},
+    )
+    logger.info("Recompute to %s finished: %s days in %.1fs", version, _live["days"], time.perf_counter() - started)
+
+
+async def _run_and_record(version: str, force: bool) -> None:
+    try:
+        await _run(version, force)
+    except asyncio.CancelledError:
+        # Only on shutdown (cancel() stops between batches): the task may have been
+        # interrupted between a batch's snapshot and rollup writes, so run
+        # portfolio_service.reconcile(apply=True) before relying on the rollups
+        logger.warning("Recompute to %s interrupted; reconcile the rollups before relying on them", version)
+        await _jobs().update_one({"_id": _job_id(version)}, {"$set": {"status": "cancelled"}})
+        raise
+    except Exception as exc:
+        logger.exception("Recompute to %s failed", version)
+        await _jobs().update_one({"_id": _job_id(version)}, {"$set": {"status": "failed", "error": str(exc)}})
+    finally:
+        # Stored metrics changed underneath every cached view
+        series_service.invalidate_series()
+        ticker_service.invalidate_ticker_cache()
+
+
+async def start(version: str = CALCULATION_VERSION, *, force: bool = False, restart: bool = False) -> dict[str, Any]:
+    """
+    Start (or resume from its checkpoint) the recompute to ``version``; ``restart`` discards
+    the checkpoint, as does starting again after a completed run. Raises KeyError for an
+    unknown version and RecomputeRunning if a job is already running in this process.
+    """
+    global _task
+    if version not in FORMULA_VERSIONS:
+        raise KeyError(version)
+    if _task is not None and not _task.done():
+        raise RecomputeRunning(_live.get("version"))
+    job = await _jobs().find_one({"_id": _job_id(version)}, {"status": 1})
+    if restart or (job and job.get("status") == "completed"):
+        await _jobs().delete_one({"_id": _job_id(version)})
+    _live.clear()
+    _live["version"] = version
+    _task = asyncio.create_task(_run_and_record(version, force))
+    return await progress(version)
+
+
+async def cancel() -> bool:
+    """
+    Stop the running job once the batch being written is complete (snapshots, rollups and
+    checkpoint); batches calculated but not yet written are dropped and redone on resume.
+    """
+    if _task is None or _task.done():
+        return False
+    _live["stop"] = True
+    await asyncio.gather(_task, return_exceptions=True)
+    return True
+
+
+async def progress(version: str = CALCULATION_VERSION) -> dict[str, Any]:
+    """The persisted job state plus, while it runs, live throughput."""
+    job = await _jobs().find_one({"_id": _job_id(version)}) or {"status": "not_started", "version": version}
+    job.pop("_id", None)
+    running = _task is not None and not _task.done() and _live.get("version") == version
+    if running:
+        job["status"] = "running"
+    if running and "started" in _live:
+        elapsed = time.perf_counter() - _live["started"]
+        job["elapsed_seconds"] = round(elapsed, 1)
+        job["days_per_second"] = round(_live["days"] / elapsed, 1) if elapsed > 0 else 0.0
+        job["buckets_per_second"] = round(_live["buckets"] / elapsed, 1) if elapsed > 0 else 0.0
+    total = job.get("total_buckets")
+    if total:
+        job["percent"] = round(min(100.0, 100.0 * job.get("processed_buckets", 0) / total), 1)
+    return job
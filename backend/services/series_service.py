@@ -0,0 +1,71 @@
+"""
+Index series for sparklines and trend charts.
+
+A series is one daily metric of one project over the last ``window`` days, normalized with
+``to_index_series`` (baseline = 100) and downsampled to ``points`` with LTTB, so a long
+history costs a few dozen numbers on the wire. Results are cached per (project, window,
+points, ...) under the project's cache generation; ``invalidate_series`` bumps it whenever
+new snapshots for the project are stored, orphaning every cached series of that project.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from backend.config import settings
+from backend.services import snapshot_service
+from backend.services.metrics_service import calculator, lttb_indices
+from backend.utils.cache import LRUCache
+
+series_cache: LRUCache[dict[str, Any]] = LRUCache(
+    max_bytes=settings.SERIES_CACHE_MAX_BYTES, ttl_seconds=settings.SERIES_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_series(project_ids: Optional[Iterable[str]] = None) -> None:
+    """Drop the cached series of ``project_ids`` (of every project if None)."""
+    if project_ids is None:
+        # Also moves every key's generation on, orphaning loads still in flight
+        series_cache.clear()
+        return
+    for project_id in set(project_ids):
+        series_cache.invalidate(project_id)
+
+
+async def get_series(
+    project_id: str,
+    *,
+    metric: str = "profit",
+    window: int = 30,
+    points: int = 30,
+    baseline: Optional[float] = None,
+    end: Optional[date] = None,
+) -> dict[str, Any]:
+    end = end or datetime.now(timezone.utc).date()
+    # The key carries the generation read before loading, so a load that races with an
+    # invalidation is stored under a key nobody looks up any more
+    key = (project_id, series_cache.generation(project_id), metric, window, points, baseline, end)
+    cached = series_cache.get(key)
+    if cached is not None:
+        return cached
+
+    start = end - timedelta(days=window - 1)
+    rows = await snapshot_service.get_daily(project_id, start, end)
+    days = [date.fromisoformat(r["date"]) for r in rows]
+    values = [float(r["calculated_metrics"].get(metric) or 0.0) for r in rows]
+    indexed = calculator.to_index_series(values, baseline)
+    selected = lttb_indices([d.toordinal() for d in days], indexed, points) if indexed else np.arange(0)
+    result = {
+        "projectId": project_id,
+        "metric": metric,
+        "window": window,
+        "baseline": (baseline if baseline is not None else values[0]) if values else None,
+        "total": len(values),
+        "dates": [days[i].isoformat() for i in selected],
+        "values": [indexed[i] for i in selected],
+    }
+    series_cache.put(key, result, len(json.dumps(result)))
+    return result
@@ -0,0 +1,373 @@
+"""
+Daily metric snapshots and their weekly/monthly rollups.
+
+Snapshots are bucketed: one ``metric_snapshots`` document per project per month,
+``{"_id": "<project>:<YYYY-MM>", "project_id", "month", "days": {"01": entry, ...}}``,
+where each day's entry is the audit record of docs/METRICS_MODEL.md (``raw_inputs``,
+``calculated_metrics``, ``metadata``). A 90-day range therefore reads three or four
+documents per project instead of ninety.
+
+``metric_rollups`` holds one document per project per ISO week, per month and overall
+("all") with the summed inputs and metrics of its days, and ``metric_portfolio`` one
+document with the totals across projects (see ``portfolio_service``). ``record_snapshots``
+keeps them current with ``$inc`` of the difference each written day makes, so re-ingesting
+a day never double-counts. Ratios (margin, automation lift) are derived from the sums
+when read, never summed.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Literal, Mapping, Optional, Sequence, Union
+
+from pymongo import UpdateOne
+
+from backend.config import settings
+from backend.database import BulkWriteOutcome, get_db
+from backend.services.metrics_service import CALCULATION_VERSION, DAILY_INPUTS, DAILY_METRICS, calculator, columns_from_records
+
+Period = Literal["week", "month"]
+
+# Summed per rollup period; "days" counts the snapshots in it
+ROLLUP_FIELDS = (
+    "revenue", "cost", "profit", "time_saved",
+    "billable_hours", "actual_hours", "baseline_hours", "prs", "app_events",
+)
+SNAPSHOTS = "metric_snapshots"
+ROLLUPS = "metric_rollups"
+PORTFOLIO = "metric_portfolio"
+PORTFOLIO_ID = "portfolio"
+
+
+def _snapshots() -> Any:
+    return get_db().collection(SNAPSHOTS)
+
+
+def _rollups() -> Any:
+    return get_db().collection(ROLLUPS)
+
+
+def as_date(value: Union[str, date]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def bucket_id(project_id: str, day: date) -> str:
+    return f"{project_id}:{day:%Y-%m}"
+
+
+def period_key(period: Period, day: date) -> tuple[str, date]:
+    """(key, first day) of the week or month containing ``day``."""
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}", day - timedelta(days=day.weekday())
+    return f"{day:%Y-%m}", day.replace(day=1)
+
+
+def rollup_id(project_id: str, period: Period, day: date) -> str:
+    return f"{project_id}:{period}:{period_key(period, day)[0]}"
+
+
+def all_time_id(project_id: str) -> str:
+    return f"{project_id}:all"
+
+
+def margin_of(totals: Mapping[str, Any]) -> float:
+    revenue = totals.get("revenue", 0)
+    return totals.get("profit", 0) / revenue if revenue > 0 else 0.0
+
+
+def contribution(entry: Optional[Mapping[str, Any]]) -> dict[str, float]:
+    """What one day's entry adds to its week/month totals."""
+    if not entry:
+        return {}
+    raw, metrics = entry.get("raw_inputs") or {}, entry.get("calculated_metrics") or {}
+    out = {"days": 1.0}
+    for name in ROLLUP_FIELDS:
+        value = metrics.get(name, raw.get(name))
+        if value is not None:
+            out[name] = float(value)
+    return out
+
+
+def derive_ratios(totals: Mapping[str, Any]) -> dict[str, Any]:
+    """Add period margin and automation lift, computed from the sums like the portfolio margin."""
+    baseline = totals.get("baseline_hours", 0)
+    return {
+        **totals,
+        "margin": margin_of(totals),
+        "automation_lift": totals.get("time_saved", 0) / baseline if baseline > 0 else 0.0,
+    }
+
+
+def build_entries(records: Sequence[Mapping[str, Any]], calculated_at: Optional[datetime] = None) -> list[dict[str, Any]]:
+    """
+    Calculate the metrics of ``records`` (each ``{"project_id", "date", "raw_inputs"}``) in one
+    vectorized pass and return their audit entries.
+    """
+    if not records:
+        return []
+    metrics = calculator.calculate_batch(columns_from_records([r["raw_inputs"] for r in records], DAILY_INPUTS))
+    return entries_from_metrics(records, metrics, CALCULATION_VERSION, calculated_at)
+
+
+def entries_from_metrics(
+    records: Sequence[Mapping[str, Any]],
+    metrics: Mapping[str, Any],
+    version: str,
+    calculated_at: Optional[datetime] = None,
+) -> list[dict[str, Any]]:
+    """Audit entries from already calculated metric columns (one element per record)."""
+    metadata = {"calculated_at": calculated_at or datetime.now(timezone.utc), "calculation_version": version}
+    return [
+        {
+            "raw_inputs": dict(record["raw_inputs"]),
+            "calculated_metrics": {name: float(metrics[name][i]) for name in DAILY_METRICS},
+            "metadata": metadata,
+        }
+        for i, record in enumerate(records)
+    ]
+
+
+async def record_snapshots(
+    records: Sequence[Mapping[str, Any]],
+    *,
+    entries: Optional[Sequence[Mapping[str, Any]]] = None,
+) -> BulkWriteOutcome:
+    """
+    Store a batch of daily snapshots (replacing existing ones for the same project and day)
+    and update their rollups: one read of the touched days, then one unordered bulk write
+    per collection. ``entries`` skips the calculation when the caller already built them.
+    The outcome's ``errors`` are keyed by index into ``records``; failed records do not
+    count towards the rollups.
+    """
+    if not records:
+        return BulkWriteOutcome()
+    entries = entries if entries is not None else build_entries(records)
+    days = [as_date(r["date"]) for r in records]
+    project_ids = [str(r["project_id"]) for r in records]
+    bucket_ids = [bucket_id(p, d) for p, d in zip(project_ids, days)]
+
+    # Current contents of the touched days, so the rollups can be moved by the difference
+    projection: dict[str, int] = {f"days.{d:%d}": 1 for d in set(days)}
+    stored: dict[tuple[str, str], Optional[dict[str, Any]]] = {}
+    async for doc in _snapshots().find({"_id": {"$in": list(set(bucket_ids))}}, projection):
+        for dd, entry in (doc.get("days") or {}).items():
+            stored[(doc["_id"], dd)] = entry
+
+    bucket_sets: dict[str, dict[str, Any]] = {}
+    changes: list[tuple[dict[str, float], dict[str, float]]] = []
+    for project_id, day, bid, entry in zip(project_ids, days, bucket_ids, entries):
+        dd = f"{day:%d}"
+        previous = stored.get((bid, dd))
+        stored[(bid, dd)] = entry  # A later record for the same day diffs against this one
+        bucket_sets.setdefault(bid, {"project_id": project_id, "month": f"{day:%Y-%m}"})[f"days.{dd}"] = entry
+        changes.append((contribution(previous), contribution(entry)))
+
+    db = get_db()
+    order = list(bucket_sets)
+    written = await db.bulk_write(
+        SNAPSHOTS,
+        [UpdateOne({"_id": bid}, {"$set": bucket_sets[bid]}, upsert=True) for bid in order],
+        chunk_size=settings.METRICS_BULK_CHUNK_SIZE,
+    )
+    failed_buckets = {order[i]: message for i, message in written.errors.items()}
+    outcome = BulkWriteOutcome(
+        matched_count=written.matched_count,
+        modified_count=written.modified_count,
+        upserted_count=written.upserted_count,
+        errors={i: failed_buckets[bid] for i, bid in enumerate(bucket_ids) if bid in failed_buckets},
+    )
+
+    await _move_rollups(
+        (project_id, day, before, after)
+        for i, (project_id, day, (before, after)) in enumerate(zip(project_ids, days, changes))
+        if i not in outcome.errors
+    )
+    return outcome
+
+
+async def record_recalculated(
+    records: Sequence[Mapping[str, Any]], metrics: Mapping[str, Any], version: str
+) -> BulkWriteOutcome:
+    """
+    Store recalculated metrics of existing snapshots and move their rollups by the difference.
+    ``records`` are the days as read by the caller (``{"project_id", "date", "calculated_at"}``,
+    the latter from the stored metadata) and ``metrics`` the calculated columns. Only
+    ``calculated_metrics`` and ``metadata`` are written, and a bucket only while each of its
+    days still carries the ``calculated_at`` it was read with, so a day re-ingested in the
+    meantime keeps its new inputs and metrics (and, with it, the other days of its bucket
+    are left for a later run). The outcome's ``matched_count`` is the number of days written;
+    ``errors`` are keyed by index into ``records``.
+    """
+    if not records:
+        return BulkWriteOutcome()
+    now = datetime.now(timezone.utc)
+    # BSON dates keep milliseconds; truncate so the value can be matched once stored
+    metadata = {"calculated_at": now.replace(microsecond=now.microsecond // 1000 * 1000), "calculation_version": version}
+    days = [as_date(r["date"]) for r in records]
+    bucket_ids = [bucket_id(str(r["project_id"]), d) for r, d in zip(records, days)]
+
+    projection: dict[str, int] = {f"days.{d:%d}": 1 for d in set(days)}
+    stored: dict[tuple[str, str], dict[str, Any]] = {}
+    async for doc in _snapshots().find({"_id": {"$in": list(set(bucket_ids))}}, projection):
+        for dd, entry in (doc.get("days") or {}).items():
+            stored[(doc["_id"], dd)] = entry
+
+    guards: dict[str, dict[str, Any]] = {}
+    sets: dict[str, dict[str, Any]] = {}
+    planned: dict[int, tuple[dict[str, Any], dict[str, Any]]] = {}
+    for i, (record, day, bid) in enumerate(zip(records, days, bucket_ids)):
+        dd = f"{day:%d}"
+        previous = stored.get((bid, dd))
+        if previous is None or (previous.get("metadata") or {}).get("calculated_at") != record.get("calculated_at"):
+            continue  # Re-ingested (or removed) since it was read
+        calculated = {name: float(metrics[name][i]) for name in DAILY_METRICS}
+        guards.setdefault(bid, {"_id": bid})[f"days.{dd}.metadata.calculated_at"] = record.get("calculated_at")
+        sets.setdefault(bid, {}).update({f"days.{dd}.calculated_metrics": calculated, f"days.{dd}.metadata": metadata})
+        planned[i] = (previous, {**previous, "calculated_metrics": calculated, "metadata": metadata})
+
+    db = get_db()
+    order = list(sets)
+    written = await db.bulk_write(
+        SNAPSHOTS,
+        [UpdateOne(guards[bid], {"$set": sets[bid]}) for bid in order],
+        chunk_size=settings.METRICS_BULK_CHUNK_SIZE,
+    )
+    failed_buckets = {order[i]: message for i, message in written.errors.items()}
+    applied = {bid for bid in order if bid not in failed_buckets}
+    if written.matched_count < len(applied):
+        # A guard failed: a day changed between the read above and the write. Keep the
+        # buckets that carry this write's metadata.
+        written_day = {bucket_ids[i]: f"{days[i]:%d}" for i in planned}
+        cursor = _snapshots().find(
+            {"$or": [{"_id": bid, f"days.{written_day[bid]}.metadata.calculated_at": metadata["calculated_at"]} for bid in applied]},
+            {"_id": 1},
+        )
+        applied = {doc["_id"] async for doc in cursor}
+
+    outcome = BulkWriteOutcome(
+        errors={i: failed_buckets[bucket_ids[i]] for i in planned if bucket_ids[i] in failed_buckets},
+    )
+    changes = []
+    for i, (previous, entry) in planned.items():
+        if bucket_ids[i] in applied:
+            outcome.matched_count += 1
+            changes.append((str(records[i]["project_id"]), days[i], contribution(previous), contribution(entry)))
+    outcome.modified_count = outcome.matched_count
+    await _move_rollups(changes)
+    return outcome
+
+
+async def _move_rollups(changes: Iterable[tuple[str, date, Mapping[str, float], Mapping[str, float]]]) -> None:
+    """Move the week, month and all-time rollups and the portfolio by each (project, day, before, after)."""
+    rollup_incs: dict[str, dict[str, float]] = {}
+    rollup_meta: dict[str, dict[str, Any]] = {}
+    project_incs: dict[str, dict[str, float]] = {}
+    for project_id, day, before, after in changes:
+        diff = {name: after.get(name, 0.0) - before.get(name, 0.0) for name in after.keys() | before.keys()}
+        _add(project_incs.setdefault(project_id, {}), diff)
+        for period in ("week", "month"):
+            rid = rollup_id(project_id, period, day)
+            key, start = period_key(period, day)
+            rollup_meta[rid] = {"project_id": project_id, "period": period, "key": key, "start": start.isoformat()}
+            _add(rollup_incs.setdefault(rid, {}), diff)
+    rollup_ops = [
+        UpdateOne({"_id": rid}, {"$inc": update, "$setOnInsert": rollup_meta[rid]}, upsert=True)
+        for rid, update in ((rid, _inc_update(incs)) for rid, incs in rollup_incs.items())
+        if update
+    ]
+    await get_db().bulk_write(ROLLUPS, rollup_ops, chunk_size=settings.METRICS_BULK_CHUNK_SIZE)
+    await _update_portfolio(project_incs)
+
+
+def _add(target: dict[str, float], diff: Mapping[str, float]) -> None:
+    for name, delta in diff.items():
+        target[name] = target.get(name, 0.0) + delta
+
+
+def _inc_update(incs: Mapping[str, float], prefix: str = "totals.") -> dict[str, float]:
+    return {f"{prefix}{name}": delta for name, delta in incs.items() if delta}
+
+
+async def _update_portfolio(project_incs: Mapping[str, Mapping[str, float]]) -> None:
+    """
+    Move each project's all-time rollup and the portfolio document by the batch's
+    differences. The portfolio also tracks the number of projects and the sum of their
+    margins (for the average margin), which needs the projects' totals before the batch.
+    """
+    project_incs = {pid: incs for pid, incs in project_incs.items() if any(incs.values())}
+    if not project_incs:
+        return
+    ids = [all_time_id(pid) for pid in project_incs]
+    previous = {doc["project_id"]: doc.get("totals") or {} async for doc in _rollups().find({"_id": {"$in": ids}})}
+
+    portfolio: dict[str, float] = {}
+    margin_change = 0.0
+    ops = []
+    for project_id, incs in project_incs.items():
+        before = previous.get(project_id, {})
+        after = {name: before.get(name, 0.0) + incs.get(name, 0.0) for name in before.keys() | incs.keys()}
+        margin_change += margin_of(after) - margin_of(before)
+        _add(portfolio, incs)
+        ops.append(UpdateOne(
+            {"_id": all_time_id(project_id)},
+            {"$inc": _inc_update(incs), "$setOnInsert": {"project_id": project_id, "period": "all", "key": "all"}},
+            upsert=True,
+        ))
+    db = get_db()
+    # Upserts are the projects seen for the first time
+    written = await db.bulk_write(ROLLUPS, ops, chunk_size=settings.METRICS_BULK_CHUNK_SIZE)
+    update = {**_inc_update(portfolio), "margin_sum": margin_change, "project_count": written.upserted_count}
+    await db.collection(PORTFOLIO).update_one(
+        {"_id": PORTFOLIO_ID},
+        {"$inc": {k: v for k, v in update.items() if v}, "$currentDate": {"updated_at": True}},
+        upsert=True,
+    )
+
+
+def _months(start: date, end: date) -> list[str]:
+    months, current = [], start.replace(day=1)
+    while current <= end:
+        months.append(f"{current:%Y-%m}")
+        current = (current + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def flatten_days(buckets: Iterable[Mapping[str, Any]], start: date, end: date) -> list[dict[str, Any]]:
+    """Daily audit records (``{"project_id", "date", ...entry}``) of ``buckets`` within [start, end], by date."""
+    out = []
+    for bucket in buckets:
+        for dd, entry in (bucket.get("days") or {}).items():
+            day = f"{bucket['month']}-{dd}"
+            if start.isoformat() <= day <= end.isoformat():
+                out.append({"project_id": bucket["project_id"], "date": day, **entry})
+    out.sort(key=lambda r: (r["project_id"], r["date"]))
+    return out
+
+
+async def get_daily(project_id: str, start: date, end: date) -> list[dict[str, Any]]:
+    """One project's daily snapshots between ``start`` and ``end`` (inclusive)."""
+    ids = [f"{project_id}:{month}" for month in _months(start, end)]
+    buckets = [doc async for doc in _snapshots().find({"_id": {"$in": ids}})]
+    return flatten_days(buckets, start, end)
+
+
+async def get_recent_daily(days: int) -> list[dict[str, Any]]:
+    """Every project's snapshots of the last ``days`` days (today included)."""
+    end = datetime.now(timezone.utc).date()
+    start = end - timedelta(days=days - 1)
+    buckets = [doc async for doc in _snapshots().find({"month": {"$in": _months(start, end)}})]
+    return flatten_days(buckets, start, end)
+
+
+async def get_rollups(project_id: str, period: Period, start: date, end: date) -> list[dict[str, Any]]:
+    """Weekly or monthly totals of one project for the periods overlapping [start, end]."""
+    first = period_key(period, start)[1].isoformat()
+    cursor = _rollups().find(
+        {"project_id": project_id, "period": period, "start": {"$gte": first, "$lte": end.isoformat()}},
+        {"_id": 0},
+    ).sort("start", 1)
+    return [{**doc, "totals": derive_ratios(doc.get("totals") or {})} async for doc in cursor]
@@ -0,0 +1,222 @@
+"""
+Project ticker: the latest daily metrics of every project plus a profit sparkline.
+
+GET /api/metrics/ticker reads the last TICKER_HISTORY_LENGTH days from the snapshot store.
+Live updates go through ``ticker_feed``: ``publish_metrics`` records a project's new numbers,
+and once per tick the feed coalesces everything recorded since the last tick into one
+``{"type": "delta", "deltas": [...]}`` message, encodes it once and broadcasts the same
+string to every WebSocket subscriber.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+
+from bson import ObjectId
+
+from backend.config import settings
+from backend.database import get_db
+from backend.services import snapshot_service
+from backend.services.metrics_service import calculator
+from backend.utils.events import Broadcaster, FrameSubscription
+
+# Delta fields <- calculated metric names
+_DELTA_FIELDS = {"profit": "profit", "margin": "margin", "timeSavedHrs": "time_saved"}
+_STOP_WORDS = re.compile(r"\b(the|a|an|and|or|but|in|on|at|to|for)\b", re.IGNORECASE)
+
+
+def symbol_for(name: str) -> str:
+    """Three-letter ticker symbol, as ``abbr`` in frontend/src/lib/ticker.ts."""
+    words = _STOP_WORDS.sub("", name).split()
+    if not words:
+        return ""
+    if len(words) >= 3:
+        return "".join(w[0] for w in words[:3]).upper()
+    if len(words) == 2:
+        return (words[0][:2] + words[1][0]).upper()
+    return words[0][:3].upper()
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+class TickerFeed:
+    """Coalesces per-project updates and broadcasts one encoded message per tick."""
+
+    def __init__(self, *, max_frames: int) -> None:
+        self.broadcaster = Broadcaster(max_frames=max_frames, snapshot=self.snapshot_frame)
+        # projectId -> delta accumulated since the last tick
+        self._pending: dict[str, dict[str, Any]] = {}
+        # projectId -> latest values of every field, for subscribers that skipped frames
+        self._latest: dict[str, dict[str, Any]] = {}
+        # projectId -> sparkline baseline (the first profit of the window last served)
+        self._baselines: dict[str, float] = {}
+        self._state_version = 0
+        self._snapshot: tuple[int, str] = (-1, "")
+        self.ticks = 0
+
+    def set_baseline(self, project_id: str, baseline: float) -> None:
+        self._baselines[project_id] = baseline or 1.0
+
+    def update(self, delta: dict[str, Any]) -> None:
+        project_id = delta["projectId"]
+        self._pending[project_id] = {**self._pending.get(project_id, {}), **delta}
+        latest = {k: v for k, v in delta.items() if k != "indexPoint"}
+        self._latest[project_id] = {**self._latest.get(project_id, {}), **latest}
+        self._state_version += 1
+
+    def index_point(self, project_id: str, profit: float) -> float:
+        baseline = self._baselines.setdefault(project_id, profit or 1.0)
+        return profit / baseline * 100
+
+    def flush(self) -> int:
+        """Broadcast what accumulated since the last tick; returns the number of deltas sent."""
+        if not self._pending:
+            return 0
+        deltas, self._pending = list(self._pending.values()), {}
+        self.ticks += 1
+        if self.broadcaster.subscriber_count:
+            self.broadcaster.broadcast(_encode(deltas))
+        return len(deltas)
+
+    def snapshot_frame(self) -> str:
+        """The latest values of every project as one delta message, encoded once per change."""
+        version, frame = self._snapshot
+        if version != self._state_version:
+            frame = _encode(list(self._latest.values()))
+            self._snapshot = (self._state_version, frame)
+        return frame
+
+    def subscribe(self) -> FrameSubscription:
+        return self.broadcaster.subscribe()
+
+    async def run(self, interval: float) -> None:
+        """Flush every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "pendingProjects": len(self._pending),
+            "trackedProjects": len(self._latest),
+            **self.broadcaster.stats(),
+        }
+
+
+def _encode(deltas: list[dict[str, Any]]) -> str:
+    return json.dumps({"type": "delta", "deltas": deltas}, separators=(",", ":"))
+
+
+ticker_feed = TickerFeed(max_frames=settings.TICKER_WS_MAX_PENDING_FRAMES)
+
+
+def publish_metrics(project_id: str, metrics: Mapping[str, Any], raw_inputs: Optional[Mapping[str, Any]] = None) -> None:
+    """
+    Record a project's newly calculated daily metrics (``calculated_metrics`` of a snapshot)
+    for the next tick. ``prs``/``app_events`` are taken from ``raw_inputs`` when present.
+    """
+    project_id = str(project_id)
+    delta: dict[str, Any] = {"projectId": project_id}
+    for field, name in _DELTA_FIELDS.items():
+        if metrics.get(name) is not None:
+            delta[field] = float(metrics[name])
+    raw_inputs = raw_inputs or {}
+    if raw_inputs.get("prs") is not None:
+        delta["prs"] = int(raw_inputs["prs"])
+    if raw_inputs.get("app_events") is not None:
+        delta["appEvents"] = int(raw_inputs["app_events"])
+    if "profit" in delta:
+        delta["indexPoint"] = ticker_feed.index_point(project_id, delta["profit"])
+    ticker_feed.update(delta)
+
+
+def publish_snapshots(records: Sequence[Mapping[str, Any]], entries: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Publish freshly stored snapshots (``snapshot_service.record_snapshots``): each project's
+    newest day, unless it is a backfill older than the ticker window.
+    """
+    cutoff = datetime.now(timezone.utc).date() - timedelta(days=settings.TICKER_HISTORY_LENGTH)
+    newest: dict[str, tuple[date, Mapping[str, Any]]] = {}
+    for record, entry in zip(records, entries):
+        project_id, day = str(record["project_id"]), snapshot_service.as_date(record["date"])
+        if day > cutoff and (project_id not in newest or day >= newest[project_id][0]):
+            newest[project_id] = (day, entry)
+    for project_id, (_, entry) in newest.items():
+        publish_metrics(project_id, entry["calculated_metrics"], entry["raw_inputs"])
+    if newest:
+        invalidate_ticker_cache()
+
+
+async def stream_frames(subscription: FrameSubscription, send: Callable[[str], Awaitable[Any]]) -> None:
+    """Send the subscription's frames through ``send`` until it is closed."""
+    while True:
+        frame = await subscription.next_frame()
+        if frame is None:
+            return
+        await send(frame)
+
+
+# REST snapshot
+
+# (expires_at, items)
+_cached_items: tuple[float, list[dict[str, Any]]] = (0.0, [])
+
+
+def invalidate_ticker_cache() -> None:
+    global _cached_items
+    _cached_items = (0.0, [])
+
+
+async def _project_names(project_ids: list[str]) -> dict[str, str]:
+    object_ids = [ObjectId(pid) for pid in project_ids if ObjectId.is_valid(pid)]
+    if not object_ids:
+        return {}
+    cursor = get_db().collection("projects").find({"_id": {"$in": object_ids}}, {"name": 1})
+    return {str(doc["_id"]): doc.get("name", "") async for doc in cursor}
+
+
+async def get_ticker_items() -> list[dict[str, Any]]:
+    """Every project with metrics in the history window, ordered by name."""
+    global _cached_items
+    expires_at, items = _cached_items
+    if time.monotonic() < expires_at:
+        return items
+
+    history = settings.TICKER_HISTORY_LENGTH
+    # A handful of monthly buckets per project, flattened to days in date order
+    by_project: dict[str, list[dict[str, Any]]] = {}
+    for record in await snapshot_service.get_recent_daily(history):
+        by_project.setdefault(record["project_id"], []).append(record)
+    names = await _project_names(list(by_project))
+    # One vectorized pass over all sparklines, padded to equal length with each series' first value
+    series = [[float(r["calculated_metrics"].get("profit") or 0) for r in rows] for rows in by_project.values()]
+    width = max((len(s) for s in series), default=0)
+    padded = [[s[0]] * (width - len(s)) + s for s in series]
+    indexed = calculator.index_series_batch(padded) if padded else []
+
+    items = []
+    for (project_id, rows), values, index_row in zip(by_project.items(), series, indexed):
+        latest, raw = rows[-1]["calculated_metrics"], rows[-1].get("raw_inputs") or {}
+        name = names.get(project_id) or project_id
+        ticker_feed.set_baseline(project_id, values[0])
+        items.append({
+            "projectId": project_id,
+            "symbol": symbol_for(name),
+            "name": name,
+            "profit": float(latest.get("profit") or 0.0),
+            "margin": float(latest.get("margin") or 0.0),
+            "timeSavedHrs": float(latest.get("time_saved") or 0.0),
+            "prs": _optional_int(raw.get("prs")),
+            "appEvents": _optional_int(raw.get("app_events")),
+            "indexSeries": index_row[width - len(values):].tolist(),
+        })
+    items.sort(key=lambda item: item["name"].lower())
+    _cached_items = (time.monotonic() + settings.TICKER_CACHE_TTL_SECONDS, items)
+    return items
@@ -3,19 +3,18 @@ from typing import Any, Optional
 
 from bson import ObjectId
 
-from backend.database import MongoDatabase
-from backend.models import UserCreate, UserUpdate, UserInDB, UserPublic
+from backend.database import get_db
+from backend.models import UserCreate, UserUpdate, UserPublic
+from backend.utils.documents import to_model
 
 
-def _serialize_user(document: dict[str, Any]) -> UserInDB:
-    return UserInDB(
-        id=str(document["_id"]),
-        email=document["email"],
-        full_name=document.get("full_name"),
-        is_active=document.get("is_active", True),
-        created_at=document["created_at"],
-        updated_at=document["updated_at"],
-    )
+# Fields read for the username listing
+_USERNAME_FIELDS = ("username", "full_name")
+
+
+def _serialize_user(document: dict[str, Any]) -> UserPublic:
+    # Written by create_user from a validated UserCreate; re-validating the EmailStr dominates
+    return to_model(UserPublic, document, trusted=True)
 
 
 async def create_user(data: UserCreate) -> UserPublic:
@@ -28,26 +27,25 @@ async def create_user(data: UserCreate) -> UserPublic:
         "created_at": now,
         "updated_at": now,
     }
-    db = MongoDatabase()
+    db = get_db()
     user_doc = await db.insert_one("users", user_doc)
-    user = _serialize_user(user_doc)
-    return UserPublic(**user.model_dump())
+    return _serialize_user(user_doc)
 
 
 async def get_user_by_id(user_id: str) -> Optional[UserPublic]:
-    db = MongoDatabase()
+    db = get_db()
     doc = await db.find_one_by_id("users", user_id)
     if not doc:
         return None
-    return UserPublic(**_serialize_user(doc).model_dump())
+    return _serialize_user(doc)
 
 
 async def get_user_by_email(email: str) -> Optional[UserPublic]:
-    db = MongoDatabase()
+    db = get_db()
     doc = await db.find_one("users", {"email": email})
     if not doc:
         return None
-    return UserPublic(**_serialize_user(doc).model_dump())
+    return _serialize_user(doc)
 
 
 async def update_user(user_id: str, changes: UserUpdate) -> Optional[UserPublic]:
@@ -56,19 +54,30 @@ async def update_user(user_id: str, changes: UserUpdate) -> Optional[UserPublic]
         return await get_user_by_id(user_id)
 
     update_doc["updated_at"] = datetime.now(timezone.utc)
-    db = MongoDatabase()
-    await db.update_one_by_id("users", user_id, update_doc)
-    return await get_user_by_id(user_id)
+    db = get_db()
+    doc = await db.update_one_by_id_and_return("users", user_id, update_doc)
+    if not doc:
+        return None
+    return _serialize_user(doc)
 
 
 async def delete_user(user_id: str) -> bool:
-    db = MongoDatabase()
+    db = get_db()
     return await db.delete_one_by_id("users", user_id)
 
 
-async def list_usernames() -> list[dict[str, str]]:
-    db = MongoDatabase()
-    docs = await db.find_many("users")
-    return [{"username": str(doc.get("username") or doc.get("full_name") or "")} for doc in docs]
-
-
+async def list_usernames(
+    *, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> tuple[list[dict[str, str]], Optional[str]]:
+    """
+    Usernames of all users, or one keyset page of them when ``limit`` is given.
+    Raises ValueError for an invalid cursor.
+    """
+    db = get_db()
+    next_cursor: Optional[str] = None
+    if limit is None:
+        docs = await db.find_many("users", projection=_USERNAME_FIELDS)
+    else:
+        page = await db.find_page("users", limit=limit, after=cursor, projection=_USERNAME_FIELDS)
+        docs, next_cursor = page.items, page.next_cursor
+    return [{"username": str(doc.get("username") or doc.get("full_name") or "")} for doc in docs], next_cursor
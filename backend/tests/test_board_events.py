@@ -0,0 +1,138 @@
+"""
+Change-stream translation and delta coalescing in ``board_events``.
+
+The change events below have the shape MongoDB emits for ``db.watch(...,
+full_document="updateLookup")`` on the boards collection; no replica set is needed.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from backend.config import settings
+from backend.services import board_events
+
+BOARD_ID = ObjectId("65f1c0ffee0000000000b0a2")
+CARD_ID = "65f1c0ffee0000000000c0a2"
+AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _update_event(version: int, board: dict) -> dict:
+    """The change event of the write that set the board's version to ``version``."""
+    return {
+        "_id": {"_data": "8265F1C0FF000000012B022C0100296E5A1004"},
+        "operationType": "update",
+        "clusterTime": None,
+        "ns": {"db": "appdb", "coll": "boards"},
+        "documentKey": {"_id": BOARD_ID},
+        "updateDescription": {
+            "updatedFields": {"version": version, f"changeLog.{version - 1}": {"ops": [], "at": AT}},
+            "removedFields": [],
+        },
+        "fullDocument": board,
+    }
+
+
+def _board(version: int, log: list) -> dict:
+    return {"_id": BOARD_ID, "name": "Sprint", "version": version, "changeLog": log}
+
+
+def _entry(*ops: dict) -> dict:
+    return board_events.log_entry(list(ops), AT)
+
+
+def test_deltas_from_change_picks_the_events_own_entry():
+    moved = board_events.change_delta("card", CARD_ID, {"columnId": "c2", "position": 3})
+    renamed = board_events.change_delta("card", CARD_ID, {"title": "Ship it"})
+    # The looked-up document is already one write ahead of the event
+    board = _board(5, [_entry(), _entry(moved), _entry(renamed)])
+
+    board_id, deltas = board_events.deltas_from_change(_update_event(4, board))
+
+    assert board_id == str(BOARD_ID)
+    assert deltas == [{"op": "card.moved", "id": CARD_ID, "data": {"columnId": "c2", "position": 3}, "v": 4}]
+
+
+def test_deltas_from_change_resyncs_when_ops_were_not_logged(monkeypatch):
+    monkeypatch.setattr(settings, "BOARD_CHANGELOG_MAX_OPS", 2)
+    bulk = [board_events.change_delta("card", str(ObjectId()), {"position": i}) for i in range(3)]
+    board = _board(1, [_entry(*bulk)])
+
+    assert board["changeLog"][0]["ops"] is None
+    assert board_events.deltas_from_change(_update_event(1, board)) == (str(BOARD_ID), None)
+
+
+def test_log_entry_drops_ops_over_the_byte_limit(monkeypatch):
+    monkeypatch.setattr(settings, "BOARD_CHANGELOG_MAX_ENTRY_BYTES", 1024)
+    small = board_events.delta("card.created", CARD_ID, {"title": "a"})
+    large = board_events.delta("card.created", CARD_ID, {"title": "a", "description": "x" * 2048})
+
+    assert board_events.log_entry([small], AT)["ops"] == [small]
+    assert board_events.log_entry([large], AT)["ops"] is None
+
+
+def test_deltas_from_change_resyncs_when_the_entry_left_the_log():
+    board = _board(9, [_entry(), _entry()])
+
+    assert board_events.deltas_from_change(_update_event(4, board)) == (str(BOARD_ID), None)
+
+
+def test_deltas_from_change_ignores_updates_without_a_version_bump():
+    event = _update_event(1, _board(1, [_entry()]))
+    event["updateDescription"]["updatedFields"] = {"name": "Renamed"}
+
+    assert board_events.deltas_from_change(event) == (str(BOARD_ID), [])
+
+
+def test_deltas_from_change_skips_boards_deleted_before_the_lookup():
+    event = _update_event(1, _board(1, [_entry()]))
+    event["fullDocument"] = None
+
+    assert board_events.deltas_from_change(event) == (str(BOARD_ID), [])
+
+
+def test_deltas_from_change_translates_deletes():
+    event = {"operationType": "delete", "ns": {"db": "appdb", "coll": "boards"}, "documentKey": {"_id": BOARD_ID}}
+
+    assert board_events.deltas_from_change(event) == (str(BOARD_ID), [{"op": "board.deleted", "id": str(BOARD_ID)}])
+
+
+def test_merge_deltas_keeps_created_and_merges_data():
+    created = board_events.delta("card.created", CARD_ID, {"title": "a", "position": 0})
+    updated = board_events.change_delta("card", CARD_ID, {"title": "b"})
+
+    assert board_events.merge_deltas(created, updated) == {
+        "op": "card.created", "id": CARD_ID, "data": {"title": "b", "position": 0},
+    }
+
+
+def test_merge_deltas_mixed_actions_become_updated():
+    moved = board_events.change_delta("card", CARD_ID, {"position": 2})
+    updated = board_events.change_delta("card", CARD_ID, {"title": "b"})
+
+    assert board_events.merge_deltas(moved, moved)["op"] == "card.moved"
+    assert board_events.merge_deltas(moved, updated) == {
+        "op": "card.updated", "id": CARD_ID, "data": {"position": 2, "title": "b"},
+    }
+
+
+def test_merge_deltas_deletes():
+    created = board_events.delta("card.created", CARD_ID, {"title": "a"})
+    updated = board_events.change_delta("card", CARD_ID, {"title": "b"})
+    deleted = board_events.delta("card.deleted", CARD_ID)
+
+    assert board_events.merge_deltas(created, deleted) is None
+    assert board_events.merge_deltas(updated, deleted) == deleted
+    assert board_events.merge_deltas(deleted, created) == created
+
+
+def test_changes_since_replays_logged_deltas_and_gives_up_past_the_log():
+    first = board_events.change_delta("column", "c1", {"title": "Doing"})
+    second = board_events.change_delta("card", CARD_ID, {"rank": "V"})
+    board = _board(3, [_entry(), _entry(first), _entry(second)])
+
+    assert board_events.changes_since(board, 1) == [{**first, "v": 2}, {**second, "v": 3}]
+    assert board_events.changes_since(board, 3) == []
+    assert board_events.changes_since(board, 4) is None
+    assert board_events.changes_since(_board(9, [_entry()]), 4) is None
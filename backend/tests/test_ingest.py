@@ -0,0 +1,37 @@
+"""
+Per-line validation of POST /api/metrics/ingest (``ingest_service.ingest_ndjson``).
+
+Every line below fails validation, so nothing reaches the database.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services import ingest_service
+
+RAW = {
+    "billable_hours": 20, "billable_rate": 150, "actual_hours": 32,
+    "cost_rate": 85, "fixed_costs": 200, "baseline_hours": 50,
+}
+
+
+async def _stream(*lines: dict):
+    yield "\n".join(json.dumps(line) for line in lines).encode()
+
+
+def _ingest(*lines: dict):
+    return asyncio.run(ingest_service.ingest_ndjson(_stream(*lines)))
+
+
+@pytest.mark.parametrize("field", ["billable_hours", "billable_rate", "cost_rate", "fixed_costs"])
+def test_ingest_rejects_negative_inputs(field):
+    line = {"project_id": "p1", "date": "2025-01-01", "raw_inputs": {**RAW, field: -1}}
+
+    report = _ingest(line)
+
+    assert (report.accepted, report.rejected) == (0, 1)
+    assert report.errors[0].line == 1
+    assert report.errors[0].error.startswith(f"raw_inputs.{field}: ")
@@ -1,6 +1,7 @@
 from .seed import seed_initial_data
 from .indexes import ensure_indexes
+from .migrations import migrate_due_dates, migrate_positions_to_ranks
 
-__all__ = ["seed_initial_data", "ensure_indexes"]
+__all__ = ["seed_initial_data", "ensure_indexes", "migrate_due_dates", "migrate_positions_to_ranks"]
 
 
@@ -0,0 +1,122 @@
+"""
+In-process LRU cache with TTL expiry and a byte-size bound.
+
+Single event loop, so no locking. Each key has a generation that ``invalidate`` bumps
+(``clear`` bumps them all at once); a reader captures the generation before loading from
+Mongo and passes it to ``put``, so a load that raced with a write is never stored.
+
+Generations come from one counter: a key's generation is the newer of its own last
+invalidation and the last ``clear``. Only keys invalidated since the last ``clear`` are
+tracked; past ``max_generations`` of them the tracking is reset the way ``clear`` resets
+it, minus dropping the entries, which at worst keeps a few in-flight loads from being stored.
+"""
+from __future__ import annotations
+
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        ttl_seconds: float,
+        max_generations: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (value, size, expires_at); most recently used last
+        self._entries: OrderedDict[Hashable, tuple[V, int, float]] = OrderedDict()
+        self.max_generations = max_generations
+        self._counter = itertools.count(1)
+        # Generation of the last clear(), and of keys invalidated since then
+        self._epoch = 0
+        self._generations: dict[Hashable, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, key: Hashable) -> int:
+        return self._generations.get(key, self._epoch)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, _, expires_at = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: V, size: int, *, generation: Optional[int] = None) -> bool:
+        """Store ``value``; returns False if it was invalidated since ``generation`` or is too large."""
+        if generation is not None and generation != self.generation(key):
+            return False
+        if size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, self._clock() + self.ttl_seconds)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        if len(self._generations) >= self.max_generations:
+            self._new_epoch()
+        self._generations[key] = next(self._counter)
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry, and every load in flight (for any key, cached or not)."""
+        self._new_epoch()
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _new_epoch(self) -> None:
+        self._epoch = next(self._counter)
+        self._generations.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
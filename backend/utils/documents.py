@@ -0,0 +1,67 @@
+"""
+Mongo documents to API models.
+
+``to_model`` builds a model from a document in one step: ``_id`` becomes ``id`` and
+top-level ObjectId values become strings (API models carry ids as strings), then the model
+is validated once. Documents we wrote ourselves can skip validation: with ``trusted`` the
+model is built with ``model_construct``, unless it has nested model fields, which
+``model_construct`` would leave as plain dicts; those are still validated. Validation runs in
+pydantic-core and is cheaper than ``model_construct`` for plain fields, so ``trusted`` only
+pays off for models with costly validators (EmailStr); see benchmarks/document_mapping.py.
+``to_models`` and ``cursor_to_models`` map in bulk, resolving all of that once.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, AsyncIterable, Callable, Iterable, Mapping, TypeVar, get_args
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _has_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_has_model(arg) for arg in get_args(annotation))
+
+
+@lru_cache(maxsize=None)
+def constructible(model: type[BaseModel]) -> bool:
+    """Whether ``model_construct`` yields a complete ``model`` (no nested model fields)."""
+    return not any(_has_model(field.annotation) for field in model.model_fields.values())
+
+
+def document_data(doc: Mapping[str, Any]) -> dict[str, Any]:
+    """The document's fields as model input: ``_id`` as ``id``, ObjectId values as strings."""
+    data = {k: str(v) if isinstance(v, ObjectId) else v for k, v in doc.items() if k != "_id"}
+    if "_id" in doc:
+        data["id"] = str(doc["_id"])
+    return data
+
+
+def _builder(model: type[M], trusted: bool) -> Callable[[dict[str, Any]], M]:
+    if trusted and constructible(model):
+        return lambda data: model.model_construct(**data)
+    return model.model_validate
+
+
+def to_model(model: type[M], doc: Mapping[str, Any], /, *, trusted: bool = False, **extra: Any) -> M:
+    """``doc`` as ``model``; ``extra`` adds (or overrides) fields not stored on the document."""
+    data = document_data(doc)
+    data.update(extra)
+    return _builder(model, trusted)(data)
+
+
+def to_models(model: type[M], docs: Iterable[Mapping[str, Any]], *, trusted: bool = False) -> list[M]:
+    build = _builder(model, trusted)
+    return [build(document_data(doc)) for doc in docs]
+
+
+async def cursor_to_models(
+    model: type[M], cursor: AsyncIterable[Mapping[str, Any]], *, trusted: bool = False
+) -> list[M]:
+    """Map a Motor cursor as it is iterated, without materializing its documents first."""
+    build = _builder(model, trusted)
+    return [build(document_data(doc)) async for doc in cursor]
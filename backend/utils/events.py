@@ -0,0 +1,261 @@
+"""
+In-process publish/subscribe for small JSON-able events, grouped by topic.
+
+Publishing never blocks. Each subscription buffers pending events keyed by ``key(event)``,
+so a burst of events about the same entity coalesces into one (via ``merge``) while the
+consumer is busy. A subscription that falls more than ``max_pending`` distinct keys behind
+drops its buffer and is flagged as overflowed; the consumer then resyncs from a full read.
+
+``Broadcaster`` is the fan-out for feeds whose messages are the same for every subscriber:
+each frame is encoded once and the same string is queued for everyone. A subscriber more
+than ``max_frames`` behind has its queue dropped and is sent one ``snapshot()`` frame
+(the current state) instead, once it is ready again.
+Single event loop, so no locking.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Callable, Hashable, Optional
+
+Event = dict[str, Any]
+
+
+class Subscription:
+    def __init__(
+        self,
+        bus: "EventBus",
+        topic: Hashable,
+        *,
+        max_pending: int,
+        key: Callable[[Event], Hashable],
+        merge: Callable[[Event, Event], Optional[Event]],
+    ) -> None:
+        self.topic = topic
+        self._bus = bus
+        self._max_pending = max_pending
+        self._key = key
+        self._merge = merge
+        # key -> event; a coalesced event keeps the position of the first one it replaced
+        self._pending: OrderedDict[Hashable, Event] = OrderedDict()
+        self._ready = asyncio.Event()
+        self.overflowed = False
+        self.closed = False
+        self.delivered = 0
+        self.coalesced = 0
+        self.overflows = 0
+
+    def offer(self, event: Event) -> None:
+        if self.closed or self.overflowed:
+            return
+        key = self._key(event)
+        if key in self._pending:
+            merged = self._merge(self._pending[key], event)
+            self.coalesced += 1
+            if merged is None:
+                del self._pending[key]
+            else:
+                self._pending[key] = merged
+        elif len(self._pending) >= self._max_pending:
+            self.force_resync()
+            return
+        else:
+            self._pending[key] = event
+        self._ready.set()
+
+    def force_resync(self) -> None:
+        """Drop everything pending and tell the consumer to reload from scratch."""
+        self._pending.clear()
+        self.overflowed = True
+        self.overflows += 1
+        self._ready.set()
+
+    async def next_batch(self) -> tuple[list[Event], bool]:
+        """
+        Wait until something is pending and take it all. Returns (events, resync); when
+        ``resync`` is True the events published before the overflow were discarded.
+        Returns ([], False) once the subscription is closed.
+        """
+        await self._ready.wait()
+        self._ready.clear()
+        resync, self.overflowed = self.overflowed, False
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self.delivered += len(batch)
+        return batch, resync
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._pending.clear()
+            self._bus._remove(self)
+            self._ready.set()
+
+
+def _keep_latest(previous: Event, current: Event) -> Optional[Event]:
+    return current
+
+
+class EventBus:
+    def __init__(
+        self,
+        *,
+        max_pending: int = 1000,
+        key: Callable[[Event], Hashable] = id,
+        merge: Callable[[Event, Event], Optional[Event]] = _keep_latest,
+    ) -> None:
+        self.max_pending = max_pending
+        self._key = key
+        self._merge = merge
+        self._topics: dict[Hashable, set[Subscription]] = {}
+        self.published = 0
+        # Counters of closed subscriptions, so stats() covers the bus lifetime
+        self._closed_totals = {"delivered": 0, "coalesced": 0, "overflows": 0}
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        sub = Subscription(self, topic, max_pending=self.max_pending, key=self._key, merge=self._merge)
+        self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def _remove(self, sub: Subscription) -> None:
+        for name in self._closed_totals:
+            self._closed_totals[name] += getattr(sub, name)
+        subs = self._topics.get(sub.topic)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._topics[sub.topic]
+
+    def publish(self, topic: Hashable, event: Event) -> int:
+        """Hand ``event`` to every subscriber of ``topic``; returns how many there were."""
+        subs = self._topics.get(topic, ())
+        for sub in subs:
+            sub.offer(event)
+        self.published += 1
+        return len(subs)
+
+    def publish_all(self, event: Event) -> int:
+        """Hand ``event`` to every subscriber of every topic."""
+        count = 0
+        for topic in list(self._topics):
+            count += self.publish(topic, event)
+        return count
+
+    def resync(self, topic: Hashable) -> None:
+        for sub in self._topics.get(topic, ()):
+            sub.force_resync()
+
+    def resync_all(self) -> None:
+        for subs in self._topics.values():
+            for sub in subs:
+                sub.force_resync()
+
+    def subscriber_count(self, topic: Optional[Hashable] = None) -> int:
+        if topic is not None:
+            return len(self._topics.get(topic, ()))
+        return sum(len(subs) for subs in self._topics.values())
+
+    def stats(self) -> dict[str, Any]:
+        subs = [sub for topic_subs in self._topics.values() for sub in topic_subs]
+        return {
+            "topics": len(self._topics),
+            "subscribers": len(subs),
+            "published": self.published,
+            "maxPending": self.max_pending,
+            "pending": sum(len(sub._pending) for sub in subs),
+            **{name: total + sum(getattr(sub, name) for sub in subs) for name, total in self._closed_totals.items()},
+        }
+
+
+class FrameSubscription:
+    def __init__(self, broadcaster: "Broadcaster", *, max_frames: int) -> None:
+        self._broadcaster = broadcaster
+        self._max_frames = max_frames
+        self._frames: deque[str] = deque()
+        self._ready = asyncio.Event()
+        # Set when frames were dropped; the next frame is a snapshot that supersedes them
+        self.catching_up = False
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.snapshots = 0
+
+    def offer(self, frame: str) -> None:
+        if self.closed:
+            return
+        if self.catching_up:
+            # Not taken yet, so the snapshot will include this frame's changes
+            self.dropped += 1
+            return
+        if len(self._frames) >= self._max_frames:
+            self.dropped += len(self._frames) + 1
+            self._frames.clear()
+            self.catching_up = True
+        else:
+            self._frames.append(frame)
+        self._ready.set()
+
+    async def next_frame(self) -> Optional[str]:
+        """Wait for the next frame to send; None once the subscription is closed."""
+        while not self.closed:
+            if self.catching_up:
+                self.catching_up = False
+                self.snapshots += 1
+                self.sent += 1
+                return self._broadcaster.snapshot()
+            if self._frames:
+                self.sent += 1
+                return self._frames.popleft()
+            self._ready.clear()
+            await self._ready.wait()
+        return None
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._frames.clear()
+            self._broadcaster._remove(self)
+            self._ready.set()
+
+
+class Broadcaster:
+    def __init__(self, *, max_frames: int, snapshot: Callable[[], str]) -> None:
+        self.max_frames = max_frames
+        self.snapshot = snapshot
+        self._subscribers: set[FrameSubscription] = set()
+        self.broadcasts = 0
+        self.last_frame: Optional[str] = None
+        self._closed_totals = {"sent": 0, "dropped": 0, "snapshots": 0}
+
+    def subscribe(self) -> FrameSubscription:
+        sub = FrameSubscription(self, max_frames=self.max_frames)
+        self._subscribers.add(sub)
+        return sub
+
+    def _remove(self, sub: FrameSubscription) -> None:
+        for name in self._closed_totals:
+            self._closed_totals[name] += getattr(sub, name)
+        self._subscribers.discard(sub)
+
+    def broadcast(self, frame: str) -> int:
+        """Queue ``frame`` for every subscriber; returns how many there were."""
+        for sub in self._subscribers:
+            sub.offer(frame)
+        self.broadcasts += 1
+        self.last_frame = frame
+        return len(self._subscribers)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> dict[str, Any]:
+        subs = list(self._subscribers)
+        return {
+            "subscribers": len(subs),
+            "broadcasts": self.broadcasts,
+            "maxFrames": self.max_frames,
+            "queued": sum(len(sub._frames) for sub in subs),
+            "catchingUp": sum(sub.catching_up for sub in subs),
+            **{name: total + sum(getattr(sub, name) for sub in subs) for name, total in self._closed_totals.items()},
+        }
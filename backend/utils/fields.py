@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from pydantic import BaseModel
+
+
+def model_field_names(model: type[BaseModel]) -> list[str]:
+    """Top-level field names of ``model`` as stored in Mongo (serialization aliases)."""
+    return [info.serialization_alias or name for name, info in model.model_fields.items()]
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Iterable[str],
+    *,
+    default: Iterable[str],
+    required: Iterable[str] = (),
+) -> list[str]:
+    """
+    Turn a ``fields=a,b`` query value into the list of document fields to project.
+    ``required`` fields are always included; raises ValueError for unknown names.
+    """
+    if not fields:
+        selected = list(default)
+    else:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(selected) - set(allowed))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys([*required, *selected]))
@@ -0,0 +1,63 @@
+"""
+Conditional GET helpers: ETags, If-None-Match matching and 304 responses.
+
+Versioned resources (boards, projects) use ``version_etag`` so a revalidation can be
+answered from the version alone; anything else hashes its encoded payload. A MessagePack
+representation (see backend/utils/responses.py) gets its own validators.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+from backend.utils.responses import dumps, fast_response, msgpack_requested
+
+
+def version_etag(kind: str, id_value: str, version: int, *variant: Any) -> str:
+    """Weak validator for a versioned document; ``variant`` distinguishes representations."""
+    if msgpack_requested():
+        variant = (*variant, "msgpack")
+    suffix = "".join(f"-{v}" for v in variant)
+    return f'W/"{kind}-{id_value}-{version}{suffix}"'
+
+
+def content_etag(payload: Any) -> str:
+    """Weak validator from a hash of the JSON encoding of ``payload``."""
+    digest = hashlib.blake2b(dumps(payload, sort_keys=True), digest_size=16).hexdigest()
+    return f'W/"{digest}-msgpack"' if msgpack_requested() else f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of ``etag`` against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_validators(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def conditional_response(
+    request: Request, response: Response, payload: Any, cache_control: str, *, fast: bool = False
+) -> Any:
+    """
+    Return ``payload`` with a content ETag, or a bare 304 if the client already has it.
+    ``fast`` sends it as a finished ``fast_response`` (no ``response_model`` pass).
+    """
+    etag = content_etag(payload)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    set_validators(response, etag, cache_control)
+    return fast_response(payload, response) if fast else payload
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
-from backend.database import MongoDatabase
+from backend.database import get_db
 
 
 async def ensure_indexes() -> None:
-    db = MongoDatabase()
+    db = get_db()
     await db.collection("projects").create_index([("owner.id", 1), ("status", 1), ("dueDate", 1)])
     await db.collection("boards").create_index([("projectId", 1)])  # For querying boards by project
+    await db.collection("boards").create_index([("name", 1), ("_id", 1)])  # Keyset pagination of GET /api/boards
     await db.collection("columns").create_index([("boardId", 1), ("position", 1)])
-    await db.collection("cards").create_index([("columnId", 1), ("position", 1)])
+    # Per-column card pages sort on (position|rank, _id); _id breaks ties between equal keys
+    await db.collection("cards").create_index([("columnId", 1), ("position", 1), ("_id", 1)])
     await db.collection("cards").create_index([("boardId", 1)])
+    # Rank ordering (ORDERING_MODE=rank): neighbour lookups and last-in-scope queries
+    await db.collection("columns").create_index([("boardId", 1), ("rank", 1)])
+    await db.collection("cards").create_index([("columnId", 1), ("rank", 1), ("_id", 1)])
+    # Cross-board task list (GET /api/tasks): sorted by due date, keyset-paginated on boardId/_id
+    await db.collection("cards").create_index([("dueDate", 1), ("boardId", 1), ("_id", 1)])
 
-
+    # Metric snapshots: one bucket per project per month (_id "<project>:<YYYY-MM>"); the ticker reads recent months
+    await db.collection("metric_snapshots").create_index([("month", 1)])
+    await db.collection("metric_snapshots").create_index([("project_id", 1), ("month", 1)])
+    # Weekly/monthly rollups by project and period start
+    await db.collection("metric_rollups").create_index([("project_id", 1), ("period", 1), ("start", 1)])
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from backend.database import get_db
+from backend.services import kanban_service
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_positions_to_ranks() -> int:
+    """
+    Give rank keys to cards and columns that only have integer positions.
+
+    Every column (for cards) or board (for columns) that contains at least one unranked
+    document is re-ranked as a whole in ``position`` order, so the result matches what the
+    board showed before the switch. Idempotent: fully ranked scopes are left untouched.
+    Returns the number of documents updated.
+    """
+    db = get_db()
+    migrated = 0
+    for collection, scope_field in (("columns", "boardId"), ("cards", "columnId")):
+        scopes = await db.collection(collection).distinct(scope_field, {"rank": None})
+        for scope_value in scopes:
+            migrated += await kanban_service.rebalance_ranks(
+                collection, {scope_field: scope_value}, sort=[("position", 1), ("_id", 1)]
+            )
+    return migrated
+
+
+async def migrate_due_dates() -> int:
+    """
+    Convert ``dueDate`` values stored as ISO strings (older seed data) to BSON dates on cards
+    and projects. Mongo compares values of one type only, so string dates were missed by
+    date range filters (overdue tasks) and sorted after every real date. Naive strings are
+    taken as UTC. Each update only applies while the stored value is still that string, and
+    unparseable values are left as they are. Idempotent. Returns the number of documents updated.
+    """
+    db = get_db()
+    migrated = 0
+    for collection in ("cards", "projects"):
+        ops: list[UpdateOne] = []
+        async for doc in db.collection(collection).find({"dueDate": {"$type": "string"}}, {"dueDate": 1}):
+            try:
+                due = datetime.fromisoformat(doc["dueDate"])
+            except ValueError:
+                logger.warning("Leaving unparseable dueDate %r on %s %s", doc["dueDate"], collection, doc["_id"])
+                continue
+            if due.tzinfo is None:
+                due = due.replace(tzinfo=timezone.utc)
+            ops.append(UpdateOne({"_id": doc["_id"], "dueDate": doc["dueDate"]}, {"$set": {"dueDate": due}}))
+        outcome = await db.bulk_write(collection, ops)
+        migrated += outcome.modified_count
+    return migrated
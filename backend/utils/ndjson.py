@@ -0,0 +1,40 @@
+"""Incremental NDJSON line splitting over a byte stream."""
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator, Optional
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], *, max_line_bytes: int) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """
+    Yield ``(line_number, line)`` for every non-blank line of ``chunks`` (1-based, counting
+    blank lines). A line longer than ``max_line_bytes`` is yielded as None and skipped
+    without being buffered, so memory stays bounded whatever the body size.
+    """
+    buffer = bytearray()
+    line_no = 0
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+            line_no += 1
+            if oversized:
+                yield line_no, None
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield line_no, None
+                elif buffer.strip():
+                    yield line_no, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+    if oversized or buffer.strip():
+        yield line_no + 1, None if oversized else bytes(buffer)
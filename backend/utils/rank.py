@@ -0,0 +1,75 @@
+"""
+Lexicographic rank strings for ordering cards and columns.
+
+A rank is a base-62 fraction written without the leading "0." (e.g. "V" is roughly 0.5),
+so plain string comparison (as MongoDB does for index keys) matches numeric order.
+A new rank can always be generated strictly between two existing ones, which lets a
+move touch only the moved document. Ranks never end in "0", which keeps room below
+every key.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+_ZERO = DIGITS[0]
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    # a < b, where "" means 0 and None means 1
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else _ZERO) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def validate_rank(rank: str) -> None:
+    if not rank or rank[-1] == _ZERO or any(ch not in DIGITS for ch in rank):
+        raise ValueError(f"invalid rank: {rank!r}")
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """Return a rank that sorts strictly after ``before`` and strictly before ``after``.
+
+    Either bound may be None to mean "start of list" / "end of list".
+    """
+    if before is not None:
+        validate_rank(before)
+    if after is not None:
+        validate_rank(after)
+        if before is not None and before >= after:
+            raise ValueError(f"rank {before!r} does not sort before {after!r}")
+    return _midpoint(before or "", after)
+
+
+def evenly_spaced_ranks(count: int) -> list[str]:
+    """Return ``count`` ascending ranks spread evenly over the key space.
+
+    Keys get one spare digit so roughly six midpoint insertions fit between any
+    neighbours before keys grow longer.
+    """
+    if count <= 0:
+        return []
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks: list[str] = []
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(width):
+            value, rem = divmod(value, BASE)
+            digits.append(DIGITS[rem])
+        ranks.append("".join(reversed(digits)).rstrip(_ZERO))
+    return ranks
@@ -0,0 +1,151 @@
+"""
+Fast JSON (and MessagePack) responses.
+
+``ORJSONResponse`` is the app's default response class: it encodes with orjson and handles
+what Mongo documents and our models carry directly, so raw documents (ObjectId, datetime,
+Decimal128) and Pydantic models (by alias) need no ``jsonable_encoder`` pass first.
+
+Routes whose payload is already built from validated models, or straight from documents,
+return ``fast_response(...)`` instead of the payload. FastAPI then skips validating the
+payload against ``response_model`` and serializing it again; the ``response_model`` still
+documents the route in OpenAPI.
+
+Routers built with ``route_class=NegotiatedRoute`` and ``default_response_class=
+NegotiatedResponse`` answer ``Accept: application/msgpack`` with a MessagePack body of the
+same shape as the JSON one (ids and datetimes as the same strings), encoded from the same
+documents and models; JSON stays the default. ``Vary: Accept`` is set on all their responses.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Coroutine, Mapping, Optional
+
+import msgpack
+import orjson
+from bson import Decimal128, ObjectId
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+MSGPACK = "application/msgpack"
+
+# Set per request by NegotiatedRoute
+_msgpack_requested: ContextVar[bool] = ContextVar("msgpack_requested", default=False)
+
+# OPT_UTC_Z writes aware UTC datetimes with a "Z" suffix, as Pydantic does
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        # Pydantic's own JSON serializer, spliced in as-is: no intermediate dict per model
+        return orjson.Fragment(obj.__pydantic_serializer__.to_json(obj, by_alias=True))
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return float(obj.to_decimal())
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any, *, sort_keys: bool = False) -> bytes:
+    """orjson encoding of ``content`` with the BSON and model handling described above."""
+    return orjson.dumps(content, default=_default, option=(_OPTIONS | orjson.OPT_SORT_KEYS) if sort_keys else _OPTIONS)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, datetime):
+        # The string orjson writes (OPT_UTC_Z)
+        if obj.tzinfo is not None and obj.utcoffset() == timezone.utc.utcoffset(None):
+            return obj.replace(tzinfo=None).isoformat() + "Z"
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return _default(obj)
+
+
+def packb(content: Any) -> bytes:
+    """MessagePack encoding of ``content``, mirroring ``dumps``."""
+    return msgpack.packb(content, default=_msgpack_default, datetime=False)
+
+
+def msgpack_requested() -> bool:
+    """Whether the current request negotiated MessagePack (always False outside NegotiatedRoute)."""
+    return _msgpack_requested.get()
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class NegotiatedResponse(ORJSONResponse):
+    """orjson, or MessagePack when the request negotiated it."""
+
+    # Explicit parameters: FastAPI reads the default status code off this signature for OpenAPI
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        if media_type is None and _msgpack_requested.get():
+            media_type = MSGPACK
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return packb(content) if self.media_type == MSGPACK else dumps(content)
+
+
+def _accepts_msgpack(accept: str) -> bool:
+    """MessagePack if the Accept header lists it, and with at least the weight of JSON."""
+    weights: dict[str, float] = {}
+    for part in accept.split(","):
+        media_type, *params = (p.strip() for p in part.split(";"))
+        q = next((p[2:] for p in params if p.startswith("q=")), "1")
+        try:
+            weights[media_type.lower()] = float(q)
+        except ValueError:
+            continue
+    msgpack_q = max(weights.get(MSGPACK, 0.0), weights.get("application/x-msgpack", 0.0))
+    return msgpack_q > 0 and msgpack_q >= weights.get("application/json", 0.0)
+
+
+class NegotiatedRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            token = _msgpack_requested.set(_accepts_msgpack(request.headers.get("accept", "")))
+            try:
+                response = await handler(request)
+            finally:
+                _msgpack_requested.reset(token)
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return negotiated_handler
+
+
+def fast_response(content: Any, response: Optional[Response] = None, *, status_code: int = 200) -> ORJSONResponse:
+    """
+    ``content`` as a finished response, bypassing ``response_model`` re-validation. Headers
+    already set on the injected ``response`` (ETag, Cache-Control, ...) are carried over.
+    """
+    out = NegotiatedResponse(content, status_code=status_code)
+    if response is not None:
+        out.raw_headers.extend(
+            (name, value) for name, value in response.raw_headers if name not in (b"content-length", b"content-type")
+        )
+    return out
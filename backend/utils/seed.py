@@ -1,30 +1,26 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from backend.database import MongoDatabase
+from backend.database import get_db
 
 
 async def seed_initial_data() -> None:
-    db = MongoDatabase()
+    db = get_db()
 
-    # Seed users
+    # Seed users (one upsert each; existing users are left untouched)
+    seeded_users: dict[str, dict[str, Any]] = {}
     for username in ["Rick", "Morty"]:
         email = f"{username.lower()}@example.com"
-        existing = await db.find_one("users", {"username": username})
-        if not existing:
-            await db.insert_one(
-                "users",
-                {
-                    "username": username,
-                    "email": email,
-                    "full_name": username,
-                    "is_active": True,
-                },
-            )
+        seeded_users[username] = await db.upsert_one(
+            "users",
+            {"username": username},
+            {"$setOnInsert": {"email": email, "full_name": username, "is_active": True}},
+            projection={"_id": 1},
+        )
 
-    rick = await db.find_one("users", {"username": "Rick"})
+    rick = seeded_users.get("Rick")
     owner_id: str = str(rick["_id"]) if rick and "_id" in rick else "seed"
 
     # Seed items
@@ -34,9 +30,12 @@ async def seed_initial_data() -> None:
     ]
 
     for item in items_to_seed:
-        existing_item = await db.find_one("items", {"slug": item["slug"]})
-        if not existing_item:
-            await db.insert_one("items", item)
+        await db.upsert_one(
+            "items",
+            {"slug": item["slug"]},
+            {"$setOnInsert": {k: v for k, v in item.items() if k != "slug"}},
+            projection={"_id": 1},
+        )
 
     # Seed a sample project with multiple boards
     existing_project = await db.find_one("projects", {"name": "E-Commerce Platform"})
@@ -77,7 +76,7 @@ async def seed_initial_data() -> None:
                 "Need final approval on checkout flow design"
             ],
             "notes": "Team is making good progress. Weekly standups on Mondays at 10am. Sprint planning every two weeks.",
-            "dueDate": (datetime.now() + timedelta(days=90)).isoformat(),
+            "dueDate": datetime.now(timezone.utc) + timedelta(days=90),
         })
         project_id = str(project_result["_id"])
         
@@ -132,7 +131,7 @@ async def seed_initial_data() -> None:
             "nextAction": "Schedule user interviews with 20 active users",
             "blockers": [],
             "notes": "Need to align with brand guidelines team before finalizing color palette.",
-            "dueDate": (datetime.now() + timedelta(days=120)).isoformat(),
+            "dueDate": datetime.now(timezone.utc) + timedelta(days=120),
         },
         {
             "name": "API Documentation Portal",
@@ -167,7 +166,7 @@ async def seed_initial_data() -> None:
                 "Budget approval needed for documentation platform license"
             ],
             "notes": "Project on hold pending legal and budget approvals. Team frustrated with delays.",
-            "dueDate": (datetime.now() + timedelta(days=40)).isoformat(),
+            "dueDate": datetime.now(timezone.utc) + timedelta(days=40),
         },
         {
             "name": "Internal Analytics Dashboard",
@@ -215,7 +214,7 @@ async def seed_initial_data() -> None:
             "nextAction": "Complete post-migration retrospective",
             "blockers": [],
             "notes": "Project completed successfully ahead of schedule! Team executed flawlessly. Customer satisfaction scores increased by 15%.",
-            "dueDate": (datetime.now() - timedelta(days=10)).isoformat(),
+            "dueDate": datetime.now(timezone.utc) - timedelta(days=10),
         }
     ]
     
@@ -254,7 +253,7 @@ async def seed_initial_data() -> None:
                 "position": 0,
                 "assignees": ["Rick", "Morty"],
                 "labels": [{"name": "Design", "color": "#8B5CF6"}, {"name": "High Priority", "color": "#EF4444"}],
-                "dueDate": (datetime.now() + timedelta(days=3)).isoformat(),
+                "dueDate": datetime.now(timezone.utc) + timedelta(days=3),
                 "checklist": [
                     {"text": "Create wireframes", "completed": True},
                     {"text": "Design mockups", "completed": False},
@@ -271,7 +270,7 @@ async def seed_initial_data() -> None:
                 "position": 0,
                 "assignees": ["Rick"],
                 "labels": [{"name": "Backend", "color": "#3B82F6"}, {"name": "Security", "color": "#F59E0B"}],
-                "dueDate": (datetime.now() + timedelta(days=1)).isoformat(),
+                "dueDate": datetime.now(timezone.utc) + timedelta(days=1),
                 "checklist": [
                     {"text": "Setup JWT library", "completed": True},
                     {"text": "Create auth endpoints", "completed": True},
@@ -289,7 +288,7 @@ async def seed_initial_data() -> None:
                 "position": 0,
                 "assignees": ["Morty"],
                 "labels": [{"name": "DevOps", "color": "#10B981"}],
-                "dueDate": (datetime.now() - timedelta(days=2)).isoformat(),  # Overdue
+                "dueDate": datetime.now(timezone.utc) - timedelta(days=2),  # Overdue
                 "checklist": [
                     {"text": "Create GitHub workflow", "completed": True},
                     {"text": "Configure test environment", "completed": True},
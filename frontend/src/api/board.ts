@@ -1,11 +1,14 @@
 import { useApi } from './client';
-import type { Board, Column, Card } from '../types';
+import type { Board, BoardChanges, Column, Card, TasksResponse } from '../types';
 
 export function useBoardApi() {
 	const { getJson, apiFetch } = useApi();
 
-	async function listBoards(): Promise<{ items: Board[]; total: number }> {
-		return await getJson(`/api/boards`);
+	async function listBoards(params: { limit?: number; cursor?: string } = {}): Promise<{ items: Board[]; total?: number | null; nextCursor?: string | null }> {
+		const q = new URLSearchParams();
+		if (params.limit) q.set('limit', String(params.limit));
+		if (params.cursor) q.set('cursor', params.cursor);
+		return await getJson(`/api/boards?${q.toString()}`);
 	}
 
 	async function listBoardsByProject(projectId: string): Promise<{ items: Board[]; total: number }> {
@@ -16,6 +19,21 @@ export function useBoardApi() {
 		return await getJson(`/api/boards/${boardId}`);
 	}
 
+	async function getBoardChanges(boardId: string, since: number): Promise<BoardChanges> {
+		return await getJson(`/api/boards/${boardId}/changes?since=${since}`);
+	}
+
+	async function listTasks(params: { assignee?: string; label?: string; overdue?: boolean; projectId?: string; limit?: number; cursor?: string } = {}): Promise<TasksResponse> {
+		const q = new URLSearchParams();
+		if (params.assignee) q.set('assignee', params.assignee);
+		if (params.label) q.set('label', params.label);
+		if (params.overdue) q.set('overdue', 'true');
+		if (params.projectId) q.set('projectId', params.projectId);
+		if (params.limit) q.set('limit', String(params.limit));
+		if (params.cursor) q.set('cursor', params.cursor);
+		return await getJson(`/api/tasks?${q.toString()}`);
+	}
+
 	async function createBoard(name: string, projectId?: string, description?: string): Promise<Board> {
 		const body: { name: string; projectId?: string; description?: string } = { name };
 		if (projectId) body.projectId = projectId;
@@ -62,10 +80,17 @@ export function useBoardApi() {
 		if (!res.ok) throw new Error(`request_failed_${res.status}`);
 	}
 
+	// Rank ordering only: places the card between two neighbours of the column (either may be omitted)
+	async function moveCard(id: string, body: { columnId: string; prevId?: string; nextId?: string }): Promise<Card> {
+		const res = await apiFetch(`/api/cards/${id}/move`, { method: 'POST', body: JSON.stringify(body) });
+		if (!res.ok) throw new Error(`request_failed_${res.status}`);
+		return (await res.json()) as Card;
+	}
+
 	async function deleteCard(id: string): Promise<void> {
 		const res = await apiFetch(`/api/cards/${id}`, { method: 'DELETE' });
 		if (!res.ok) throw new Error(`request_failed_${res.status}`);
 	}
 
-	return { listBoards, listBoardsByProject, getBoard, createBoard, updateBoard, deleteBoard, createColumn, updateColumn, deleteColumn, createCard, updateCard, deleteCard };
+	return { listBoards, listBoardsByProject, getBoard, getBoardChanges, listTasks, createBoard, updateBoard, deleteBoard, createColumn, updateColumn, deleteColumn, createCard, updateCard, moveCard, deleteCard };
 }
@@ -16,16 +16,26 @@ export const BoardPanel: React.FC = () => {
 	const [deletingId, setDeletingId] = useState<string | null>(null);
 
 	useEffect(() => {
-		setLoading(true);
-		listBoards()
-			.then((res) => {
-				setItems(res.items);
-				setLoading(false);
-			})
-			.catch((e) => {
+		const fetchAllBoards = async () => {
+			try {
+				setLoading(true);
+				// Boards are keyset-paginated by name; follow nextCursor to the last page
+				const allBoards: Board[] = [];
+				let cursor: string | undefined;
+				do {
+					const page = await listBoards({ limit: 500, cursor });
+					allBoards.push(...page.items);
+					cursor = page.nextCursor ?? undefined;
+				} while (cursor);
+				setItems(allBoards);
+			} catch (e) {
 				setError(String(e));
+			} finally {
 				setLoading(false);
-			});
+			}
+		};
+
+		fetchAllBoards();
 	}, []);
 
 	return (
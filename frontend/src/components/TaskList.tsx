@@ -1,61 +1,28 @@
-import { useEffect, useState } from 'react';
+import { useCallback, useEffect, useState } from 'react';
 import { useBoardApi } from '../api/board';
-import type { Card } from '../types';
+import type { Task } from '../types';
 import styles from './ProjectsPanel.module.css';
 
-interface TaskWithBoard extends Card {
-	boardName?: string;
-	columnName?: string;
-}
+const PAGE_SIZE = 50;
 
 export const TaskList: React.FC = () => {
 	const boardApi = useBoardApi();
 	const [loading, setLoading] = useState(true);
+	const [loadingMore, setLoadingMore] = useState(false);
 	const [error, setError] = useState<string | null>(null);
-	const [tasks, setTasks] = useState<TaskWithBoard[]>([]);
+	const [tasks, setTasks] = useState<Task[]>([]);
+	const [nextCursor, setNextCursor] = useState<string | null>(null);
 
 	useEffect(() => {
-		const fetchAllTasks = async () => {
+		const fetchFirstPage = async () => {
 			try {
 				setLoading(true);
 				setError(null);
 
-				// First, get all boards
-				const boardsResponse = await boardApi.listBoards();
-				const boards = boardsResponse.items || [];
-
-				// Then fetch all cards from all boards
-				const allTasks: TaskWithBoard[] = [];
-				
-				for (const board of boards) {
-					try {
-						const { columns, cards } = await boardApi.getBoard(board.id);
-						
-						// Create a map of column IDs to names
-						const columnMap = new Map(columns.map(col => [col.id, col.title]));
-						
-						// Add board and column info to each card
-						const boardCards = cards.map(card => ({
-							...card,
-							boardName: board.name,
-							columnName: columnMap.get(card.columnId) || 'Unknown'
-						}));
-						
-						allTasks.push(...boardCards);
-					} catch (err) {
-						console.error(`Failed to fetch cards for board ${board.id}:`, err);
-					}
-				}
-
-				// Sort by due date (earliest first, null dates at the end)
-				const sortedTasks = allTasks.sort((a, b) => {
-					if (!a.dueDate && !b.dueDate) return 0;
-					if (!a.dueDate) return 1;
-					if (!b.dueDate) return -1;
-					return new Date(a.dueDate).getTime() - new Date(b.dueDate).getTime();
-				});
-
-				setTasks(sortedTasks);
+				// One indexed server-side query per page, already sorted by due date (undated last)
+				const page = await boardApi.listTasks({ limit: PAGE_SIZE });
+				setTasks(page.items);
+				setNextCursor(page.nextCursor ?? null);
 			} catch (err) {
 				setError(String(err));
 			} finally {
@@ -63,9 +30,23 @@ export const TaskList: React.FC = () => {
 			}
 		};
 
-		fetchAllTasks();
+		fetchFirstPage();
 	}, []);
 
+	const loadMore = useCallback(async () => {
+		if (!nextCursor || loadingMore) return;
+		try {
+			setLoadingMore(true);
+			const page = await boardApi.listTasks({ limit: PAGE_SIZE, cursor: nextCursor });
+			setTasks((prev) => [...prev, ...page.items]);
+			setNextCursor(page.nextCursor ?? null);
+		} catch (err) {
+			setError(String(err));
+		} finally {
+			setLoadingMore(false);
+		}
+	}, [boardApi, nextCursor, loadingMore]);
+
 	const getStatusColor = (dueDate?: string) => {
 		if (!dueDate) return '#94a3b8'; // gray for no due date
 		const due = new Date(dueDate);
@@ -83,7 +64,7 @@ export const TaskList: React.FC = () => {
 			<div className={styles.header}>
 				<h2>My Tasks</h2>
 				<span style={{ fontSize: '0.875rem', color: 'var(--text-secondary)' }}>
-					{tasks.length} task{tasks.length !== 1 ? 's' : ''}
+					{tasks.length}{nextCursor ? '+' : ''} task{tasks.length !== 1 ? 's' : ''}
 				</span>
 			</div>
 
@@ -227,6 +208,11 @@ export const TaskList: React.FC = () => {
 
 			<div className={styles.footer}>
 				<small>Showing {tasks.length} task{tasks.length !== 1 ? 's' : ''} sorted by due date</small>
+				{nextCursor && !error && (
+					<button disabled={loadingMore} onClick={loadMore}>
+						{loadingMore ? 'Loading…' : 'Load more'}
+					</button>
+				)}
 			</div>
 		</section>
 	);
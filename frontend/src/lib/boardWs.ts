@@ -0,0 +1,58 @@
+import type { BoardDelta } from '../types';
+import { WS_BASE } from '../config/env';
+
+/**
+ * Subscribes to live changes of one board
+ *
+ * Backend endpoint: WS /ws/boards/{boardId}
+ * Message format: { type: 'deltas', deltas: BoardDelta[] } | { type: 'resync' }
+ * On 'resync' the server dropped deltas for this client; reload the board bundle.
+ */
+export function connectBoardWS(
+	boardId: string,
+	onDeltas: (deltas: BoardDelta[]) => void,
+	onResync: () => void
+): () => void {
+	const ws = new WebSocket(`${WS_BASE}/ws/boards/${boardId}`);
+
+	ws.onmessage = (event) => {
+		try {
+			const message = JSON.parse(event.data);
+			if (message.type === 'deltas' && Array.isArray(message.deltas)) {
+				onDeltas(message.deltas);
+			} else if (message.type === 'resync') {
+				onResync();
+			}
+		} catch (error) {
+			console.error('Failed to parse board WebSocket message:', error);
+		}
+	};
+
+	ws.onerror = (error) => {
+		console.error('Board WebSocket error:', error);
+	};
+
+	// Return cleanup function
+	return () => {
+		if (ws.readyState === WebSocket.OPEN || ws.readyState === WebSocket.CONNECTING) {
+			ws.close();
+		}
+	};
+}
+
+/** Apply deltas for one entity type to a list keyed by id; created/updated/moved upsert, deleted removes */
+export function applyDeltas<T extends { id: string }>(items: T[], deltas: BoardDelta[], entity: 'column' | 'card'): T[] {
+	let out = items;
+	for (const d of deltas) {
+		const [kind, action] = d.op.split('.');
+		if (kind !== entity) continue;
+		if (action === 'deleted') {
+			out = out.filter((item) => item.id !== d.id);
+		} else if (out.some((item) => item.id === d.id)) {
+			out = out.map((item) => (item.id === d.id ? { ...item, ...d.data } : item));
+		} else if (action === 'created') {
+			out = [...out, { ...(d.data as object), id: d.id } as T];
+		}
+	}
+	return out;
+}
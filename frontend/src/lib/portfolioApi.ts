@@ -0,0 +1,22 @@
+import type { PortfolioSummary } from '../types/ticker';
+import { API_BASE } from '../config/env';
+
+/**
+ * Fetches portfolio totals (one pre-aggregated document on the backend)
+ *
+ * Backend endpoint: GET /api/metrics/portfolio
+ */
+export async function fetchPortfolio(): Promise<PortfolioSummary> {
+	const response = await fetch(`${API_BASE}/api/metrics/portfolio`, {
+		method: 'GET',
+		headers: {
+			'Content-Type': 'application/json',
+		},
+	});
+
+	if (!response.ok) {
+		throw new Error(`Failed to fetch portfolio: ${response.status}`);
+	}
+
+	return await response.json();
+}
@@ -1,9 +1,10 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import { DndContext, PointerSensor, useSensor, useSensors } from '@dnd-kit/core';
 import type { DragEndEvent } from '@dnd-kit/core';
-import type { Board, Column, Card, Label, ChecklistItem, Project } from '../types';
+import type { Board, BoardDelta, Column, Card, Label, ChecklistItem, Project } from '../types';
 import { useBoardApi } from '../api/board';
 import { useProjectsApi } from '../api/projects';
+import { applyDeltas, connectBoardWS } from '../lib/boardWs';
 import BoardColumn from '../components/BoardColumn';
 import { ProjectDetailPanel } from '../components/ProjectDetailPanel';
 import styles from './BoardPage.module.css';
@@ -26,6 +27,8 @@ export default function BoardPage({ boardId }: Props) {
     const [addingColumn, setAddingColumn] = useState(false);
     const [newColumnTitle, setNewColumnTitle] = useState('');
     const [updatedAt, setUpdatedAt] = useState<Date | null>(null);
+	// Board version the local state reflects, for catching up via /changes
+	const versionRef = useRef(0);
 	
 	// Card creation modal state
 	const [showCardModal, setShowCardModal] = useState(false);
@@ -47,6 +50,7 @@ export default function BoardPage({ boardId }: Props) {
 		setLoading(true);
 		api.getBoard(boardId)
 			.then(({ board, columns, cards }) => {
+				versionRef.current = board.version ?? 0;
 				setBoard(board);
 				setColumns(columns);
 				setCards(cards);
@@ -71,6 +75,35 @@ export default function BoardPage({ boardId }: Props) {
 			});
 	}, [boardId]);
 
+	// Live updates from other collaborators
+	useEffect(() => {
+		const apply = (deltas: BoardDelta[]) => {
+			const deletedColumns = new Set(deltas.filter((d) => d.op === 'column.deleted').map((d) => d.id));
+			setColumns((prev) => applyDeltas(prev, deltas, 'column'));
+			setCards((prev) => applyDeltas(prev, deltas, 'card').filter((card) => !deletedColumns.has(card.columnId)));
+			for (const d of deltas) {
+				if (d.op === 'board.updated') setBoard((prev) => (prev ? { ...prev, ...d.data } : prev));
+				if (d.v && d.v > versionRef.current) versionRef.current = d.v;
+			}
+		};
+		return connectBoardWS(boardId, apply, () => {
+			// Missed deltas: fetch only what changed since our version (the whole board if the log was trimmed)
+			api.getBoardChanges(boardId, versionRef.current)
+				.then(({ version, full, changes, bundle }) => {
+					if (full && bundle) {
+						setBoard(bundle.board);
+						setColumns(bundle.columns);
+						setCards(bundle.cards);
+						versionRef.current = version;
+					} else {
+						apply(changes);
+						versionRef.current = Math.max(versionRef.current, version);
+					}
+				})
+				.catch(() => {});
+		});
+	}, [boardId]);
+
     useEffect(() => {
         setUpdatedAt(new Date());
     }, [columns, cards]);
@@ -82,7 +115,8 @@ export default function BoardPage({ boardId }: Props) {
 			if (!map[card.columnId]) map[card.columnId] = [];
 			map[card.columnId].push(card);
 		}
-		for (const id of Object.keys(map)) map[id].sort((a, b) => a.position - b.position);
+		// Rank keys (rank ordering mode) compare as plain strings; otherwise fall back to position
+		for (const id of Object.keys(map)) map[id].sort((a, b) => (a.rank && b.rank ? (a.rank < b.rank ? -1 : a.rank > b.rank ? 1 : 0) : a.position - b.position));
 		return map;
 	}, [columns, cards]);
 
@@ -148,11 +182,19 @@ export default function BoardPage({ boardId }: Props) {
 		const destColumn = columns.find((c) => c.id === overId);
 		const card = cards.find((c) => c.id === activeId);
 		if (!card || !destColumn) return;
-		const newPos = (byColumn[destColumn.id]?.[byColumn[destColumn.id].length - 1]?.position ?? 0) + 1;
+		const destCards = (byColumn[destColumn.id] ?? []).filter((c) => c.id !== card.id);
+		const last = destCards[destCards.length - 1];
+		const newPos = (last?.position ?? 0) + 1;
 		// optimistic update
 		setCards((prev) => prev.map((c) => (c.id === card.id ? { ...c, columnId: destColumn.id, position: newPos } : c)));
 		try {
-			await api.updateCard(card.id, { columnId: destColumn.id, position: newPos });
+			if (card.rank) {
+				// Rank ordering: the board sorts by rank, which only the move endpoint assigns
+				const moved = await api.moveCard(card.id, { columnId: destColumn.id, prevId: last?.id });
+				setCards((prev) => prev.map((c) => (c.id === card.id ? { ...c, columnId: moved.columnId, rank: moved.rank } : c)));
+			} else {
+				await api.updateCard(card.id, { columnId: destColumn.id, position: newPos });
+			}
 		} catch (err) {
 			// rollback
 			setCards((prev) => prev.map((c) => (c.id === card.id ? card : c)));
@@ -1,9 +1,11 @@
-import React, { useMemo, useState } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
 import { generateTickerSeed } from '../mock/tickerSeed';
 import { LineChartSVG, type ChartSeries } from '../components/LineChartSVG';
 import { Sparkline } from '../components/Sparkline';
 import { toDaily, lastN, kpiAggregates, strokeColor } from '../lib/kpi';
-import { fmtMoney, fmtNumber } from '../lib/format';
+import { fmtMoney, fmtNumber, fmtPct } from '../lib/format';
+import { fetchPortfolio } from '../lib/portfolioApi';
+import type { PortfolioSummary } from '../types/ticker';
 
 type MetricType = 'index' | 'profit' | 'time' | 'signals';
 type TimeframeType = 7 | 14 | 30;
@@ -14,6 +16,19 @@ export const KPIPage: React.FC = () => {
 
 	const [metric, setMetric] = useState<MetricType>('index');
 	const [timeframe, setTimeframe] = useState<TimeframeType>(30);
+	const [portfolio, setPortfolio] = useState<PortfolioSummary | null>(null);
+
+	useEffect(() => {
+		let mounted = true;
+		fetchPortfolio()
+			.then((summary) => {
+				if (mounted) setPortfolio(summary);
+			})
+			.catch((err) => console.error('Failed to load portfolio:', err));
+		return () => {
+			mounted = false;
+		};
+	}, []);
 
 	// Transform data based on selected metric
 	const transformedData = useMemo(() => {
@@ -144,6 +159,16 @@ export const KPIPage: React.FC = () => {
 				</div>
 			</div>
 
+			{/* Portfolio Totals */}
+			{portfolio && portfolio.projectCount > 0 && (
+				<div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(200px, 1fr))', gap: '1rem', marginBottom: '1rem' }}>
+					<StatCard label="Portfolio Profit" value={fmtMoney(portfolio.totalProfit)} color="#059669" />
+					<StatCard label="Overall Margin" value={fmtPct(portfolio.overallMargin)} color="#2563eb" />
+					<StatCard label="Time Saved" value={`${portfolio.totalTimeSaved.toFixed(0)}h`} color="#d97706" />
+					<StatCard label="Tracked Projects" value={portfolio.projectCount.toString()} color="#7c3aed" />
+				</div>
+			)}
+
 			{/* Stat Cards */}
 			<div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(200px, 1fr))', gap: '1rem', marginBottom: '1.5rem' }}>
 				<StatCard
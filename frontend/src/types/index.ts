@@ -36,7 +36,8 @@ export interface Project {
 
 export interface ProjectsResponse {
 	items: Project[];
-	total: number;
+	total: number | null;
+	nextCursor?: string | null;
 }
 
 export interface Board {
@@ -44,6 +45,7 @@ export interface Board {
 	name: string;
 	projectId?: ID;
 	description?: string;
+	version?: number;
 }
 
 export interface Column {
@@ -51,6 +53,7 @@ export interface Column {
 	boardId: ID;
 	title: string;
 	position: number;
+	rank?: string;
 }
 
 export interface Label {
@@ -70,6 +73,7 @@ export interface Card {
 	title: string;
 	description?: string;
 	position: number;
+	rank?: string;
 	projectId?: ID;
 	assignees?: string[];
 	labels?: Label[];
@@ -78,3 +82,34 @@ export interface Card {
 	attachmentCount?: number;
 	commentCount?: number;
 }
+
+// Real-time board updates (WS /ws/boards/{id}); data holds only the changed fields,
+// or the whole document for "created"
+export interface BoardDelta {
+	op: `${'board' | 'column' | 'card'}.${'created' | 'updated' | 'moved' | 'deleted'}`;
+	id: ID;
+	data?: Record<string, unknown>;
+	v?: number; // board version produced by the write
+}
+
+// GET /api/boards/{id}/changes?since=; full=true means the log was trimmed and bundle holds the whole board
+export interface BoardChanges {
+	version: number;
+	full: boolean;
+	changes: BoardDelta[];
+	bundle: { board: Board; columns: Column[]; cards: Card[] } | null;
+}
+
+export type BoardMessage =
+	| { type: 'deltas'; boardId: ID; deltas: BoardDelta[] }
+	| { type: 'resync'; boardId: ID };
+
+export interface Task extends Card {
+	boardName?: string;
+	columnName?: string;
+}
+
+export interface TasksResponse {
+	items: Task[];
+	nextCursor?: string | null;
+}
@@ -22,3 +22,15 @@ export interface TickerDelta {
 	indexPoint?: number; // new point to append
 }
 
+
+export interface PortfolioSummary {
+	totalRevenue: number;
+	totalCost: number;
+	totalProfit: number;
+	overallMargin: number; // from totals, 0..1
+	totalTimeSaved: number;
+	averageProfit: number;
+	averageMargin: number; // mean of project margins
+	projectCount: number;
+	updatedAt?: string | null;
+}